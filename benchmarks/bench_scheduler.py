@@ -0,0 +1,154 @@
+"""스케줄러 벤치마크 (가짜 시트 백엔드 사용, 실제 API/인증 불필요)
+
+측정 항목 (시트 크기별):
+  - 조회+컴파일 틱 지연 (변경 있음 / 변경 없음)
+  - 틱당 API 호출 수
+  - 다음 예약 조회(next_fire) 지연
+  - 컴파일된 테이블 메모리 (tracemalloc 최대치)
+  - 같은 시각 작업 동시 실행 지연(jitter)
+
+사용법:
+  python benchmarks/bench_scheduler.py
+  python benchmarks/bench_scheduler.py --sizes 10,1000 --latency 0.05 --jobs 20
+"""
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_launcher import JobLauncher
+from schedule_table import compile_schedule
+from sheet_backend import FakeSheetsService
+from sheet_poller import SheetPoller, fetch_schedule_rows
+
+SPREADSHEET_ID = "bench"
+SHEET_NAME = "mini_01"
+
+
+def make_rows(count):
+    """하루에 고르게 퍼진 예약 count개짜리 시트 행 생성 (A~H열)"""
+    rows = [["시간", "작업이름", "", "", "명령어", "", "", "로그"]]
+    for i in range(count):
+        second = (i * 86400 // max(count, 1)) % 86400
+        time_str = f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+        rows.append([time_str, f"job{i}", "", "", f"python job{i}.py", "", "", "2024-01-01 | 실행 성공"])
+    return rows
+
+
+def timed(func, repeat):
+    """func를 repeat번 실행해서 (중앙값 초, 마지막 결과) 반환"""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def bench_size(size, latency, repeat):
+    """시트 크기 하나에 대한 틱/조회/메모리 측정"""
+    service = FakeSheetsService({SHEET_NAME: make_rows(size)}, latency=latency)
+    poller = SheetPoller(30, 300)
+
+    def tick():
+        rows = fetch_schedule_rows(service, SPREADSHEET_ID, [SHEET_NAME])[SHEET_NAME]
+        if poller.observe(rows):
+            return compile_schedule(rows)
+        return None
+
+    # 변경 있음 틱: 매번 지문을 초기화해서 재컴파일 강제
+    def changed_tick():
+        poller.last_fingerprint = None
+        return tick()
+
+    calls_before = service.total_calls
+    changed_latency, table = timed(changed_tick, repeat)
+    calls_per_tick = (service.total_calls - calls_before) / repeat
+    unchanged_latency, _ = timed(tick, repeat)
+
+    now = datetime.datetime.now()
+    lookups = 1000
+    start = time.perf_counter()
+    for i in range(lookups):
+        table.next_fire(now + datetime.timedelta(seconds=i * 37), inclusive=True)
+    lookup_latency = (time.perf_counter() - start) / lookups
+
+    rows = fetch_schedule_rows(service, SPREADSHEET_ID, [SHEET_NAME])[SHEET_NAME]
+    tracemalloc.start()
+    table = compile_schedule(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'size': size,
+        'changed_ms': changed_latency * 1000,
+        'unchanged_ms': unchanged_latency * 1000,
+        'calls_per_tick': calls_per_tick,
+        'lookup_us': lookup_latency * 1e6,
+        'table_kib': peak / 1024,
+        'jobs': len(table),
+    }
+
+
+def bench_dispatch(job_count, probe_delay):
+    """같은 시각 작업 job_count개를 동시에 실행했을 때의 실행 지연 측정"""
+    table = compile_schedule([["h"]] + [["00:00", f"j{i}", "", "", "exit 0"] for i in range(job_count)])
+    launcher = JobLauncher(max_workers=job_count, probe_delay=probe_delay)
+    done = threading.Event()
+    results = []
+    lock = threading.Lock()
+
+    def on_result(result):
+        with lock:
+            results.append(result)
+            if len(results) == job_count:
+                done.set()
+
+    scheduled_at = datetime.datetime.now()
+    launcher.launch(table.jobs, scheduled_at, on_result)
+    done.wait(60)
+    total = (datetime.datetime.now() - scheduled_at).total_seconds()
+    launcher.shutdown()
+    jitters = sorted(r.jitter for r in results if r.jitter is not None)
+    if not jitters:
+        return None
+    return {
+        'jobs': job_count,
+        'p50_ms': jitters[len(jitters) // 2] * 1000,
+        'max_ms': jitters[-1] * 1000,
+        'slot_total_ms': total * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스케줄러 벤치마크 (가짜 시트 백엔드)")
+    parser.add_argument("--sizes", default="10,1000,50000", help="쉼표로 구분한 시트 행 수 목록")
+    parser.add_argument("--latency", type=float, default=0.0, help="API 호출당 주입할 지연 (초)")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--jobs", type=int, default=20, help="동시 실행 지연 측정에 쓸 같은 시각 작업 수 (0이면 생략)")
+    parser.add_argument("--probe-delay", type=float, default=0.5, help="기동 확인 대기 (초)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    print(f"{'행 수':>8} {'틱(변경)ms':>12} {'틱(동일)ms':>12} {'API/틱':>8} {'next_fire µs':>13} {'테이블 KiB':>11}")
+    for size in sizes:
+        r = bench_size(size, args.latency, args.repeat)
+        print(f"{r['size']:>8} {r['changed_ms']:>12.2f} {r['unchanged_ms']:>12.2f} "
+              f"{r['calls_per_tick']:>8.1f} {r['lookup_us']:>13.2f} {r['table_kib']:>11.1f}")
+
+    if args.jobs > 0:
+        r = bench_dispatch(args.jobs, args.probe_delay)
+        if r:
+            print(f"\n동시 실행 {r['jobs']}건: 실행 지연 p50 {r['p50_ms']:.1f}ms, 최대 {r['max_ms']:.1f}ms, "
+                  f"슬롯 전체(기동 확인 포함) {r['slot_total_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import contextlib
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from schedule_table import slot_time_str
+
+RUN_LEASE_TTL = 600  # 실행 리스 유지 시간 (초) - 인계 대기보다 길어야 같은 슬롯을 두 노드가 실행하지 않음
+NODE_TTL = 30  # 노드 생존 신호(heartbeat) 유효 시간 (초) - 이 시간 동안 갱신이 없으면 꺼진 노드로 봄
+HEARTBEAT_INTERVAL = 10  # 생존 신호 갱신 주기 (초)
+TAKEOVER_DELAY = 5  # 담당 순위가 한 단계 낮을 때마다 더 기다린 뒤 실행 리스를 시도 (초)
+LOCK_TIMEOUT = 5  # 파일 잠금을 기다리는 최대 시간 (초)
+LOCK_STALE = 30  # 이 시간보다 오래된 잠금 폴더는 잠근 노드가 죽은 것으로 보고 제거 (초)
+
+NODE_PREFIX = "node:"
+RUN_PREFIX = "run:"
+
+
+def default_node_id():
+    """노드 이름 기본값 (PC 이름)"""
+    return socket.gethostname() or f"node-{os.getpid()}"
+
+
+def run_key(sheet_name, job, scheduled_at):
+    """실행 슬롯 하나를 나타내는 리스 이름 (실행 저널의 키와 같은 기준: 날짜/시트/행/시간)"""
+    return f"{scheduled_at.date().isoformat()}|{sheet_name}|{job.row_index}|{slot_time_str(scheduled_at)}"
+
+
+class SQLiteLeaseStore:
+    """SQLite 파일 기반 리스 저장소 (같은 PC의 여러 프로세스, 또는 공유 폴더의 DB 파일)
+
+    acquire()는 BEGIN IMMEDIATE 트랜잭션 안에서 확인과 기록을 함께 하므로 두 노드가 동시에
+    같은 리스를 가져갈 수 없음. 만료 시각은 벽시계(time.time()) 기준이라 노드 간 시계가 맞아야 함
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=LOCK_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " name TEXT PRIMARY KEY,"
+            " owner TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " info TEXT)"
+        )
+
+    def acquire(self, name, owner, ttl, info=None):
+        """리스 확보 (비어 있거나, 만료됐거나, 이미 내 것이면 ttl초 동안 확보하고 True)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+                if row is not None and row[0] != owner and row[1] > now:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute("INSERT OR REPLACE INTO leases VALUES (?, ?, ?, ?)",
+                                   (name, owner, now + ttl, json.dumps(info, ensure_ascii=False)))
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def release(self, name, owner):
+        """내가 가진 리스 반납"""
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def holders(self, prefix=""):
+        """만료되지 않은 리스를 [(이름, 소유 노드, 만료 시각, info)]로 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, owner, expires_at, info FROM leases WHERE substr(name, 1, ?) = ? AND expires_at > ?",
+                (len(prefix), prefix, time.time()),
+            ).fetchall()
+        return [(name, owner, expires_at, json.loads(info) if info else None) for name, owner, expires_at, info in rows]
+
+    def purge(self):
+        """만료된 리스 삭제"""
+        with self._lock:
+            return self._conn.execute("DELETE FROM leases WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class FileLeaseStore:
+    """폴더 하나에 리스 목록(leases.json)을 두는 파일 잠금 기반 저장소 (공유 폴더용)
+
+    잠금은 폴더 생성(mkdir)의 원자성을 이용하므로 Windows 공유 폴더에서도 동작함.
+    잠근 노드가 죽어서 LOCK_STALE초 넘게 남아 있는 잠금은 제거하고 다시 시도
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._state_path = os.path.join(directory, "leases.json")
+        self._lock_path = os.path.join(directory, "leases.lock")
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        with self._lock:
+            while True:
+                try:
+                    os.mkdir(self._lock_path)
+                    break
+                except FileExistsError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"리스 저장소 잠금 대기 시간 초과: {self._lock_path}")
+                    try:
+                        if time.time() - os.stat(self._lock_path).st_mtime > LOCK_STALE:
+                            os.rmdir(self._lock_path)
+                            continue
+                    except OSError:
+                        continue
+                    time.sleep(0.02)
+            try:
+                yield
+            finally:
+                os.rmdir(self._lock_path)
+
+    def _read(self):
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, leases):
+        tmp_path = self._state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(leases, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self._state_path)
+
+    def acquire(self, name, owner, ttl, info=None):
+        """리스 확보 (비어 있거나, 만료됐거나, 이미 내 것이면 ttl초 동안 확보하고 True)"""
+        with self._locked():
+            now = time.time()
+            leases = self._read()
+            current = leases.get(name)
+            if current is not None and current[0] != owner and current[1] > now:
+                return False
+            leases = {key: value for key, value in leases.items() if value[1] > now}
+            leases[name] = [owner, now + ttl, info]
+            self._write(leases)
+            return True
+
+    def release(self, name, owner):
+        """내가 가진 리스 반납"""
+        with self._locked():
+            leases = self._read()
+            if name in leases and leases[name][0] == owner:
+                del leases[name]
+                self._write(leases)
+
+    def holders(self, prefix=""):
+        """만료되지 않은 리스를 [(이름, 소유 노드, 만료 시각, info)]로 반환 (읽기만 하므로 잠그지 않음)"""
+        now = time.time()
+        return [(name, owner, expires_at, info) for name, (owner, expires_at, info) in self._read().items()
+                if name.startswith(prefix) and expires_at > now]
+
+    def purge(self):
+        """만료된 리스 삭제 (acquire 때마다 함께 정리되므로 따로 할 일 없음)"""
+        return 0
+
+    def close(self):
+        pass
+
+
+def open_lease_store(target):
+    """'.db'/'.sqlite' 파일이면 SQLite 저장소, 그 외에는 폴더로 보고 파일 잠금 저장소"""
+    if target.lower().endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteLeaseStore(target)
+    return FileLeaseStore(target)
+
+
+class ClusterCoordinator:
+    """여러 스케줄러 노드가 같은 시트들을 나눠서 실행하도록 조정
+
+    - 모든 노드가 같은 시트 목록(--all 또는 같은 --ids)을 스케줄링하고, 실행 슬롯마다 리스를 먼저
+      확보한 노드 하나만 실행 (나머지는 저널에만 기록하고 건너뜀)
+    - 살아 있는 노드 목록(생존 신호 리스)을 기준으로 슬롯마다 담당 순위를 정함 (rendezvous 해시)
+      -> 1순위 노드는 바로 실행, n순위 노드는 n * takeover_delay초 뒤에 시도 = 작업이 노드들에 고르게 퍼지고,
+      담당 노드가 꺼져 있거나 멈춰 있으면 다음 순위 노드가 인계받음
+    - 실행 대기열이 밀린(바쁜) 노드는 스스로 마지막 순위로 물러나서 한가한 노드가 가져가도록 함
+    - 저장소에 접근할 수 없으면 마지막으로 알던 노드 목록 기준 1순위일 때만 실행
+    """
+
+    def __init__(self, store, node_id=None, lease_ttl=RUN_LEASE_TTL, node_ttl=NODE_TTL,
+                 heartbeat_interval=HEARTBEAT_INTERVAL, takeover_delay=TAKEOVER_DELAY):
+        self.store = store
+        self.node_id = node_id or default_node_id()
+        self.lease_ttl = lease_ttl
+        self.node_ttl = node_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.takeover_delay = takeover_delay
+        self.load_function = None  # 생존 신호에 함께 기록할 현재 부하 (실행 중 + 대기 작업 수)
+        self.acquired = 0   # 확보한 실행 리스 수
+        self.lost = 0       # 다른 노드가 먼저 가져간 실행 리스 수
+        self.errors = 0     # 저장소 접근 오류 수
+        self._lock = threading.Lock()
+        self._nodes = {self.node_id: None}  # 마지막으로 확인한 살아 있는 노드 {노드: info}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """생존 신호를 한 번 보내고 주기적으로 갱신하는 스레드 시작"""
+        self.heartbeat()
+        self._thread = threading.Thread(target=self._run, name="cluster-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def heartbeat(self):
+        """생존 신호 갱신 및 살아 있는 노드 목록 새로 읽기"""
+        info = {'pid': os.getpid()}
+        if self.load_function is not None:
+            try:
+                info['load'] = self.load_function()
+            except Exception:
+                pass
+        try:
+            self.store.acquire(NODE_PREFIX + self.node_id, self.node_id, self.node_ttl, info)
+            nodes = {name[len(NODE_PREFIX):]: node_info for name, _, _, node_info in self.store.holders(NODE_PREFIX)}
+            self.store.purge()
+        except Exception as e:
+            self.errors += 1
+            print(f"\033[90m[DEBUG] 리스 저장소 접근 실패 (생존 신호): {e}\033[0m")
+            return False
+        nodes.setdefault(self.node_id, info)
+        with self._lock:
+            self._nodes = nodes
+        return True
+
+    def live_nodes(self):
+        """마지막으로 확인한 살아 있는 노드 이름 리스트"""
+        with self._lock:
+            return sorted(self._nodes)
+
+    def ranking(self, key):
+        """실행 슬롯의 노드 담당 순서 (모든 노드가 같은 노드 목록이면 같은 순서가 나옴)"""
+        return sorted(self.live_nodes(), key=lambda node: hashlib.sha1(f"{node}|{key}".encode("utf-8")).digest(),
+                      reverse=True)
+
+    def takeover_delay_for(self, key, busy=False):
+        """이 노드가 실행 리스를 시도하기 전에 기다릴 시간 (초, 1순위면 0)"""
+        ranking = self.ranking(key)
+        rank = ranking.index(self.node_id)
+        if busy and len(ranking) > 1:
+            rank = len(ranking)
+        return rank * self.takeover_delay
+
+    def try_acquire(self, key):
+        """실행 리스 확보 시도 (True면 이 노드가 실행)"""
+        try:
+            acquired = self.store.acquire(RUN_PREFIX + key, self.node_id, self.lease_ttl)
+        except Exception as e:
+            self.errors += 1
+            preferred = self.ranking(key)[0] == self.node_id
+            print(f"\033[90m[DEBUG] 리스 저장소 접근 실패 ({'담당 노드이므로 실행' if preferred else '건너뜀'}): {e}\033[0m")
+            return preferred
+        if acquired:
+            self.acquired += 1
+        else:
+            self.lost += 1
+        return acquired
+
+    def close(self):
+        """생존 신호 중단 및 반납 (다른 노드가 바로 인계받도록)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.heartbeat_interval)
+        try:
+            self.store.release(NODE_PREFIX + self.node_id, self.node_id)
+        except Exception:
+            pass
+        self.store.close()
+
+    def _run(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            self.heartbeat()
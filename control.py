@@ -0,0 +1,134 @@
+import json
+import queue
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+CONTROL_REPLY_TIMEOUT = 10.0  # 스케줄러 루프가 명령을 처리할 때까지 응답을 기다리는 최대 시간 (초)
+CONTROL_COMMANDS = ("reload", "pause", "resume", "run", "profile", "memory")
+
+
+class ControlCommand:
+    """제어 요청 하나 (HTTP 스레드가 만들고 스케줄러 루프가 처리한 뒤 reply()로 결과 전달)"""
+    __slots__ = ("name", "args", "result", "_done")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args      # 쿼리 문자열 값 {이름: 값}
+        self.result = None
+        self._done = threading.Event()
+
+    def reply(self, ok, message, **fields):
+        self.result = dict(ok=ok, message=message, **fields)
+        self._done.set()
+
+    def wait(self, timeout):
+        return self._done.wait(timeout)
+
+
+class ControlServer:
+    """로컬 제어 HTTP 서버 (127.0.0.1 전용, 백그라운드 스레드)
+
+    - GET /status: status_function()이 만든 상태 JSON (예약 예정, 실행 중인 작업, 최근 결과)
+    - POST /reload, /pause, /resume, /run?row=N[&sheet=이름], /profile?ticks=N, /memory?interval=초(0이면 끔):
+      명령을 대기열에 넣고 wakeup 이벤트로 스케줄러 루프를 깨움. 루프 스레드에서 처리한 결과를 JSON으로 응답
+      (늦어지면 202로 접수만 알림)
+    - 브라우저에서 다른 사이트가 보내는 요청(Origin 헤더가 있는 요청)은 거부
+    """
+
+    def __init__(self, status_function):
+        self.status_function = status_function
+        self.wakeup = threading.Event()   # 명령이 들어오면 설정 (countdown_sleep이 대기를 멈춤)
+        self.paused = False               # 일시 정지 상태 (스케줄러 루프가 pause/resume 처리 시 갱신)
+        self._commands = queue.Queue()
+        self._server = None
+
+    def take_commands(self):
+        """대기 중인 명령을 모두 꺼냄 (스케줄러 루프에서 호출)"""
+        self.wakeup.clear()
+        commands = []
+        while True:
+            try:
+                commands.append(self._commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def submit(self, name, args):
+        """명령을 대기열에 넣고 루프를 깨운 뒤 처리 결과를 기다림 (HTTP 스레드에서 호출)"""
+        command = ControlCommand(name, args)
+        self._commands.put(command)
+        self.wakeup.set()
+        if not command.wait(CONTROL_REPLY_TIMEOUT):
+            return 202, {'ok': True, 'message': "접수됨 (스케줄러가 다른 작업 중이라 처리 결과를 기다리지 못함)"}
+        return (200 if command.result['ok'] else 400), command.result
+
+    def post(self, name, args=None):
+        """명령을 대기열에 넣고 루프를 깨우기만 함 (처리 결과를 기다리지 않는 내부 호출용 - 백그라운드 시트 조회 결과, 파일 감시 등)"""
+        self._commands.put(ControlCommand(name, args or {}))
+        self.wakeup.set()
+
+    def serve_http(self, port, host="127.0.0.1"):
+        """로컬 HTTP 포트에서 제어 요청 받기 (실제로 연 포트 반환)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # 포트를 쓸 때만 import
+        control = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = urllib.parse.urlsplit(self.path).path
+                if path not in ("/", "/status"):
+                    self._send(404, {'ok': False, 'message': "없는 경로"})
+                    return
+                try:
+                    self._send(200, control.status_function())
+                except Exception as e:
+                    self._send(500, {'ok': False, 'message': f"상태 조회 실패: {e}"})
+
+            def do_POST(self):
+                if self.headers.get("Origin"):
+                    self._send(403, {'ok': False, 'message': "브라우저 요청은 허용하지 않음"})
+                    return
+                parts = urllib.parse.urlsplit(self.path)
+                name = parts.path.strip("/")
+                if name not in CONTROL_COMMANDS:
+                    self._send(404, {'ok': False, 'message': f"알 수 없는 명령: {name} (가능: {', '.join(CONTROL_COMMANDS)})"})
+                    return
+                args = {key: values[-1] for key, values in urllib.parse.parse_qs(parts.query).items()}
+                self._send(*control.submit(name, args))
+
+            def _send(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False, default=str, indent=1).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 콘솔에 출력하지 않음
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="control-http", daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def send_control(port, command, args=None, host="127.0.0.1"):
+    """실행 중인 스케줄러에 제어 요청을 보내고 (HTTP 상태 코드, 응답 JSON) 반환
+
+    command: "status" 또는 CONTROL_COMMANDS 중 하나, args: 쿼리 문자열로 보낼 값 {이름: 값}
+    """
+    url = f"http://{host}:{port}/{command}"
+    if args:
+        url += "?" + urllib.parse.urlencode(args)
+    request = urllib.request.Request(url, method="GET" if command == "status" else "POST")
+    try:
+        with urllib.request.urlopen(request, timeout=CONTROL_REPLY_TIMEOUT + 5) as response:
+            return response.status, json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read().decode("utf-8") or "{}")
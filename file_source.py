@@ -0,0 +1,187 @@
+import csv
+import io
+import json
+import os
+import threading
+
+from sheet_backend import FakeSheetsService, parse_a1_range
+
+FILE_WATCH_INTERVAL = 0.2  # 스케줄 파일 수정 여부를 확인하는 주기 (초)
+STATUS_SUFFIX = ".status.json"  # 실행 로그(H열 대신)를 기록하는 파일 = 스케줄 파일 경로 + 이 접미사
+SNAPSHOT_SUFFIX = ".snapshot.json"  # 스케줄 스냅샷 파일 = 스케줄 파일 경로 + 이 접미사 (시트용 스냅샷과 분리)
+READ_METHODS = ("spreadsheets.get", "values.get", "values.batchGet")  # 호출 전에 파일 변경을 확인하는 요청
+
+
+class ScheduleFileError(Exception):
+    """스케줄 파일을 읽을 수 없음 (OSError가 아니므로 API 재시도 대상이 아님 - 직전 스케줄로 계속 실행)"""
+
+
+def file_stamp(path):
+    """파일 변경 확인용 (수정 시각(ns), 크기) - 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_schedule_file(path):
+    """스케줄 파일을 {시트이름: 행 리스트(헤더 포함)}로 읽기
+
+    - .json: {"시트이름": [[A, B, C, D, E, F, ...], ...], ...} (--fake-sheet와 같은 형식, 시트 여러 개 가능)
+    - 그 밖(.csv): 시트 하나, 시트 이름은 확장자를 뺀 파일 이름
+      (UTF-8로 읽고 안 되면 한글 Windows 엑셀이 저장하는 cp949로 읽음)
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise ScheduleFileError(f"스케줄 파일을 열 수 없음: {e}") from e
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        try:
+            text = raw.decode("cp949")
+        except UnicodeDecodeError as e:
+            raise ScheduleFileError(f"스케줄 파일 인코딩을 알 수 없음 (UTF-8 또는 cp949로 저장): {path}") from e
+    if os.path.splitext(path)[1].lower() == ".json":
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ScheduleFileError(f"스케줄 파일 JSON 형식 오류: {e}") from e
+        if not isinstance(data, dict) or not all(isinstance(rows, list) for rows in data.values()):
+            raise ScheduleFileError("스케줄 파일 JSON은 {\"시트이름\": [[...], ...]} 형식이어야 함")
+        return {
+            str(name): [["" if cell is None else str(cell) for cell in row] for row in rows if isinstance(row, list)]
+            for name, rows in data.items()
+        }
+    try:
+        rows = list(csv.reader(io.StringIO(text, newline="")))
+    except csv.Error as e:
+        raise ScheduleFileError(f"스케줄 파일 CSV 형식 오류: {e}") from e
+    return {os.path.splitext(os.path.basename(path))[0]: rows}
+
+
+def _column_letters(index):
+    """0부터 시작하는 열 인덱스를 열 문자(A, B, ..., AA)로 변환"""
+    letters = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord('A') + rest) + letters
+    return letters
+
+
+class FileSheetsService(FakeSheetsService):
+    """Google Sheets 대신 로컬 CSV/JSON 파일을 스케줄로 쓰는 서비스 객체 (googleapiclient와 같은 호출 방식)
+
+    - 읽기(batchGet 등)마다 파일의 수정 시각/크기를 확인하고, 바뀌었을 때만 다시 읽음
+      (형식이 잘못됐거나 저장 도중이라 읽을 수 없으면 ScheduleFileError - 스케줄러는 직전 스케줄로 계속 실행)
+    - 쓰기(H열 실행 로그)는 스케줄 파일을 건드리지 않고 status_path JSON({"시트이름": {"H5": 메시지}})에 기록
+    - 인증/네트워크/API 할당량이 필요 없음 (FakeSheetsService와 같이 스레드 안전하므로 객체 하나를 공유)
+    """
+
+    def __init__(self, path, status_path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.schedule_path = path
+        self.status_path = status_path or path + STATUS_SUFFIX
+        self.status = {}   # {시트이름: {"H5": 메시지}}
+        self._stamp = None
+        try:
+            with open(self.status_path, "r", encoding="utf-8") as f:
+                self.status = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self._refresh()
+
+    def _execute(self, method, func):
+        if method in READ_METHODS:
+            self._refresh()
+        return super()._execute(method, func)
+
+    def _refresh(self):
+        """파일이 바뀌었으면 다시 읽어서 시트 내용 교체"""
+        stamp = file_stamp(self.schedule_path)
+        if stamp is None:
+            raise ScheduleFileError(f"스케줄 파일이 없음: {self.schedule_path}")
+        if stamp == self._stamp:
+            return
+        sheets = load_schedule_file(self.schedule_path)
+        with self._lock:
+            self.sheets.clear()
+            self.sheets.update(sheets)
+            self._stamp = stamp
+
+    def _write(self, a1_range, values):
+        sheet, col0, row0, _, _ = parse_a1_range(a1_range)
+        with self._lock:
+            name, _ = self._grid(sheet)
+            cells = self.status.setdefault(name, {})
+            for r, row_values in enumerate(values):
+                for c, value in enumerate(row_values):
+                    cells[f"{_column_letters(col0 + c)}{row0 + r + 1}"] = "" if value is None else str(value)
+            self._save()
+        return {'updatedRange': a1_range, 'updatedRows': len(values)}
+
+    def _clear(self, a1_range):
+        sheet, col0, row0, col1, row1 = parse_a1_range(a1_range)
+        with self._lock:
+            name, _ = self._grid(sheet)
+            cells = self.status.get(name, {})
+            for cell in list(cells):
+                _, col, row, _, _ = parse_a1_range(cell)
+                if col >= col0 and (col1 is None or col <= col1) and row >= row0 and (row1 is None or row <= row1):
+                    del cells[cell]
+            self._save()
+        return {'clearedRange': a1_range}
+
+    def _save(self):
+        """실행 로그 파일 저장 (호출하는 쪽에서 lock 보유, 임시 파일에 쓴 뒤 교체)"""
+        tmp_path = self.status_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.status, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.status_path)
+
+
+class FileWatcher:
+    """파일의 수정 시각/크기를 interval초마다 확인해서 바뀌면 on_change() 호출 (백그라운드 스레드)
+
+    - inotify 등 OS 알림 대신 stat 확인 (Windows/Linux 공통, 파일 하나라 비용이 거의 없음)
+    - 저장 도중인 파일을 읽지 않도록 바뀐 값이 한 번 더 그대로일 때 알림 (최대 2 * interval초 지연)
+    """
+
+    def __init__(self, path, on_change, interval=FILE_WATCH_INTERVAL):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval * 2)
+            self._thread = None
+
+    def _run(self):
+        last = file_stamp(self.path)
+        pending = None
+        while not self._stop.wait(self.interval):
+            stamp = file_stamp(self.path)
+            if stamp == last:
+                pending = None
+                continue
+            if stamp != pending:
+                pending = stamp  # 저장이 끝났는지 다음 확인 때 한 번 더 봄
+                continue
+            last, pending = stamp, None
+            try:
+                self.on_change()
+            except Exception as e:
+                print(f"\033[90m[DEBUG] 파일 변경 처리 중 오류: {e}\033[0m")
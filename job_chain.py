@@ -0,0 +1,46 @@
+import threading
+
+
+class ChainTracker:
+    """선행 작업(F열)의 종료 결과로 후속 작업을 실행할 시점 판단
+
+    - 후속 작업은 모든 선행 작업이 자기의 마지막 실행 이후 한 번 이상 성공했을 때 실행
+      (선행 작업들이 서로 다른 시각에 끝나도 마지막 선행 작업이 끝나는 즉시 실행)
+    - 선행 작업이 실패하면 그 후속 작업은 이번 회차에 실행하지 않고 회차를 새로 시작
+      (실패 전에 성공한 다른 선행 작업도 다음 회차에 다시 성공해야 함)
+    - 기록은 메모리에만 보관 (재시작하면 선행 작업이 다시 성공할 때까지 기다림)
+    - 감독 스레드와 실행기 스레드에서 동시에 호출되므로 lock으로 보호
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._succeeded = {}   # (시트, 행) -> 마지막으로 성공한 시각
+        self._triggered = {}   # (시트, 행) -> 후속 작업으로 마지막 실행한 시각
+
+    def finished(self, sheet_name, table, job, ok, at):
+        """작업 하나가 끝났을 때 (지금 실행할 후속 작업 리스트, 이번 회차에 건너뛸 후속 작업 리스트) 반환
+
+        at: 종료 시각 (같은 시트 안에서 비교만 하므로 datetime이든 가상 시간(초)이든 상관없음)
+        """
+        children = table.dependents.get(job.row_index)
+        if not children:
+            return [], []
+        with self._lock:
+            if not ok:
+                # 실패한 작업의 이전 성공 기록을 지우고 후속 작업의 회차를 여기서 끊음
+                self._succeeded.pop((sheet_name, job.row_index), None)
+                for child in children:
+                    self._triggered[(sheet_name, child.row_index)] = at
+                return [], list(children)
+            self._succeeded[(sheet_name, job.row_index)] = at
+            ready = []
+            for child in children:
+                since = self._triggered.get((sheet_name, child.row_index))
+                if all(self._succeeded_since(sheet_name, parent, since) for parent in child.after):
+                    self._triggered[(sheet_name, child.row_index)] = at
+                    ready.append(child)
+            return ready, []
+
+    def _succeeded_since(self, sheet_name, row_index, since):
+        succeeded = self._succeeded.get((sheet_name, row_index))
+        return succeeded is not None and (since is None or succeeded > since)
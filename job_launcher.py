@@ -0,0 +1,137 @@
+import datetime
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from job_output import OutputCapture, output_path
+
+
+def start_process(command, capture=None):
+    """명령어를 백그라운드 프로세스로 실행하고 Popen 객체 반환
+
+    capture(OutputCapture)를 주면 stdout/stderr를 파이프로 받아서 capture가 읽음 (주지 않으면 출력은 버림)
+    """
+    output = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+    env = None
+    if capture is not None:
+        output = {'stdout': subprocess.PIPE, 'stderr': subprocess.STDOUT}
+        # 파이썬 작업의 출력을 UTF-8로 받도록 (Windows 파이프 기본 인코딩은 cp949)
+        env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    # 명령어 실행 (백그라운드에서 실행하여 팝업 알림이 있어도 블로킹되지 않도록)
+    # Windows에서는 CREATE_NEW_CONSOLE 플래그 사용
+    # stdin은 None으로 설정하여 새 콘솔의 stdin을 사용 (Node.js readline 등이 작동하도록)
+    if sys.platform == 'win32':
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdin=None,  # None으로 설정하여 새 콘솔의 stdin 사용
+            creationflags=subprocess.CREATE_NEW_CONSOLE,
+            env=env,
+            **output
+        )
+    else:
+        # Linux/Mac에서는 nohup과 유사한 방식
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdin=None,  # None으로 설정하여 새 콘솔의 stdin 사용
+            start_new_session=True,
+            env=env,
+            **output
+        )
+    if capture is not None:
+        capture.attach(process.stdout, command)
+    return process
+
+
+class LaunchResult:
+    """작업 하나의 실행 결과"""
+    __slots__ = ("job", "scheduled_at", "started_at", "pid", "return_code", "error", "skipped", "output")
+
+    def __init__(self, job, scheduled_at):
+        self.job = job
+        self.scheduled_at = scheduled_at  # 예약 일시
+        self.started_at = None            # 실제 프로세스 시작 일시
+        self.pid = None
+        self.return_code = None           # 기동 확인 시점에 이미 종료됐으면 종료 코드
+        self.error = None                 # 실행 자체가 실패한 경우 예외
+        self.skipped = None               # 실행하지 않은 경우 그 이유 (이전 실행이 진행 중 등)
+        self.output = None                # 출력 캡처를 켠 경우 OutputCapture
+
+    @property
+    def jitter(self):
+        """예약 시각 대비 실제 시작 지연 (초)"""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.scheduled_at).total_seconds()
+
+    @property
+    def ok(self):
+        """기동 확인 시점에 프로세스가 살아 있었는지 여부"""
+        return self.error is None and self.skipped is None and self.return_code is None
+
+    def log_message(self):
+        """H열에 기록할 로그 메시지"""
+        timestamp = (self.started_at or datetime.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        if self.skipped is not None:
+            return f"{timestamp} | 건너뜀 ({self.skipped})"
+        if self.error is not None:
+            return f"{timestamp} | 실행 오류: {str(self.error)}"
+        if self.return_code is None:
+            return f"{timestamp} | 실행 성공 (PID: {self.pid})"
+        return f"{timestamp} | 실행 실패 (종료 코드: {self.return_code})"
+
+
+class JobLauncher:
+    """같은 시각에 예약된 작업들을 동시에 실행하는 실행기
+
+    작업마다 스레드 풀에서 프로세스를 시작하고, probe_delay초 뒤 "바로 죽었는지" 확인까지
+    병렬로 처리한 뒤 결과를 콜백으로 알려줌. 호출한 쪽(스케줄러 루프)은 기다리지 않음
+    worker_pool(PythonWorkerPool)을 주면 'python x.py' 작업은 미리 띄워 둔 워커에서 실행
+    output_dir를 주면 작업 출력을 output_dir/<output_name>_<행번호>.log에 기록하고 마지막 몇 줄을 보관
+    (출력 캡처 중에는 워커의 출력을 작업별로 나눌 수 없으므로 워커 풀을 쓰지 않음)
+    """
+
+    def __init__(self, max_workers=32, probe_delay=0.5, worker_pool=None, output_dir=None, output_name=None):
+        self.probe_delay = probe_delay
+        self.worker_pool = worker_pool if output_dir is None else None
+        self.output_dir = output_dir
+        self.output_name = output_name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-launcher")
+
+    def launch(self, jobs, scheduled_at, on_result, on_start=None):
+        """작업 리스트를 동시에 실행 (결과는 on_result(LaunchResult)로 비동기 전달)
+
+        on_start(job, process, started_at, output)를 주면 프로세스가 시작되자마자 호출 (감독기 등록용)
+        """
+        return [self._executor.submit(self._launch_one, job, scheduled_at, on_result, on_start) for job in jobs]
+
+    def shutdown(self, wait=True):
+        """실행기 종료"""
+        self._executor.shutdown(wait=wait)
+
+    def _launch_one(self, job, scheduled_at, on_result, on_start):
+        """작업 하나를 실행하고 기동 여부를 확인"""
+        result = LaunchResult(job, scheduled_at)
+        try:
+            process = self.worker_pool.start(job.command) if self.worker_pool is not None else None
+            if process is None:
+                if self.output_dir is not None:
+                    result.output = OutputCapture(output_path(self.output_dir, self.output_name, job.row_index))
+                process = start_process(job.command, result.output)
+            result.started_at = datetime.datetime.now()
+            result.pid = process.pid
+            if on_start is not None:
+                on_start(job, process, result.started_at, result.output)
+            # 프로세스가 정상적으로 시작되었는지 확인 (짧은 대기 후 상태 체크)
+            time.sleep(self.probe_delay)
+            result.return_code = process.poll()
+        except Exception as e:
+            result.error = e
+        try:
+            on_result(result)
+        except Exception as e:
+            print(f"\033[90m[DEBUG] 실행 결과 처리 중 오류: {e}\033[0m")
+        return result
@@ -0,0 +1,151 @@
+import collections
+import datetime
+import os
+import re
+import threading
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_logs")
+OUTPUT_MAX_BYTES = 1024 * 1024  # 작업 출력 로그 파일이 이 크기를 넘으면 교체 (바이트)
+OUTPUT_BACKUP_COUNT = 3  # 작업마다 보관할 이전 출력 로그 파일 수
+OUTPUT_TAIL_LINES = 20  # 메모리에 남겨 둘 마지막 출력 줄 수
+OUTPUT_CHUNK_SIZE = 65536  # 파이프에서 한 번에 읽을 최대 크기 (바이트)
+OUTPUT_READ_SIZE = 8192  # 메모리에 보관할 한 줄의 최대 길이 (바이트, 넘으면 자름)
+
+
+def output_path(output_dir, sheet_name, row_index):
+    """작업(시트, 행)의 출력 로그 파일 경로 (파일 이름에 쓸 수 없는 문자는 '_'로 치환)"""
+    safe_name = re.sub(r'[\\/:*?"<>|\s]+', "_", sheet_name or "job").strip("._") or "job"
+    return os.path.join(output_dir, f"{safe_name}_{row_index}.log")
+
+
+def rotate_file(path, backup_count):
+    """path를 path.1, path.2 ...로 밀어내기 (다른 프로세스가 열고 있어서 실패하면 그대로 둠)"""
+    try:
+        for index in range(backup_count - 1, 0, -1):
+            older = f"{path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{path}.{index + 1}")
+        if backup_count > 0:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+class OutputCapture:
+    """작업 프로세스 하나의 출력(stdout+stderr)을 파일로 흘려보내고 마지막 몇 줄만 메모리에 보관
+
+    - 전용 스레드가 파이프를 계속 비우므로 출력이 많은 작업도 파이프가 가득 차서 멈추지 않음
+      (스케줄러 루프와 실행기 스레드는 파이프를 읽지 않음)
+    - 파일이 max_bytes를 넘으면 path.1 ... path.N으로 밀어내고 새 파일에 이어서 기록
+    - 메모리에는 마지막 tail_lines줄(줄당 최대 OUTPUT_READ_SIZE바이트)만 남김
+    """
+
+    def __init__(self, path, max_bytes=OUTPUT_MAX_BYTES, backup_count=OUTPUT_BACKUP_COUNT,
+                 tail_lines=OUTPUT_TAIL_LINES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.bytes_read = 0   # 지금까지 읽은 출력 크기 (바이트)
+        self.lines_read = 0
+        self._tail = collections.deque(maxlen=tail_lines)
+        self._lock = threading.Lock()
+        self._file = None
+        self._written = 0
+        self._thread = None
+
+    def attach(self, stream, command=None):
+        """프로세스의 출력 파이프(바이너리)를 읽는 스레드 시작"""
+        self._open(command)
+        self._thread = threading.Thread(target=self._drain, args=(stream,), name="job-output", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """파이프를 끝까지 읽을 때까지 대기 (손자 프로세스가 파이프를 물고 있으면 timeout 후 반환)"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def tail(self):
+        """마지막 출력 줄 리스트"""
+        with self._lock:
+            return list(self._tail)
+
+    def summary(self, max_chars=200, lines=3):
+        """H열에 붙일 짧은 요약 (마지막 lines줄을 ' / '로 연결, 길면 앞부분을 자름)"""
+        text = " / ".join(line for line in self.tail()[-lines:] if line)
+        if len(text) > max_chars:
+            text = "…" + text[-(max_chars - 1):]
+        return text
+
+    def _open(self, command):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                rotate_file(self.path, self.backup_count)
+            self._file = open(self.path, "ab")
+            self._written = self._file.tell()
+            started = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._write(f"===== {started} 실행: {command or ''} =====\n".encode("utf-8"))
+        except OSError as e:
+            # 파일에 못 쓰더라도 마지막 출력 줄은 메모리에 남김
+            self._file = None
+            print(f"\033[90m[DEBUG] 작업 출력 로그 파일 열기 실패: {e}\033[0m")
+
+    def _write(self, data):
+        if self._file is None:
+            return
+        try:
+            if self._written + len(data) > self.max_bytes and self._written > 0:
+                self._file.close()
+                rotate_file(self.path, self.backup_count)
+                self._file = open(self.path, "ab")
+                self._written = self._file.tell()
+            self._file.write(data)
+            self._written += len(data)
+        except OSError:
+            # 디스크 오류 등 - 이후 출력은 파일에 남기지 않고 파이프만 계속 비움
+            self._close_file()
+
+    def _drain(self, stream):
+        """파이프가 닫힐 때까지 (프로세스와 그 자식이 모두 종료될 때까지) 읽기"""
+        partial = b""
+        try:
+            while True:
+                # 읽을 수 있는 만큼만 한 번에 가져옴 (줄 단위로 읽지 않으므로 출력이 많아도 빠름)
+                chunk = stream.read1(OUTPUT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.bytes_read += len(chunk)
+                self._write(chunk)
+                lines = (partial + chunk).split(b"\n")
+                partial = lines.pop()[-OUTPUT_READ_SIZE:]
+                self._add_lines(lines)
+            if partial:
+                self._add_lines([partial])
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except OSError:
+                pass
+            self._close_file()
+
+    def _add_lines(self, lines):
+        """완성된 줄들을 세고 마지막 몇 줄만 디코딩해서 보관"""
+        with self._lock:
+            self.lines_read += len(lines)
+            for line in lines[-self._tail.maxlen:]:
+                self._tail.append(line[:OUTPUT_READ_SIZE].decode("utf-8", errors="replace").rstrip("\r"))
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
@@ -0,0 +1,240 @@
+import collections
+import datetime
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from job_launcher import LaunchResult
+
+
+def terminate_process_tree(process, force=False):
+    """작업 프로세스와 그 자식 프로세스까지 종료 (force=True면 강제 종료)"""
+    try:
+        if sys.platform == 'win32':
+            # shell=True로 실행했으므로 cmd.exe 아래 자식까지 함께 종료
+            args = ["taskkill", "/T", "/PID", str(process.pid)]
+            if force:
+                args.insert(1, "/F")
+            subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            # start_new_session=True로 실행했으므로 프로세스 그룹 전체에 신호 전송
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except (OSError, ProcessLookupError):
+        pass
+
+
+class ChildRecord:
+    """감독 중인 작업 프로세스 하나"""
+    __slots__ = ("key", "job", "process", "scheduled_at", "started_at", "started_mono", "exited_mono", "on_exit",
+                 "terminated_at", "return_code", "duration", "timed_out", "reported", "output")
+
+    def __init__(self, key, job, process, scheduled_at, started_at, on_exit, output=None):
+        self.key = key                    # (시트이름, 행번호) - 겹침 방지 기준
+        self.job = job
+        self.process = process
+        self.scheduled_at = scheduled_at
+        self.started_at = started_at
+        self.started_mono = time.monotonic()
+        self.exited_mono = None           # 프로세스가 실제로 종료된 시각 (모노토닉, 대기 스레드가 기록)
+        self.on_exit = on_exit
+        self.terminated_at = None         # 시간 초과로 종료 신호를 보낸 시각 (모노토닉)
+        self.return_code = None
+        self.duration = None              # 실행 시간 (초)
+        self.timed_out = False
+        self.reported = False             # 기동 확인 결과를 알린 뒤에만 종료 처리 (H열 로그 순서 보장)
+        self.output = output              # 출력 캡처를 켠 경우 OutputCapture (종료 후 마지막 출력 확인용)
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+
+class JobSupervisor:
+    """실행한 작업 프로세스를 추적하고 회수하는 감독기
+
+    - 백그라운드 스레드가 poll_interval초마다 자식 프로세스를 확인해서 종료 코드/실행 시간 기록
+      (작업마다 대기 스레드가 실제 종료 시각을 기록하고 회수 스레드를 바로 깨움 - 실행 시간이 회수 주기만큼 늘지 않음)
+    - 같은 작업(시트, 행)의 이전 실행이 아직 진행 중이면 새 실행은 건너뜀 (prevent_overlap)
+    - 동시에 실행 중인 작업이 max_concurrency개를 넘으면 대기열에 넣었다가 자리가 나면 실행 (None이면 제한 없음)
+    - timeout초를 넘긴 작업은 종료 신호를 보내고, kill_grace초 뒤에도 살아 있으면 강제 종료
+    """
+
+    def __init__(self, max_concurrency=None, timeout=None, kill_grace=10.0, poll_interval=1.0,
+                 max_queue=1000, prevent_overlap=True, history_size=200):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.kill_grace = kill_grace
+        self.poll_interval = poll_interval
+        self.max_queue = max_queue
+        self.prevent_overlap = prevent_overlap
+        self.history = collections.deque(maxlen=history_size)  # 최근 종료된 ChildRecord
+        self._lock = threading.Lock()
+        self._reserved = 0                          # 시작 중이거나 실행 중인 작업 수
+        self._active_keys = collections.Counter()   # 시작 중이거나 실행 중인 작업 키
+        self._children = []                         # 실행 중인 ChildRecord
+        self._queue = collections.deque()           # 자리를 기다리는 실행 요청
+        self._stop = threading.Event()
+        self._wake = threading.Event()                # 작업이 끝나거나 기동 확인 결과가 나오면 회수 스레드를 깨움
+        self._thread = threading.Thread(target=self._run, name="job-supervisor", daemon=True)
+        self._thread.start()
+
+    def running(self):
+        """실행 중인 ChildRecord 리스트"""
+        with self._lock:
+            return list(self._children)
+
+    def queue_depth(self):
+        """자리를 기다리는 실행 요청 수"""
+        with self._lock:
+            return len(self._queue)
+
+    def recent(self, limit=None):
+        """최근 종료된 ChildRecord 리스트 (오래된 것부터)"""
+        with self._lock:
+            records = list(self.history)
+        return records[-limit:] if limit else records
+
+    def submit(self, launcher, key, job, scheduled_at, on_result, on_exit=None):
+        """작업 실행 요청 (겹치면 건너뛰고, 자리가 없으면 대기열에 넣음)"""
+        item = (launcher, key, job, scheduled_at, on_result, on_exit)
+        with self._lock:
+            reason = self._overlap_reason(key)
+            if reason is None and self.max_concurrency and self._reserved >= self.max_concurrency:
+                if len(self._queue) >= self.max_queue:
+                    reason = "실행 대기열이 가득 참"
+                else:
+                    self._queue.append(item)
+                    print(f"\033[90m[DEBUG] 동시 실행 제한({self.max_concurrency})으로 대기: {job.command} (대기 {len(self._queue)}건)\033[0m")
+                    return
+            if reason is None:
+                self._reserve(key)
+        if reason is not None:
+            self._skip(job, scheduled_at, on_result, reason)
+            return
+        self._start(item)
+
+    def shutdown(self, kill=False):
+        """감독 스레드 종료 (kill=True면 실행 중인 작업도 종료)"""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(self.poll_interval * 2)
+        if kill:
+            for record in self.running():
+                terminate_process_tree(record.process, force=True)
+
+    def _overlap_reason(self, key):
+        """겹침 때문에 실행하면 안 되는 경우 그 이유 (lock 보유 상태에서 호출)"""
+        if not self.prevent_overlap:
+            return None
+        if self._active_keys[key]:
+            return "이전 실행이 아직 진행 중"
+        if any(queued[1] == key for queued in self._queue):
+            return "이전 실행이 대기 중"
+        return None
+
+    def _reserve(self, key):
+        self._reserved += 1
+        self._active_keys[key] += 1
+
+    def _release(self, key):
+        """자리 반납 후 대기열에서 실행할 수 있는 요청 꺼내서 실행"""
+        to_start = []
+        with self._lock:
+            self._reserved -= 1
+            self._active_keys[key] -= 1
+            if self._active_keys[key] <= 0:
+                del self._active_keys[key]
+            while self._queue and (not self.max_concurrency or self._reserved < self.max_concurrency):
+                item = self._queue.popleft()
+                self._reserve(item[1])
+                to_start.append(item)
+        for item in to_start:
+            self._start(item)
+
+    def _skip(self, job, scheduled_at, on_result, reason):
+        result = LaunchResult(job, scheduled_at)
+        result.skipped = reason
+        on_result(result)
+
+    def _start(self, item):
+        launcher, key, job, scheduled_at, on_result, on_exit = item
+
+        records = []
+
+        def on_start(job, process, started_at, output=None):
+            record = ChildRecord(key, job, process, scheduled_at, started_at, on_exit, output)
+            records.append(record)
+            with self._lock:
+                self._children.append(record)
+            threading.Thread(target=self._wait_child, args=(record,), name="job-wait", daemon=True).start()
+
+        def on_launch_result(result):
+            try:
+                on_result(result)
+            finally:
+                if result.pid is None:
+                    # 프로세스 자체를 시작하지 못했으면 자리 바로 반납
+                    self._release(key)
+                for record in records:
+                    record.reported = True
+                if records:
+                    self._wake.set()
+
+        launcher.launch([job], scheduled_at, on_launch_result, on_start=on_start)
+
+    def _wait_child(self, record):
+        """작업 하나의 종료를 기다려서 실제 종료 시각을 기록하고 회수 스레드를 깨움"""
+        try:
+            record.process.wait()
+        except Exception:
+            return  # 회수 스레드의 poll()로 처리
+        record.exited_mono = time.monotonic()
+        self._wake.set()
+
+    def _run(self):
+        """백그라운드 회수 루프 (poll_interval초마다, 또는 작업이 끝나면 바로)"""
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.reap()
+
+    def reap(self):
+        """종료된 자식 프로세스 회수 및 시간 초과 작업 종료"""
+        now = time.monotonic()
+        finished = []
+        with self._lock:
+            children = list(self._children)
+        for record in children:
+            return_code = record.process.poll()
+            if return_code is not None and record.reported:
+                record.return_code = return_code
+                # 회수 시각이 아니라 실제 종료 시각 기준 (대기 스레드가 아직 기록하지 못했으면 지금)
+                record.duration = (record.exited_mono or now) - record.started_mono
+                finished.append(record)
+                continue
+            if self.timeout and now - record.started_mono > self.timeout:
+                if record.terminated_at is None:
+                    print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏱️ 시간 초과({self.timeout}초)로 종료: {record.job.command} (PID: {record.pid})")
+                    record.timed_out = True
+                    record.terminated_at = now
+                    terminate_process_tree(record.process)
+                elif now - record.terminated_at > self.kill_grace:
+                    terminate_process_tree(record.process, force=True)
+        if not finished:
+            return []
+        with self._lock:
+            self._children = [record for record in self._children if record not in finished]
+            self.history.extend(finished)
+        for record in finished:
+            self._release(record.key)
+            if record.on_exit is not None:
+                try:
+                    record.on_exit(record)
+                except Exception as e:
+                    print(f"\033[90m[DEBUG] 종료 처리 중 오류: {e}\033[0m")
+        return finished
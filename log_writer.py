@@ -0,0 +1,122 @@
+import atexit
+import collections
+import datetime
+import json
+import os
+import sys
+import threading
+
+LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server_log.jsonl")
+LOG_MAX_BYTES = 5 * 1024 * 1024  # 로그 파일이 이 크기를 넘으면 교체 (바이트)
+LOG_BACKUP_COUNT = 5  # 보관할 이전 로그 파일 수 (server_log.jsonl.1 ~ .5)
+
+
+def is_headless():
+    """표준 출력이 터미널이 아닌지 (schtasks 리디렉션, pythonw 등) - 이때는 매초 갱신되는 표시를 생략"""
+    stream = sys.stdout
+    if stream is None:
+        return True
+    try:
+        return not stream.isatty()
+    except (AttributeError, ValueError):
+        return True
+
+
+class LogWriter:
+    """JSON-lines 로그를 메모리에 모았다가 백그라운드 스레드가 한 번에 기록하는 작성기
+
+    - log()는 버퍼에 넣기만 하고 바로 반환 (줄마다 파일을 열고 닫지 않음)
+    - flush_interval초마다 모인 로그를 파일을 한 번 열어서 기록
+    - 파일이 max_bytes를 넘거나 날짜가 바뀌면 path.1, path.2 ...로 밀어내고 새 파일 시작
+    - 버퍼가 max_buffer줄을 넘으면 오래된 것부터 버림 (dropped에 누적)
+    - 프로세스 종료 시(atexit) 남은 로그 기록
+    """
+
+    def __init__(self, path=LOG_PATH, source=None, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                 flush_interval=1.0, max_buffer=10000):
+        self.path = path
+        self.source = source or os.path.basename(sys.argv[0] or "python")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._buffer = collections.deque(maxlen=max_buffer)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """백그라운드 기록 스레드 시작"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    def log(self, message, level="info", **fields):
+        """로그 한 줄 기록 요청 (fields는 JSON 필드로 함께 저장)"""
+        record = {
+            'ts': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'level': level,
+            'source': self.source,
+            'msg': message,
+        }
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(line)
+
+    def flush(self):
+        """버퍼에 모인 로그를 파일에 기록"""
+        with self._lock:
+            if not self._buffer:
+                return
+            lines = list(self._buffer)
+            self._buffer.clear()
+        with self._write_lock:
+            try:
+                self._rotate_if_needed()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                # 기록 실패해도 스케줄러는 계속 진행 (이번 로그는 버림)
+                self.dropped += len(lines)
+                print(f"\033[90m[DEBUG] 로그 파일 기록 실패: {e}\033[0m")
+
+    def close(self):
+        """스레드 종료 후 남은 로그 기록"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.flush_interval * 2)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _rotate_if_needed(self):
+        """크기 초과 또는 날짜 변경 시 파일 교체 (다른 프로세스가 쓰는 중이라 실패하면 다음에 다시 시도)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        modified = datetime.date.fromtimestamp(stat.st_mtime)
+        if stat.st_size < self.max_bytes and modified == datetime.date.today():
+            return
+        if stat.st_size == 0:
+            return
+        try:
+            for index in range(self.backup_count - 1, 0, -1):
+                older = f"{self.path}.{index}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.path}.{index + 1}")
+            if self.backup_count > 0:
+                os.replace(self.path, f"{self.path}.1")
+            else:
+                os.remove(self.path)
+        except OSError:
+            pass
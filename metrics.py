@@ -0,0 +1,348 @@
+import os
+import threading
+import time
+
+# 기본 히스토그램 구간 (초) - API 호출, 컴파일, 실행 지연 모두 ms~수십 초 범위
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_FILE_INTERVAL = 15  # Prometheus 텍스트 파일 갱신 주기 (초)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """라벨별 값을 가지는 지표 공통 부분"""
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class _FunctionMetric(_Metric):
+    """라벨 없는 값을 내보낼 때마다 set_function()으로 지정한 함수에서 읽을 수 있는 지표"""
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self._function = None
+
+    def set_function(self, function):
+        """라벨 없는 값을 내보낼 때마다 function()으로 읽음 (큐 길이, 다른 객체가 세는 누적 값 등)"""
+        self._function = function
+
+    def render(self):
+        if self._function is not None:
+            try:
+                value = self._function()
+                with self._lock:
+                    self._values[()] = value
+            except Exception:
+                pass
+        return super().render()
+
+
+class Counter(_FunctionMetric):
+    """증가만 하는 누적 값 (inc로 더하거나, 다른 객체가 세는 누적 값을 set_function으로 읽음)"""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_FunctionMetric):
+    """현재 값 (set으로 지정하거나, set_function으로 내보낼 때마다 읽음)"""
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """구간별 누적 개수와 합계 (지연 시간 분포)"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels):
+        """with 블록의 실행 시간을 기록하는 컨텍스트 매니저"""
+        return _Timer(self, labels)
+
+    def totals(self):
+        """라벨 값 튜플 -> (기록 수, 합계) (상태 조회용)"""
+        with self._lock:
+            return {key: (state[2], state[1]) for key, state in self._values.items()}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labels, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class PhaseTimer:
+    """구간별 소요 시간 측정 (시작 시간 분석 등) - mark(이름)는 직전 mark 이후 걸린 시간을 기록"""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases = []  # [(구간 이름, 초), ...]
+        self._last = self.start
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.start
+
+    def summary(self):
+        parts = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases)
+        return f"{parts} (합계 {self.total() * 1000:.0f}ms)"
+
+
+class MetricsRegistry:
+    """지표 모음 (Prometheus 텍스트 형식으로 내보내기)"""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self):
+        """모든 지표를 Prometheus 텍스트 형식 문자열로 변환"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """텍스트 파일로 저장 (node_exporter textfile collector용, 임시 파일에 쓴 뒤 교체)"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def start_textfile_writer(self, path, interval=METRICS_FILE_INTERVAL):
+        """interval초마다 텍스트 파일을 갱신하는 백그라운드 스레드 시작"""
+        def run():
+            while True:
+                try:
+                    self.write_textfile(path)
+                except OSError as e:
+                    print(f"\033[90m[DEBUG] 지표 파일 저장 실패: {e}\033[0m")
+                time.sleep(interval)
+        threading.Thread(target=run, name="metrics-textfile", daemon=True).start()
+
+    def serve_http(self, port, host="127.0.0.1"):
+        """로컬 HTTP 포트에서 /metrics 제공 (백그라운드 스레드)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # 포트를 쓸 때만 import
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 콘솔에 출력하지 않음
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _InstrumentedRequest:
+    """execute() 시간을 API 메서드별로 기록하는 요청 래퍼"""
+
+    def __init__(self, request, method, latency, errors):
+        self._request = request
+        self._method = method
+        self._latency = latency
+        self._errors = errors
+
+    def execute(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._request.execute(*args, **kwargs)
+        except Exception as e:
+            status = getattr(getattr(e, 'resp', None), 'status', None)
+            self._errors.inc(method=self._method, status=status or type(e).__name__)
+            raise
+        finally:
+            self._latency.observe(time.perf_counter() - start, method=self._method)
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+
+class InstrumentedService:
+    """시트 서비스 객체를 감싸서 모든 API 호출의 지연/오류를 기록
+
+    service.spreadsheets().values().batchGet(...).execute() 처럼 호출 경로를 그대로 따라가며
+    메서드 이름은 'spreadsheets.values.batchGet' 형태의 라벨로 기록
+    """
+
+    def __init__(self, target, latency, errors, path=""):
+        self._target = target
+        self._latency = latency
+        self._errors = errors
+        self._path = path
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        method = f"{self._path}.{name}" if self._path else name
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                return _InstrumentedRequest(result, method, self._latency, self._errors)
+            return InstrumentedService(result, self._latency, self._errors, method)
+        return call
+
+
+class SchedulerMetrics:
+    """스케줄러가 내보내는 지표 묶음"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.api_latency = r.histogram("scheduler_sheets_api_request_seconds",
+                                       "Sheets API 호출 지연 (메서드별)", ("method",))
+        self.api_errors = r.counter("scheduler_sheets_api_errors_total",
+                                    "Sheets API 호출 오류 수", ("method", "status"))
+        self.poll_seconds = r.histogram("scheduler_poll_seconds", "시트 재조회 한 번(조회+컴파일) 소요 시간")
+        self.polls = r.counter("scheduler_polls_total", "시트 재조회 횟수 (result=changed/unchanged/error)",
+                               ("result",))
+        self.rows_parsed = r.counter("scheduler_rows_parsed_total", "재조회로 읽은 시트 행 수", ("sheet",))
+        self.sheet_rows = r.gauge("scheduler_sheet_rows", "마지막 재조회에서 읽은 시트 행 수", ("sheet",))
+        self.compile_seconds = r.histogram("scheduler_compile_seconds", "스케줄 테이블 컴파일 시간", ("sheet",))
+        self.scheduled_jobs = r.gauge("scheduler_scheduled_jobs", "컴파일된 예약 작업 수", ("sheet",))
+        self.launch_jitter = r.histogram("scheduler_launch_jitter_seconds", "예약 시각 대비 실제 프로세스 시작 지연")
+        self.jobs_started = r.counter("scheduler_jobs_started_total", "시작한 작업 수", ("sheet",))
+        self.jobs_failed = r.counter("scheduler_jobs_failed_total",
+                                     "실패한 작업 수 (reason=launch_error/exit_code/timeout)",
+                                     ("sheet", "reason"))
+        self.jobs_skipped = r.counter("scheduler_jobs_skipped_total", "건너뛴 작업 수 (겹침 등)", ("sheet",))
+        self.jobs_completed = r.counter("scheduler_jobs_completed_total", "정상 종료(종료 코드 0)한 작업 수", ("sheet",))
+        self.job_duration = r.histogram("scheduler_job_duration_seconds", "작업 실행 시간", ("sheet",),
+                                        buckets=(1, 5, 10, 30, 60, 300, 900, 1800, 3600))
+        self.log_queue_depth = r.gauge("scheduler_log_queue_depth", "기록 대기 중인 H열 로그 수")
+        self.log_dropped = r.counter("scheduler_log_dropped_total", "큐가 가득 차서 버린 H열 로그 수")
+        self.running_jobs = r.gauge("scheduler_running_jobs", "실행 중인 작업 수")
+        self.job_queue_depth = r.gauge("scheduler_job_queue_depth", "동시 실행 제한으로 대기 중인 작업 수")
+        self.poll_interval = r.gauge("scheduler_poll_interval_seconds", "현재 시트 재조회 주기")
+        self.startup_seconds = r.gauge("scheduler_startup_phase_seconds",
+                                       "프로세스 시작부터 첫 스케줄 평가까지 구간별 소요 시간", ("phase",))
+        self.schedule_age = r.gauge("scheduler_schedule_age_seconds",
+                                    "마지막으로 시트 조회에 성공한 뒤 지난 시간 (스냅샷 기준, 없으면 -1)")
+        self.api_retries = r.counter("scheduler_sheets_api_retries_total", "429/5xx 등으로 재시도한 API 호출 누적 수")
+        self.api_throttled = r.counter("scheduler_sheets_api_throttled_seconds_total", "분당 요청 한도 때문에 기다린 누적 시간")
+        self.cluster_leases = r.counter("scheduler_cluster_leases_total",
+                                        "클러스터 모드 실행 리스 시도 결과 (result=acquired/lost)", ("result",))
+        self.cluster_nodes = r.gauge("scheduler_cluster_nodes", "클러스터 모드에서 살아 있는 노드 수")
+        self.phase_seconds = r.histogram("scheduler_phase_seconds",
+                                         "스케줄러 루프 구간별 소요 시간 (phase=fetch/compile/snapshot/dispatch/log_write)",
+                                         ("phase",))
+
+    def instrument(self, service):
+        """서비스 객체의 API 호출을 지표로 기록하도록 감쌈"""
+        return InstrumentedService(service, self.api_latency, self.api_errors)
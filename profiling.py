@@ -0,0 +1,220 @@
+import cProfile
+import datetime
+import io
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+PROFILE_REQUEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profile_request.txt")
+PROFILE_TICKS = 20  # 프로파일 요청 시 기본으로 기록할 루프 처리(틱) 수
+PROFILE_TOP = 40  # 프로파일 요약에 보여줄 함수 수 (누적 시간순)
+TRACEMALLOC_INTERVAL = 600  # 메모리 추적 시 스냅샷 비교 주기 기본값 (초)
+TRACEMALLOC_TOP = 25  # 메모리 비교 결과에 보여줄 코드 위치 수
+TRACEMALLOC_FRAMES = 1  # 할당 위치로 기록할 호출 스택 깊이 (깊을수록 추적 비용 증가)
+
+
+class Profiler:
+    """장시간 실행 중인 스케줄러용 프로파일링 스위치 (재시작 없이 켜고 끔)
+
+    - 프로파일: 다음 N번의 루프 처리(틱, 대기 시간 제외)를 cProfile로 기록해서 .prof와 요약 .txt 저장
+      (cProfile은 스케줄러 루프 스레드만 기록 - 실행기/감독/H열 기록 스레드는 구간별 시간 지표로 확인)
+    - 메모리 추적: tracemalloc을 켜고 주기마다 직전 스냅샷 대비 늘어난 할당 위치 상위 목록 저장
+    - 요청(request_*)은 신호 처리기/제어 포트 스레드에서 와도 되며 값만 기록하고 (lock 없음),
+      실제 시작/저장은 루프 스레드의 tick_begin()/tick_end()에서 처리
+    """
+
+    def __init__(self, output_dir=PROFILE_DIR, request_file=PROFILE_REQUEST_FILE):
+        self.output_dir = output_dir
+        self.request_file = request_file
+        self.memory_interval = 0       # 현재 메모리 추적 주기 (초, 0이면 꺼짐)
+        self.last_outputs = []         # 최근에 저장한 결과 파일 경로
+        self._requested_ticks = 0
+        self._requested_interval = None
+        self._profile = None
+        self._ticks_left = 0
+        self._in_tick = False
+        self._memory_due = None
+        self._baseline = None
+
+    @property
+    def profiling(self):
+        return self._profile is not None
+
+    def request_profile(self, ticks=PROFILE_TICKS):
+        """다음 ticks번의 틱을 프로파일 (이미 기록 중이면 남은 틱 수를 다시 지정)"""
+        self._requested_ticks = max(1, int(ticks))
+
+    def request_memory(self, interval=TRACEMALLOC_INTERVAL):
+        """interval초마다 메모리 스냅샷 비교 (0이면 메모리 추적 끔)"""
+        self._requested_interval = max(0, float(interval))
+
+    def apply_command(self, text):
+        """'profile [틱 수]' / 'memory [주기(초)|off]' 형식의 요청 적용 후 안내 메시지 반환 (형식이 틀리면 None)"""
+        parts = text.split()
+        if not parts:
+            return None
+        name, value = parts[0].lower(), parts[1] if len(parts) > 1 else None
+        try:
+            if name == "profile":
+                self.request_profile(int(value) if value else PROFILE_TICKS)
+                return f"다음 {self._requested_ticks}틱 프로파일 예약"
+            if name == "memory":
+                self.request_memory(0 if value == "off" else float(value) if value else TRACEMALLOC_INTERVAL)
+                return "메모리 추적 끔 예약" if not self._requested_interval else f"메모리 추적 예약 ({self._requested_interval:g}초마다)"
+        except ValueError:
+            return None
+        return None
+
+    def tick_begin(self):
+        """루프 처리 시작 (대기가 끝난 직후) - 요청 파일 확인 및 프로파일 시작"""
+        self._in_tick = True
+        self._check_request_file()
+        if self._requested_ticks:
+            self._ticks_left, self._requested_ticks = self._requested_ticks, 0
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+                print(f"\033[90m[DEBUG] 프로파일 시작 (다음 {self._ticks_left}틱)\033[0m")
+        if self._profile is not None:
+            try:
+                self._profile.enable()
+            except ValueError as e:
+                # 다른 프로파일러가 이미 켜져 있는 경우
+                print(f"\033[90m[DEBUG] 프로파일 시작 실패: {e}\033[0m")
+                self._profile = None
+
+    def tick_end(self):
+        """루프 처리 끝 - 프로파일 틱 수를 채웠으면 저장, 메모리 비교 주기가 됐으면 스냅샷 비교 저장"""
+        if not self._in_tick:
+            return
+        self._in_tick = False
+        if self._profile is not None:
+            self._profile.disable()
+            self._ticks_left -= 1
+            if self._ticks_left <= 0:
+                self._dump_profile()
+        if self._requested_interval is not None:
+            self._set_memory_interval(self._requested_interval)
+            self._requested_interval = None
+        if self.memory_interval and time.monotonic() >= self._memory_due:
+            self._memory_due = time.monotonic() + self.memory_interval
+            self._dump_memory()
+
+    def status(self):
+        """제어 포트 /status용 상태"""
+        status = {
+            'profiling': self.profiling,
+            'profile_ticks_left': self._ticks_left if self.profiling else 0,
+            'memory_interval': self.memory_interval,
+            'outputs': list(self.last_outputs),
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            status['traced_memory'] = current
+            status['traced_memory_peak'] = peak
+        return status
+
+    def close(self):
+        """종료 시 기록 중인 프로파일 저장, 메모리 추적 끄기"""
+        if self._profile is not None:
+            self._profile.disable()
+            self._dump_profile()
+        if self.memory_interval:
+            self._set_memory_interval(0)
+
+    def _check_request_file(self):
+        """요청 파일(profile_request.txt)이 있으면 읽고 삭제한 뒤 적용 (포트/신호를 쓸 수 없는 Windows pythonw용)"""
+        if not self.request_file or not os.path.exists(self.request_file):
+            return
+        try:
+            with open(self.request_file, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            os.remove(self.request_file)
+        except OSError:
+            return
+        for line in lines:
+            if line.strip():
+                message = self.apply_command(line)
+                print(f"\033[90m[DEBUG] 프로파일 요청 파일: {line.strip()} -> {message or '형식 오류 (profile [틱 수] / memory [초|off])'}\033[0m")
+
+    def _set_memory_interval(self, interval):
+        if interval and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._baseline = None
+        self.memory_interval = interval
+        if interval:
+            # 켠 직후 기준 스냅샷을 바로 남기고 이후 주기마다 비교
+            self._memory_due = time.monotonic()
+            print(f"\033[90m[DEBUG] 메모리 추적 ({interval:g}초마다 스냅샷 비교, 결과: {self.output_dir})\033[0m")
+        else:
+            self._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            print(f"\033[90m[DEBUG] 메모리 추적 끔\033[0m")
+
+    def _output_path(self, prefix, extension):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(self.output_dir, f"{prefix}_{stamp}.{extension}")
+
+    def _remember(self, path):
+        self.last_outputs = (self.last_outputs + [path])[-5:]
+
+    def _dump_profile(self):
+        profile, self._profile, self._ticks_left = self._profile, None, 0
+        try:
+            path = self._output_path("profile", "prof")
+            profile.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            with open(path[:-len(".prof")] + ".txt", "w", encoding="utf-8") as f:
+                f.write(summary.getvalue())
+        except (OSError, TypeError) as e:
+            print(f"\033[90m[DEBUG] 프로파일 저장 실패: {e}\033[0m")
+            return
+        self._remember(path)
+        print(f"\033[90m[DEBUG] 프로파일 저장: {path} (요약: .txt, 자세히: python -m pstats {path})\033[0m")
+
+    def _dump_memory(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        if self._baseline is None:
+            title = "첫 스냅샷 - 할당 크기 상위"
+            stats = snapshot.statistics("lineno")
+        else:
+            title = "직전 스냅샷 대비 증가분 상위"
+            stats = snapshot.compare_to(self._baseline, "lineno")
+        self._baseline = snapshot
+        lines = [
+            f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} 추적 중인 메모리 {current / 1024:.1f} KiB "
+            f"(최대 {peak / 1024:.1f} KiB)",
+            title,
+        ]
+        lines.extend(str(stat) for stat in stats[:TRACEMALLOC_TOP])
+        try:
+            path = self._output_path("tracemalloc", "txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"\033[90m[DEBUG] 메모리 스냅샷 저장 실패: {e}\033[0m")
+            return
+        self._remember(path)
+        print(f"\033[90m[DEBUG] 메모리 스냅샷: {current / 1024:.1f} KiB (최대 {peak / 1024:.1f} KiB) -> {path}\033[0m")
+
+
+def install_signal_handlers(profiler):
+    """SIGUSR1: 다음 PROFILE_TICKS틱 프로파일, SIGUSR2: 메모리 추적 켜기/끄기 (신호가 없는 Windows나 메인 스레드가 아니면 False)"""
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    try:
+        signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.request_profile())
+        signal.signal(signal.SIGUSR2, lambda signum, frame: profiler.request_memory(
+            0 if profiler.memory_interval else TRACEMALLOC_INTERVAL))
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,304 @@
+import bisect
+import datetime
+import re
+
+MAX_SEARCH_DAYS = 3000  # 다음 실행일을 찾을 최대 일수 (2월 29일 + 특정 요일 같은 드문 조건도 찾을 수 있도록)
+
+WEEKDAY_NAMES = {
+    '월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6,
+    'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6,
+}
+DAY_KEYWORDS = {
+    '매일': None, 'daily': None,
+    '평일': frozenset(range(5)), 'weekdays': frozenset(range(5)),
+    '주말': frozenset((5, 6)), 'weekends': frozenset((5, 6)),
+}
+INTERVAL_UNITS = {
+    '초': 1, 's': 1, 'sec': 1,
+    '분': 60, 'm': 60, 'min': 60,
+    '시간': 3600, 'h': 3600, 'hour': 3600, 'hours': 3600,
+}
+CRON_MONTH_NAMES = {name: index for index, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+CRON_DAY_NAMES = {'sun': 0, 'mon': 1, 'tue': 2, 'wed': 3, 'thu': 4, 'fri': 5, 'sat': 6}
+MONTH_MAX_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)  # 월별 최대 일수 (2월은 윤년 기준)
+
+_TIME_RE = re.compile(r'^(\d{1,2}):(\d{2})(?::(\d{2}))?$')
+_DATE_RE = re.compile(r'^\d{4}-\d{1,2}-\d{1,2}$')
+_INTERVAL_RE = re.compile(r'^(\d+)([a-z가-힣]+)$')
+_CRON_FIELD_RE = re.compile(r'^[0-9a-z*/,\-]+$')
+
+
+def _parse_clock(text):
+    """'9:05', '09:05:30' -> 하루 기준 초 (형식이 잘못되면 ValueError)"""
+    match = _TIME_RE.match(text)
+    if not match:
+        raise ValueError(text)
+    hour, minute, second = int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+    if hour >= 24 or minute >= 60 or second >= 60:
+        raise ValueError(text)
+    return hour * 3600 + minute * 60 + second
+
+
+def _parse_date(text):
+    if not _DATE_RE.match(text):
+        raise ValueError(text)
+    return datetime.date(*map(int, text.split('-')))
+
+
+class TimeList:
+    """하루 중 실행 시각 목록 (정렬된 하루 기준 초, bisect로 다음 시각 조회)"""
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds):
+        self.seconds = sorted(set(seconds))
+
+    def next(self, second, inclusive):
+        """second 이후(inclusive면 같은 시각 포함) 오늘 남은 가장 빠른 시각 (없으면 None)"""
+        pos = (bisect.bisect_left if inclusive else bisect.bisect_right)(self.seconds, second)
+        return self.seconds[pos] if pos < len(self.seconds) else None
+
+    def contains(self, second):
+        pos = bisect.bisect_left(self.seconds, second)
+        return pos < len(self.seconds) and self.seconds[pos] == second
+
+
+class TimeRange:
+    """하루 중 start~end 사이 step초 간격 실행 시각 (목록으로 펼치지 않고 계산)"""
+    __slots__ = ("start", "end", "step")
+
+    def __init__(self, start, end, step):
+        self.start = start
+        self.end = end
+        self.step = step
+
+    def next(self, second, inclusive):
+        if second < self.start or (second == self.start and inclusive):
+            return self.start if self.start <= self.end else None
+        steps, rest = divmod(second - self.start, self.step)
+        if rest or not inclusive:
+            steps += 1
+        candidate = self.start + steps * self.step
+        return candidate if candidate <= self.end else None
+
+    def contains(self, second):
+        return self.start <= second <= self.end and (second - self.start) % self.step == 0
+
+
+class DayFilter:
+    """실행할 날짜 조건 (요일, 월, 일, 날짜 범위)
+
+    cron처럼 일(monthdays)과 요일(weekdays)을 둘 다 지정하면 둘 중 하나만 맞아도 실행 (dom_dow_or=True)
+    """
+    __slots__ = ("weekdays", "months", "monthdays", "date_from", "date_to", "dom_dow_or")
+
+    def __init__(self, weekdays=None, months=None, monthdays=None, date_from=None, date_to=None, dom_dow_or=False):
+        self.weekdays = weekdays      # 월=0 ... 일=6 (None이면 모든 요일)
+        self.months = months
+        self.monthdays = monthdays
+        self.date_from = date_from
+        self.date_to = date_to
+        self.dom_dow_or = dom_dow_or
+
+    def matches(self, day):
+        if self.date_from is not None and day < self.date_from:
+            return False
+        if self.date_to is not None and day > self.date_to:
+            return False
+        if self.months is not None and day.month not in self.months:
+            return False
+        weekday_ok = self.weekdays is None or day.weekday() in self.weekdays
+        monthday_ok = self.monthdays is None or day.day in self.monthdays
+        if self.dom_dow_or and self.weekdays is not None and self.monthdays is not None:
+            return weekday_ok or monthday_ok
+        return weekday_ok and monthday_ok
+
+
+class Recurrence:
+    """A열 반복 규칙 하나 (하루 중 실행 시각 + 실행할 날짜 조건)
+
+    실행 시각을 행마다 펼치지 않고 next_fire()에서 다음 실행 일시를 바로 계산
+    """
+    __slots__ = ("text", "times", "days")
+
+    def __init__(self, text, times, days):
+        self.text = text    # 정규화된 규칙 문자열 (출력용)
+        self.times = times  # TimeList 또는 TimeRange
+        self.days = days    # DayFilter
+
+    def matches(self, moment):
+        """해당 일시(초 단위)가 실행 시각인지"""
+        second = moment.hour * 3600 + moment.minute * 60 + moment.second
+        return self.days.matches(moment.date()) and self.times.contains(second)
+
+    def next_fire(self, after_datetime, inclusive=False):
+        """지정한 일시 이후 가장 빠른 실행 일시 (더 이상 없으면 None)"""
+        base = after_datetime.replace(microsecond=0)
+        day = base.date()
+        second = base.hour * 3600 + base.minute * 60 + base.second
+        if self.days.date_from is not None and day < self.days.date_from:
+            day, second, inclusive = self.days.date_from, 0, True
+        for _ in range(MAX_SEARCH_DAYS):
+            if self.days.date_to is not None and day > self.days.date_to:
+                return None
+            if self.days.matches(day):
+                next_second = self.times.next(second, inclusive)
+                if next_second is not None:
+                    return datetime.datetime.combine(day, datetime.time()) + datetime.timedelta(seconds=next_second)
+            day += datetime.timedelta(days=1)
+            second, inclusive = 0, True
+        return None
+
+
+def _parse_weekdays(token):
+    """'월,수,금', '월-금', 'mon-fri', '토요일' -> 요일 집합 (요일 토큰이 아니면 None)"""
+    days = set()
+    for part in token.split(','):
+        bounds = part.split('-')
+        if len(bounds) > 2:
+            return None
+        names = [bound[:-2] if bound.endswith('요일') else bound for bound in bounds]
+        if not all(name in WEEKDAY_NAMES for name in names):
+            return None
+        first, last = WEEKDAY_NAMES[names[0]], WEEKDAY_NAMES[names[-1]]
+        day = first
+        while True:
+            days.add(day)
+            if day == last:
+                break
+            day = (day + 1) % 7
+    return frozenset(days)
+
+
+def _parse_cron_field(text, low, high, names=None):
+    """cron 필드 하나 ('*', '*/5', '1-5', '1,15', 'mon-fri', '10-50/10') -> 값 집합"""
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(text)
+        if part == '*':
+            first, last = low, high
+        else:
+            bounds = [names[bound] if names and bound in names else int(bound) for bound in part.split('-')]
+            if len(bounds) == 1:
+                first = bounds[0]
+                last = high if step > 1 else first
+            elif len(bounds) == 2:
+                first, last = bounds
+            else:
+                raise ValueError(text)
+        if first < low or last > high or first > last:
+            raise ValueError(text)
+        values.update(range(first, last + 1, step))
+    return values
+
+
+def _parse_cron(fields, days):
+    """'분 시 일 월 요일' 5개 필드 -> 하루 중 실행 시각(TimeList) 반환, 날짜 조건은 days에 채움"""
+    minute, hour, monthday, month, weekday = fields
+    minutes = _parse_cron_field(minute, 0, 59)
+    hours = _parse_cron_field(hour, 0, 23)
+    times = TimeList(h * 3600 + m * 60 for h in hours for m in minutes)
+    if month != '*':
+        days.months = frozenset(_parse_cron_field(month, 1, 12, CRON_MONTH_NAMES))
+    if monthday != '*':
+        days.monthdays = frozenset(_parse_cron_field(monthday, 1, 31))
+    if weekday != '*':
+        # cron 요일은 일=0(또는 7) ... 토=6 -> 파이썬 weekday() 기준(월=0)으로 변환
+        days.weekdays = frozenset((value - 1) % 7 for value in _parse_cron_field(weekday, 0, 7, CRON_DAY_NAMES))
+    # cron과 같이 일/요일이 둘 다 '*'로 시작하지 않을 때만 둘 중 하나만 맞아도 실행 ('*/2'는 '*'로 취급해서 AND)
+    days.dom_dow_or = not (monthday.startswith('*') or weekday.startswith('*'))
+    # '0 9 31 2 *'처럼 지정한 월에 없는 날짜만 있으면 거부 (next_fire가 MAX_SEARCH_DAYS일을 헛돌지 않도록)
+    # 일/요일 중 하나만 맞아도 되는 경우는 요일로 실행되므로 제외
+    if days.monthdays is not None and not (days.dom_dow_or and days.weekdays is not None):
+        months = days.months if days.months is not None else range(1, 13)
+        if not any(day <= MONTH_MAX_DAYS[month - 1] for month in months for day in days.monthdays):
+            raise ValueError(monthday)
+    return times
+
+
+def parse_recurrence(text):
+    """A열 반복 규칙을 Recurrence로 변환 (형식이 잘못되면 None)
+
+    - 여러 시각:   "09:00, 13:00, 18:30"
+    - 간격:        "매 5분", "every 10m", "매 2시간 09:00-18:00" (시간대를 주면 그 시작 시각 기준)
+    - cron:        "*/5 9-18 * * 1-5" 또는 "cron 0 9 1 * *" (분 시 일 월 요일)
+    - 날짜 조건:   위 규칙 뒤에 "평일", "주말", "월,수,금", "월-금", "mon-fri",
+                   "2026-01-01~2026-03-31", "~2026-03-31", "2026-05-05" 등을 덧붙임
+    """
+    if not text:
+        return None
+    cleaned = re.sub(r'\s*([,~])\s*', r'\1', text.strip().lower())
+    cleaned = re.sub(r'(\d)\s*-\s*(\d)', r'\1-\2', cleaned)
+    cleaned = re.sub(r'(매|every)\s*(\d+)\s*', r'\1 \2', cleaned)  # "매5분", "매 5 분" -> "매 5분"
+    tokens = cleaned.split()
+    if not tokens:
+        return None
+    days = DayFilter()
+    try:
+        if tokens[0] == 'cron':
+            tokens = tokens[1:]
+            if len(tokens) < 5:
+                return None
+        if len(tokens) >= 5 and all(_CRON_FIELD_RE.match(token) for token in tokens[:5]) \
+                and tokens[0] not in ('every', 'daily', 'weekdays', 'weekends'):
+            times = _parse_cron(tokens[:5], days)
+            rest = tokens[5:]
+        else:
+            times, rest = None, []
+            interval = None
+            window = None
+            index = 0
+            while index < len(tokens):
+                token = tokens[index]
+                if token in ('매', 'every'):
+                    index += 1
+                    if index == len(tokens):
+                        return None
+                    token = tokens[index]
+                    match = _INTERVAL_RE.match(token)
+                    if not match or match.group(2) not in INTERVAL_UNITS:
+                        return None
+                    interval = int(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+                    if interval <= 0:
+                        return None
+                elif ':' in token and '-' in token and times is None:
+                    start_text, end_text = token.split('-', 1)
+                    window = (_parse_clock(start_text), _parse_clock(end_text))
+                elif ':' in token and times is None:
+                    times = TimeList(_parse_clock(part) for part in token.split(',') if part)
+                else:
+                    rest.append(token)
+                index += 1
+            if interval is not None:
+                if times is not None:
+                    return None
+                start, end = window or (0, 86399)
+                if start > end:
+                    return None
+                times = TimeRange(start, end, interval)
+            elif window is not None or times is None:
+                return None
+        for token in rest:
+            if token in DAY_KEYWORDS:
+                weekdays = DAY_KEYWORDS[token]
+                if weekdays is not None:
+                    days.weekdays = weekdays if days.weekdays is None else days.weekdays & weekdays
+            elif '~' in token:
+                start_text, end_text = token.split('~', 1)
+                days.date_from = _parse_date(start_text) if start_text else None
+                days.date_to = _parse_date(end_text) if end_text else None
+            elif _DATE_RE.match(token):
+                days.date_from = days.date_to = _parse_date(token)
+            else:
+                weekdays = _parse_weekdays(token)
+                if weekdays is None:
+                    return None
+                days.weekdays = weekdays if days.weekdays is None else days.weekdays & weekdays
+    except (ValueError, KeyError):
+        return None
+    return Recurrence(" ".join(cleaned.split()), times, days)
@@ -0,0 +1,124 @@
+import datetime
+import os
+import sqlite3
+import threading
+
+from schedule_table import slot_time_str
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_journal.db")
+DEFAULT_RETENTION_DAYS = 7  # 이 기간보다 오래된 실행 기록은 정리
+
+# 놓친 실행(재부팅 등으로 예약 시각에 꺼져 있던 경우) 처리 정책
+MISFIRE_SKIP = "skip"          # 놓친 실행은 건너뜀
+MISFIRE_RUN_ONCE = "run-once"  # 유예 시간 안에 놓친 작업은 (여러 번 놓쳤어도) 한 번만 실행
+MISFIRE_RUN_ALL = "run-all"    # 유예 시간 안에 놓친 실행을 모두 실행
+MISFIRE_POLICIES = (MISFIRE_SKIP, MISFIRE_RUN_ONCE, MISFIRE_RUN_ALL)
+
+
+class RunJournal:
+    """예약 실행 기록 저널 (SQLite, WAL 모드)
+
+    (실행 날짜, 시트, 행, 시간) 하나당 한 줄을 추가만 하는 방식으로 기록해서
+    재시작해도 같은 날 같은 슬롯이 다시 실행되지 않고, 다음 날에는 다시 실행됨.
+    시작할 때 최근 기록을 메모리로 읽어서 이후 중복 확인은 메모리에서 처리
+    """
+
+    def __init__(self, path=JOURNAL_PATH, retention_days=DEFAULT_RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_date TEXT NOT NULL,"
+            " sheet TEXT NOT NULL,"
+            " row_index INTEGER NOT NULL,"
+            " time_str TEXT NOT NULL,"
+            " command TEXT NOT NULL,"
+            " scheduled_at TEXT NOT NULL,"
+            " recorded_at TEXT NOT NULL,"
+            " PRIMARY KEY (run_date, sheet, row_index, time_str))"
+        )
+        self._compacted_on = None
+        self._recent = set()
+        self.compact()
+        self._replay()
+
+    @staticmethod
+    def _key(sheet_name, job, scheduled_at):
+        # 반복 작업은 하루에 여러 번 실행되므로 작업의 시간 문자열이 아니라 실행 시각을 키로 사용
+        return (scheduled_at.date().isoformat(), sheet_name, job.row_index, slot_time_str(scheduled_at))
+
+    def _replay(self):
+        """보관 기간 안의 실행 기록을 메모리로 읽기"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_date, sheet, row_index, time_str FROM runs"
+            ).fetchall()
+        self._recent = set(rows)
+
+    def compact(self, today=None):
+        """보관 기간이 지난 기록 삭제 후 빈 공간을 파일에서 반납 (하루에 한 번만 실제로 실행)"""
+        today = today or datetime.date.today()
+        if self._compacted_on == today:
+            return 0
+        cutoff = (today - datetime.timedelta(days=self.retention_days)).isoformat()
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM runs WHERE run_date < ?", (cutoff,)).rowcount
+            self._recent = {key for key in self._recent if key[0] >= cutoff}
+            if deleted:
+                # DELETE만으로는 파일이 줄지 않으므로 VACUUM (보관 기간 7일치라 작아서 금방 끝남)
+                # VACUUM은 파일 전체를 WAL에 다시 쓰므로 WAL 파일도 비움
+                try:
+                    self._conn.execute("VACUUM")
+                    self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except sqlite3.Error as e:
+                    print(f"\033[90m[DEBUG] 실행 기록 저널 VACUUM 실패 (다음 정리 때 다시 시도): {e}\033[0m")
+        self._compacted_on = today
+        return deleted
+
+    def has_run(self, sheet_name, job, scheduled_at):
+        """해당 슬롯이 이미 실행됐는지 확인 (실행기 스레드의 claim()/compact()와 겹치므로 lock 안에서 확인)"""
+        key = self._key(sheet_name, job, scheduled_at)
+        with self._lock:
+            return key in self._recent
+
+    def claim(self, sheet_name, job, scheduled_at):
+        """실행 기록을 추가 (이미 기록돼 있으면 False 반환 -> 실행하지 않음)"""
+        key = self._key(sheet_name, job, scheduled_at)
+        with self._lock:
+            if key in self._recent:
+                return False
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                key + (job.command, scheduled_at.isoformat(), datetime.datetime.now().isoformat()),
+            ).rowcount
+            self._recent.add(key)
+        self.compact(scheduled_at.date())
+        return inserted == 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def find_missed_runs(table, journal, sheet_name, now, grace_seconds, policy):
+    """유예 시간(grace_seconds) 안에 놓친 실행을 [(실행 일시, 작업), ...]로 반환"""
+    if policy == MISFIRE_SKIP or grace_seconds <= 0:
+        return []
+    missed = []
+    fire_at, jobs = table.next_fire(now - datetime.timedelta(seconds=grace_seconds), inclusive=True)
+    while fire_at is not None and fire_at < now:
+        for job in jobs:
+            if not journal.has_run(sheet_name, job, fire_at):
+                missed.append((fire_at, job))
+        fire_at, jobs = table.next_fire(fire_at, inclusive=False)
+    if policy == MISFIRE_RUN_ONCE:
+        # 같은 작업(행)을 여러 번 놓쳤으면 가장 최근 한 번만 실행
+        latest = {}
+        for fire_at, job in missed:
+            latest[job.row_index] = (fire_at, job)
+        missed = sorted(latest.values(), key=lambda item: (item[0], item[1].row_index))
+    return missed
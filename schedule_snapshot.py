@@ -0,0 +1,95 @@
+import json
+import os
+import time
+
+from schedule_table import ScheduledJob, ScheduleTable, compile_job, format_time_of_day
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedule_snapshot.json")
+SNAPSHOT_VERSION = 2
+
+
+def table_to_records(table):
+    """컴파일된 테이블을 [행번호, A열 원본, 하루 기준 초, 작업이름, 명령어, F열 원본] 리스트로 변환
+
+    반복 작업과 선행 작업이 있는 작업은 하루 기준 초가 None
+    """
+    return [[job.row_index, job.time_raw, job.second_of_day, job.job_name, job.command, job.after_raw]
+            for job in table.jobs]
+
+
+def table_from_records(records):
+    """table_to_records() 결과를 다시 ScheduleTable로 변환 (매일 한 번 작업은 시간 문자열 재파싱 없음)"""
+    jobs = []
+    for row_index, time_raw, second_of_day, job_name, command, after_raw in records:
+        if second_of_day is None:
+            # 반복 규칙/선행 작업은 A열, F열 원본에서 다시 컴파일 (선행 작업 연결은 ScheduleTable이 다시 함)
+            job = compile_job(row_index, time_raw, job_name, command, after_raw)
+            if job is not None:
+                jobs.append(job)
+            continue
+        jobs.append(ScheduledJob(row_index, time_raw, format_time_of_day(second_of_day), second_of_day, job_name, command))
+    return ScheduleTable(jobs)
+
+
+class ScheduleSnapshot:
+    """마지막으로 시트 조회에 성공한 시점의 컴파일된 스케줄 (last-known-good)
+
+    - 조회에 성공할 때마다 저장하고, 시작할 때 API 호출 전에 읽어서 바로 예약을 걸어둠
+    - API를 쓸 수 없는 동안에도 이 스케줄로 계속 실행하며, verified_at으로 얼마나 오래됐는지 추적
+    - sheet_key(요청한 시트 ID 목록 또는 전체 모드)가 다르면 다른 스케줄로 보고 사용하지 않음
+    """
+
+    def __init__(self, spreadsheet_id, sheet_key, sheets, verified_at=None):
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_key = sheet_key
+        self.sheets = sheets  # {시트이름: (행 지문, ScheduleTable)} - 시트 순서 유지
+        self.verified_at = time.time() if verified_at is None else verified_at  # 마지막 조회 성공 시각
+
+    def age(self):
+        """마지막 조회 성공 이후 지난 시간 (초)"""
+        return max(0.0, time.time() - self.verified_at)
+
+    def save(self, path=SNAPSHOT_PATH):
+        """파일로 저장 (임시 파일에 쓴 뒤 교체, 실패해도 실행에는 영향 없음)"""
+        payload = {
+            'version': SNAPSHOT_VERSION,
+            'spreadsheet_id': self.spreadsheet_id,
+            'sheet_key': self.sheet_key,
+            'verified_at': self.verified_at,
+            'sheets': [
+                [name, fingerprint, table_to_records(table)]
+                for name, (fingerprint, table) in self.sheets.items()
+            ],
+        }
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"\033[90m[DEBUG] 스케줄 스냅샷 저장 실패: {e}\033[0m")
+            return False
+
+    @classmethod
+    def load(cls, spreadsheet_id, sheet_key, path=SNAPSHOT_PATH):
+        """저장된 스냅샷 읽기 (없거나, 손상됐거나, 다른 스프레드시트/시트 목록이면 None)
+
+        spreadsheet_id와 sheet_key가 모두 None이면 어느 시트 구성의 스냅샷이든 읽음 (시뮬레이션용)
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get('version') != SNAPSHOT_VERSION:
+                return None
+            if spreadsheet_id is None and sheet_key is None:
+                spreadsheet_id, sheet_key = payload.get('spreadsheet_id'), payload.get('sheet_key')
+            if payload.get('spreadsheet_id') != spreadsheet_id or payload.get('sheet_key') != sheet_key:
+                return None
+            sheets = {
+                name: (fingerprint, table_from_records(records))
+                for name, fingerprint, records in payload['sheets']
+            }
+            return cls(spreadsheet_id, sheet_key, sheets, payload['verified_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,285 @@
+import bisect
+import datetime
+
+from recurrence import parse_recurrence
+
+# 시트 열 인덱스 (0부터 시작)
+TIME_COLUMN_INDEX = 0     # A열 - 시간
+NAME_COLUMN_INDEX = 1     # B열 - 작업이름
+COMMAND_COLUMN_INDEX = 4  # E열 - 명령어
+AFTER_COLUMN_INDEX = 5    # F열 - 선행 작업 (행 번호 또는 작업이름, 쉼표로 여러 개)
+
+
+def parse_time_of_day(time_str):
+    """시간 문자열을 하루 기준 초(0~86399)로 변환 (형식이 잘못되면 None)
+
+    "9:5", "09:05", "09:05:00", "09:05:30" 등을 허용
+    """
+    if not time_str:
+        return None
+
+    time_str = time_str.strip()
+
+    # 빈 문자열 처리
+    if not time_str:
+        return None
+
+    try:
+        # 시, 분, (초) 분리
+        parts = time_str.split(':')
+        if len(parts) < 2 or len(parts) > 3:
+            return None
+
+        hour = int(parts[0])
+        minute = int(parts[1])
+        second = int(parts[2]) if len(parts) == 3 else 0
+
+        # 범위 검증
+        if hour < 0 or hour >= 24 or minute < 0 or minute >= 60 or second < 0 or second >= 60:
+            return None
+
+        return hour * 3600 + minute * 60 + second
+    except (ValueError, IndexError):
+        return None
+
+
+def format_time_of_day(second_of_day):
+    """하루 기준 초를 HH:MM (초가 있으면 HH:MM:SS) 문자열로 변환"""
+    hour, rest = divmod(second_of_day, 3600)
+    minute, second = divmod(rest, 60)
+    if second:
+        return f"{hour:02d}:{minute:02d}:{second:02d}"
+    return f"{hour:02d}:{minute:02d}"
+
+
+def normalize_time(time_str):
+    """시간 문자열을 HH:MM (초가 있으면 HH:MM:SS) 형식으로 정규화"""
+    second_of_day = parse_time_of_day(time_str)
+    if second_of_day is None:
+        return ""
+    return format_time_of_day(second_of_day)
+
+
+def slot_time_str(moment):
+    """실행 일시의 시각 부분을 HH:MM (초가 있으면 HH:MM:SS)로 (실행 저널/리스의 슬롯 키용)
+
+    한 번 실행 작업은 job.time_str과 같고, 반복 작업은 실행마다 다른 값이 됨
+    """
+    return format_time_of_day(moment.hour * 3600 + moment.minute * 60 + moment.second)
+
+
+def _cell(row, index):
+    """행에서 셀 값을 공백 제거해서 가져오기 (없으면 빈 문자열)"""
+    return row[index].strip() if len(row) > index else ""
+
+
+class ScheduledJob:
+    """시트 한 행에서 컴파일된 예약 작업"""
+    __slots__ = ("row_index", "time_raw", "time_str", "second_of_day", "job_name", "command", "recurrence",
+                 "after_raw", "after")
+
+    def __init__(self, row_index, time_raw, time_str, second_of_day, job_name, command, recurrence=None, after_raw=""):
+        self.row_index = row_index          # 시트 행 번호 (1부터 시작, 헤더가 1행)
+        self.time_raw = time_raw            # A열 원본 값
+        self.time_str = time_str            # 정규화된 HH:MM 또는 HH:MM:SS (반복 작업은 정규화된 규칙)
+        self.second_of_day = second_of_day  # 0~86399 (반복 작업은 None)
+        self.job_name = job_name
+        self.command = command
+        self.recurrence = recurrence        # 반복 규칙 (Recurrence, 매일 한 번 실행이면 None)
+        self.after_raw = after_raw          # F열 원본 값 (있으면 시간 대신 선행 작업이 성공한 뒤 실행)
+        self.after = ()                     # 선행 작업 행 번호들 (ScheduleTable이 연결, 연결 실패 시 빈 튜플)
+
+    def as_tuple(self):
+        """(작업이름, 시간, 명령어) 튜플로 변환 (출력용)"""
+        return (self.job_name, self.time_str, self.command)
+
+
+class ScheduleTable:
+    """실행 시각(하루 기준 초)으로 색인된 예약 작업 테이블
+
+    - by_second: 하루 기준 초 -> 해당 시각에 실행할 작업 리스트 (O(1) 조회)
+    - seconds: 예약이 있는 시각의 정렬된 리스트 (bisect로 O(log n) 다음 예약 조회)
+    - rules: 반복 규칙 작업 (행 하나가 여러 번 실행되므로 색인에 펼치지 않고 규칙마다 다음 실행 일시 계산)
+    - dependents: 선행 작업 행 번호 -> 그 작업이 끝나면 확인할 후속 작업 리스트 (F열, 시간 색인에는 넣지 않음)
+    """
+    __slots__ = ("jobs", "by_second", "seconds", "rules", "dependents", "dependency_errors")
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.by_second = {}
+        self.rules = []
+        self.dependents, self.dependency_errors = link_dependencies(jobs)
+        for job in jobs:
+            if job.after_raw:
+                continue
+            if job.recurrence is not None:
+                self.rules.append(job)
+            else:
+                self.by_second.setdefault(job.second_of_day, []).append(job)
+        self.seconds = sorted(self.by_second)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def jobs_at(self, second_of_day):
+        """지정한 시각에 실행할 매일 한 번 작업 리스트 (반복 작업은 jobs_due()로 조회)"""
+        return self.by_second.get(second_of_day, [])
+
+    def jobs_due(self, fire_at):
+        """지정한 일시에 실행할 작업 리스트 (반복 규칙 작업 포함, 행 순서)"""
+        jobs = self.jobs_at(fire_at.hour * 3600 + fire_at.minute * 60 + fire_at.second)
+        if not self.rules:
+            return jobs
+        due = [job for job in self.rules if job.recurrence.matches(fire_at)]
+        if not due:
+            return jobs
+        return sorted(jobs + due, key=lambda job: job.row_index)
+
+    def next_after(self, second_of_day, inclusive=False):
+        """지정한 시각 이후 가장 빠른 예약 (시각, 작업 리스트) 반환
+
+        inclusive=True면 같은 시각도 포함. 오늘 남은 예약이 없으면 다음날 가장 빠른
+        예약으로 넘어가며(반환 시각 < 기준 시각), 예약이 없으면 (None, [])
+        """
+        if not self.seconds:
+            return None, []
+        if inclusive:
+            pos = bisect.bisect_left(self.seconds, second_of_day)
+        else:
+            pos = bisect.bisect_right(self.seconds, second_of_day)
+        if pos == len(self.seconds):
+            pos = 0  # 자정을 넘어 다음날 첫 예약
+        next_second = self.seconds[pos]
+        return next_second, self.by_second[next_second]
+
+    def next_fire(self, after_datetime, inclusive=False):
+        """지정한 일시 이후 가장 빠른 실행 일시와 작업 리스트 반환 (예약이 없으면 (None, []))"""
+        base = after_datetime.replace(microsecond=0)
+        query = base.hour * 3600 + base.minute * 60 + base.second
+        next_second, jobs = self.next_after(query, inclusive=inclusive)
+        fire_at = None
+        if next_second is not None:
+            midnight = base.replace(hour=0, minute=0, second=0)
+            fire_at = midnight + datetime.timedelta(seconds=next_second)
+            if fire_at < base or (fire_at == base and not inclusive):
+                fire_at += datetime.timedelta(days=1)
+        if not self.rules:
+            return (fire_at, jobs) if fire_at is not None else (None, [])
+        # 반복 작업은 규칙마다 다음 실행 일시를 계산해서 가장 빠른 것과 비교
+        for job in self.rules:
+            candidate = job.recurrence.next_fire(base, inclusive=inclusive)
+            if candidate is not None and (fire_at is None or candidate < fire_at):
+                fire_at = candidate
+        if fire_at is None:
+            return None, []
+        return fire_at, self.jobs_due(fire_at)
+
+
+def _parse_after(after_raw):
+    """F열 값을 선행 작업 참조 리스트로 분리 ("3", "3행", "데이터 수집" -> 행 번호(int) 또는 작업이름(str))"""
+    refs = []
+    for token in after_raw.split(','):
+        token = token.strip()
+        if not token:
+            continue
+        number = token[:-1].strip() if token.endswith('행') else token
+        refs.append(int(number) if number.isdigit() else token)
+    return refs
+
+
+def link_dependencies(jobs):
+    """F열 선행 작업을 행 번호로 연결해서 (선행 행 -> 후속 작업 리스트, [(행, 오류 이유), ...]) 반환
+
+    없는 행/작업이름, 이름이 여러 행에 있는 경우, 순환 참조, 실행될 수 없는 선행 작업에 걸린 후속 작업은
+    연결하지 않음 (job.after가 빈 튜플로 남아 실행되지 않음)
+    """
+    chained = [job for job in jobs if job.after_raw]
+    if not chained:
+        return {}, []
+    by_row = {job.row_index: job for job in jobs}
+    rows_by_name = {}
+    for job in jobs:
+        if job.job_name:
+            rows_by_name.setdefault(job.job_name, []).append(job.row_index)
+
+    errors = []
+    parents = {}
+    for job in chained:
+        job.after = ()
+        rows = []
+        for ref in _parse_after(job.after_raw):
+            if isinstance(ref, str):
+                matches = rows_by_name.get(ref, [])
+                if len(matches) != 1:
+                    errors.append((job.row_index, f"작업이름 '{ref}'" + ("이(가) 여러 행에 있음" if matches else "을(를) 찾을 수 없음")))
+                    break
+                ref = matches[0]
+            if ref == job.row_index:
+                errors.append((job.row_index, "자기 자신을 선행 작업으로 지정함"))
+                break
+            if ref not in by_row:
+                errors.append((job.row_index, f"선행 작업 {ref}행을 찾을 수 없음"))
+                break
+            if ref not in rows:
+                rows.append(ref)
+        else:
+            if rows:
+                parents[job.row_index] = rows
+            else:
+                errors.append((job.row_index, "선행 작업이 비어 있음"))
+
+    # 시간으로 실행되는 작업에서 출발해 닿을 수 있는 후속 작업만 연결 (순환 참조는 끝까지 남음)
+    runnable = {job.row_index for job in jobs if not job.after_raw}
+    pending = dict(parents)
+    progressed = True
+    while pending and progressed:
+        progressed = False
+        for row, rows in list(pending.items()):
+            if all(parent in runnable for parent in rows):
+                runnable.add(row)
+                del pending[row]
+                progressed = True
+    for row in pending:
+        errors.append((row, "순환 참조 또는 실행되지 않는 선행 작업"))
+
+    dependents = {}
+    for job in chained:
+        if job.row_index in parents and job.row_index not in pending:
+            job.after = tuple(parents[job.row_index])
+            for parent in job.after:
+                dependents.setdefault(parent, []).append(job)
+    errors.sort()
+    return dependents, errors
+
+
+def compile_job(row_index, time_raw, job_name, command, after_raw=""):
+    """A열 값 하나를 ScheduledJob으로 컴파일 (매일 한 번 시각 또는 반복 규칙, 형식이 잘못되면 None)
+
+    after_raw(F열)가 있으면 A열과 관계없이 선행 작업이 성공한 뒤에만 실행하는 작업으로 컴파일
+    """
+    if after_raw:
+        return ScheduledJob(row_index, time_raw, f"{after_raw} 후", None, job_name, command, after_raw=after_raw)
+    second_of_day = parse_time_of_day(time_raw)
+    if second_of_day is not None:
+        return ScheduledJob(row_index, time_raw, format_time_of_day(second_of_day), second_of_day, job_name, command)
+    recurrence = parse_recurrence(time_raw)
+    if recurrence is None:
+        return None
+    return ScheduledJob(row_index, time_raw, recurrence.text, None, job_name, command, recurrence)
+
+
+def compile_schedule(rows):
+    """시트 행(헤더 포함)을 한 번만 파싱해서 ScheduleTable로 컴파일"""
+    jobs = []
+    # 첫 행은 헤더이므로 건너뛰기
+    for row_idx, row in enumerate(rows[1:], start=2):
+        time_raw = _cell(row, TIME_COLUMN_INDEX)
+        command = _cell(row, COMMAND_COLUMN_INDEX)
+        after_raw = _cell(row, AFTER_COLUMN_INDEX)
+        # 명령어와 시간(또는 선행 작업)이 모두 있는 경우에만 등록
+        if not command or not (time_raw or after_raw):
+            continue
+        job = compile_job(row_idx, time_raw, _cell(row, NAME_COLUMN_INDEX), command, after_raw)
+        if job is not None:
+            jobs.append(job)
+    return ScheduleTable(jobs)
@@ -1,45 +1,98 @@
+import time
+STARTUP_BEGIN = time.perf_counter()  # 시작 시간 분석 기준 (모듈 import 시간 포함)
+
 import sys
 import os
-import time
+import argparse
 import datetime
-import subprocess
-from googleapiclient.discovery import build
+import functools
+import json
+import threading
+
+from cluster import ClusterCoordinator, open_lease_store, run_key
+from control import ControlServer, send_control
+from file_source import SNAPSHOT_SUFFIX, FileSheetsService, FileWatcher, ScheduleFileError
+from job_chain import ChainTracker
+from job_launcher import JobLauncher
+from job_output import OUTPUT_DIR
+from job_supervisor import JobSupervisor
+from log_writer import LOG_PATH, LogWriter, is_headless
+from metrics import METRICS_FILE_INTERVAL, PhaseTimer, SchedulerMetrics
+from profiling import PROFILE_TICKS, TRACEMALLOC_INTERVAL, Profiler, install_signal_handlers
+from run_journal import MISFIRE_POLICIES, MISFIRE_SKIP, RunJournal, find_missed_runs
+from schedule_snapshot import SNAPSHOT_PATH, ScheduleSnapshot
+from schedule_table import compile_schedule, slot_time_str
+from sheet_backend import FakeSheetsService, build_sheets_service
+from sheet_metadata import METADATA_CACHE_PATH, SheetMetadataCache
+from sheets_client import DEFAULT_REQUESTS_PER_MINUTE, SheetsClient
+from sheet_poller import BackgroundFetcher, SheetPoller, fetch_schedule_rows, fingerprint_rows
+from simulator import DEFAULT_DURATION, durations_from_log, simulate
+from status_writer import StatusLogWriter
+from timer_queue import TimerQueue
+from worker_pool import PythonWorkerPool
 
 # 기본 설정
-CHECK_INTERVAL = 300  # 30분 (초 단위) - 5분 단위로 체크하려면 300으로 변경
-
-# ID 설정 (ID.txt에서 읽기)
-id_file_path = os.path.join(os.path.dirname(__file__), "ID.txt")
-try:
-    with open(id_file_path, "r", encoding="utf-8") as f:
-        ID = f.readline().strip()  # 첫 줄만 읽기
-    if not ID:
-        print(f"❌ 오류: ID.txt 파일이 비어있습니다.")
+CHECK_INTERVAL = 300  # 시트 재조회 최대 주기 (초 단위) - 예약 실행 시각과는 무관
+MIN_CHECK_INTERVAL = 30  # 시트가 수정된 직후의 재조회 주기 (초 단위)
+COUNTDOWN_REFRESH = 60  # 대기 중 남은 시간 표시 갱신 주기 (초)
+LOG_FLUSH_INTERVAL = 2.0  # H열 로그를 모아서 기록하는 주기 (초)
+LOG_QUEUE_SIZE = 1000  # 기록 대기 중인 H열 로그 최대 개수
+LAUNCH_WORKERS = 32  # 같은 시각 작업을 동시에 실행하는 스레드 수 (시트가 여러 개면 나눠 가짐)
+MIN_LAUNCH_WORKERS_PER_TENANT = 4  # 시트 하나에 배정하는 최소 실행 스레드 수
+EXCLUDED_SHEETS = ['매뉴얼', '로그']  # --all 모드에서 스케줄링하지 않는 시트
+MISFIRE_GRACE = 600  # 시작 시 놓친 실행을 처리할 유예 시간 (초)
+MAX_CONCURRENT_JOBS = 0  # 동시에 실행할 최대 작업 수 (넘으면 대기열에서 기다림, 0이면 제한 없음)
+JOB_TIMEOUT = 0  # 작업 최대 실행 시간 (초, 0이면 제한 없음)
+STARTUP_PROBE_DELAY = 0.5  # 실행 후 프로세스가 바로 종료됐는지 확인하기까지 대기 (초)
+PYTHON_POOL_SIZE = 0  # 'python x.py' 작업용으로 미리 띄워 둘 파이썬 워커 수 (0이면 사용 안 함)
+WORKER_MAX_RUNS = 50  # 파이썬 워커 하나가 이만큼 실행하면 새 워커로 교체
+METRICS_PORT = 0  # 지표(/metrics)를 제공할 로컬 HTTP 포트 (0이면 사용 안 함)
+API_REQUESTS_PER_MINUTE = DEFAULT_REQUESTS_PER_MINUTE  # 이 프로세스의 분당 API 요청 한도 (스케줄러 여러 개면 나눠서 설정)
+API_MAX_RETRIES = 5  # 429/5xx 오류 시 최대 재시도 횟수
+SNAPSHOT_STALE_WARNING = 3600  # 시트를 이 시간(초) 넘게 읽지 못하면 스냅샷이 오래됐다고 경고
+OUTPUT_SUMMARY_CHARS = 200  # 출력 캡처 시 H열 종료 로그에 덧붙일 마지막 출력 최대 길이
+OUTPUT_DRAIN_WAIT = 0.5  # 작업 종료 후 남은 출력을 마저 읽을 때까지 기다리는 최대 시간 (초)
+CONTROL_PORT = 0  # 상태 조회/즉시 재조회/수동 실행/일시 정지용 로컬 HTTP 포트 (0이면 사용 안 함)
+CONTROL_UPCOMING = 10  # 상태 조회 시 시트마다 보여줄 실행 예정 건수
+CONTROL_RECENT = 20  # 상태 조회 시 보여줄 최근 종료 작업 수
+
+def load_get_credentials():
+    """auth경로.txt에 적힌 경로에서 auth.get_credentials 불러오기 (실제 API를 쓸 때만 import)"""
+    # auth.py 경로 추가 (auth경로.txt에서 읽기)
+    auth_path_file = os.path.join(os.path.dirname(__file__), "auth경로.txt")
+    try:
+        with open(auth_path_file, "r", encoding="utf-8") as f:
+            auth_path = f.read().strip().strip('"').strip("'")
+        # 파일 경로인 경우 디렉토리 경로로 변환
+        if os.path.isfile(auth_path):
+            auth_path = os.path.dirname(auth_path)
+        sys.path.insert(0, auth_path)
+    except FileNotFoundError:
+        print(f"❌ 오류: auth경로.txt 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ 오류: auth경로.txt 파일을 읽는 중 오류 발생: {e}")
+        sys.exit(1)
+    
+    from auth import get_credentials
+    return get_credentials
+
+def read_id_file():
+    """ID.txt 첫 줄에서 이 PC가 담당할 시트 이름(ID) 읽기"""
+    id_file_path = os.path.join(os.path.dirname(__file__), "ID.txt")
+    try:
+        with open(id_file_path, "r", encoding="utf-8") as f:
+            sheet_id = f.readline().strip()  # 첫 줄만 읽기
+        if not sheet_id:
+            print(f"❌ 오류: ID.txt 파일이 비어있습니다.")
+            sys.exit(1)
+        return sheet_id
+    except FileNotFoundError:
+        print(f"❌ 오류: ID.txt 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ 오류: ID.txt 파일을 읽는 중 오류 발생: {e}")
         sys.exit(1)
-except FileNotFoundError:
-    print(f"❌ 오류: ID.txt 파일을 찾을 수 없습니다.")
-    sys.exit(1)
-except Exception as e:
-    print(f"❌ 오류: ID.txt 파일을 읽는 중 오류 발생: {e}")
-    sys.exit(1)
-
-# auth.py 경로 추가 (auth경로.txt에서 읽기)
-auth_path_file = os.path.join(os.path.dirname(__file__), "auth경로.txt")
-try:
-    with open(auth_path_file, "r", encoding="utf-8") as f:
-        auth_path = f.read().strip().strip('"').strip("'")
-    # 파일 경로인 경우 디렉토리 경로로 변환
-    if os.path.isfile(auth_path):
-        auth_path = os.path.dirname(auth_path)
-    sys.path.insert(0, auth_path)
-except FileNotFoundError:
-    print(f"❌ 오류: auth경로.txt 파일을 찾을 수 없습니다.")
-    sys.exit(1)
-except Exception as e:
-    print(f"❌ 오류: auth경로.txt 파일을 읽는 중 오류 발생: {e}")
-    sys.exit(1)
-
-from auth import get_credentials
 
 def extract_spreadsheet_info(url):
     """구글 시트 URL에서 스프레드시트 ID와 시트 ID(gid) 추출"""
@@ -53,391 +106,985 @@ def extract_spreadsheet_info(url):
     
     return spreadsheet_id, gid
 
-def get_sheet_name_by_gid(service, spreadsheet_id, gid):
+def get_sheet_name_by_gid(metadata, gid):
     """시트 ID(gid)로 시트 이름 찾기"""
     try:
-        spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        sheets = spreadsheet.get('sheets', [])
-        
-        for sheet in sheets:
-            if str(sheet['properties']['sheetId']) == str(gid):
-                return sheet['properties']['title']
+        title = metadata.title_for_gid(gid)
+        if title:
+            return title
         
         # gid를 찾지 못하면 첫 번째 시트 반환
-        if sheets:
-            return sheets[0]['properties']['title']
+        titles = metadata.titles()
+        if titles:
+            return titles[0]
         return None
     except Exception as e:
         print(f"시트 정보를 가져오는 중 오류 발생: {e}")
         return None
 
-def get_sheet_by_id(service, spreadsheet_id, target_id):
+def get_sheet_by_id(metadata, target_id):
     """스프레드시트에서 ID와 일치하는 시트 찾기"""
     try:
-        spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-        sheets = spreadsheet.get('sheets', [])
-        
-        for sheet in sheets:
-            sheet_name = sheet['properties']['title']
-            if sheet_name == target_id:
-                return sheet_name
+        if metadata.has_title(target_id):
+            return target_id
         
         return None
     except Exception as e:
         print(f"시트 정보를 가져오는 중 오류 발생: {e}")
         return None
 
-def get_sheet_data(service, spreadsheet_id, sheet_name):
-    """시트의 모든 데이터 가져오기"""
+def get_tenant_sheets(metadata):
+    """'매뉴얼', '로그' 등 제외 시트를 뺀 모든 시트(ID) 이름 가져오기"""
     try:
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!A:H"  # A열부터 H열까지 (로그 포함)
-        ).execute()
-        
-        return result.get('values', [])
+        return [title for title in metadata.titles() if title not in EXCLUDED_SHEETS]
     except Exception as e:
-        print(f"시트 데이터를 읽는 중 오류 발생: {e}")
+        print(f"시트 정보를 가져오는 중 오류 발생: {e}")
         return []
 
-def write_log_to_column_h(service, spreadsheet_id, sheet_name, row_index, log_message):
-    """시트의 특정 행의 H열에 로그 기록"""
+def get_sheet_data(service, spreadsheet_id, sheet_names):
+    """여러 시트의 스케줄 열(A, B, E, F)을 batchGet 한 번으로 가져와서 {시트이름: 행 리스트}로 반환"""
     try:
-        # H열에 값 쓰기 (행 인덱스는 1부터 시작하므로 그대로 사용)
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range=f"{sheet_name}!H{row_index}",
-            valueInputOption='USER_ENTERED',
-            body={
-                'values': [[log_message]]
-            }
-        ).execute()
-        return True
+        return fetch_schedule_rows(service, spreadsheet_id, sheet_names)
     except Exception as e:
-        print(f"\033[90m[DEBUG] H열 로그 기록 실패 (행 {row_index}): {e}\033[0m")
-        return False
+        print(f"시트 데이터를 읽는 중 오류 발생: {e}")
+        return {}
 
-def normalize_time(time_str):
-    """시간 문자열을 HH:MM 형식으로 정규화"""
-    if not time_str:
-        return ""
-    
-    time_str = time_str.strip()
-    
-    # 빈 문자열 처리
-    if not time_str:
-        return ""
+class TenantState:
+    """시트(ID) 하나의 스케줄 상태 - 멀티 테넌트 모드에서는 시트마다 하나씩 생성"""
     
-    # 다양한 시간 형식 처리 (예: "9:5", "09:05", "9:05", "09:5", "09:05:00" 등)
-    try:
-        # 시간과 분 분리
-        parts = time_str.split(':')
-        if len(parts) < 2:
-            return ""
-        
-        hour = int(parts[0])
-        minute = int(parts[1])
-        
-        # 범위 검증
-        if hour < 0 or hour >= 24 or minute < 0 or minute >= 60:
-            return ""
-        
-        # HH:MM 형식으로 반환
-        return f"{hour:02d}:{minute:02d}"
-    except (ValueError, IndexError):
-        return ""
+    def __init__(self, sheet_name, launcher):
+        self.sheet_name = sheet_name
+        self.launcher = launcher          # 이 시트 전용 실행기 (다른 시트 작업과 스레드를 나눠 씀)
+        self.table = compile_schedule([])
+        self.fingerprint = None           # 마지막으로 컴파일한 행 내용의 지문
+        self.fire_generation = 0          # 재컴파일 시 증가시켜 이전 "fire" 타이머를 무효화
+        self.last_fired_at = None         # 마지막으로 실행한 예약 일시 (같은 슬롯 재실행 방지)
 
-def get_next_check_time(interval_minutes=5):
-    """다음 체크 시간(5분 단위 정시)을 계산하고 반환"""
-    now = datetime.datetime.now()
+class JitterStats:
+    """실행 지연(예약 시각 대비 실제 시작 시각) 통계"""
     
-    # 현재 분을 interval_minutes 단위로 반올림
-    current_minute = now.minute
-    next_minute = ((current_minute // interval_minutes) + 1) * interval_minutes
-    
-    # 다음 체크 시간 생성
-    if next_minute >= 60:
-        # 다음 시간으로 넘어가는 경우
-        next_check = now.replace(hour=(now.hour + 1) % 24, minute=0, second=0, microsecond=0)
-        if next_check.hour == 0 and now.hour == 23:
-            # 자정을 넘어가는 경우
-            next_check = next_check + datetime.timedelta(days=1)
-    else:
-        next_check = now.replace(minute=next_minute, second=0, microsecond=0)
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()  # 실행기 스레드 여러 개에서 동시에 기록됨
     
-    return next_check
-
-def get_seconds_until_next_check(interval_minutes=5):
-    """다음 체크 시간(5분 단위 정시)까지 남은 초를 계산"""
-    next_check = get_next_check_time(interval_minutes)
-    now = datetime.datetime.now()
-    
-    # 남은 초 계산
-    delta = next_check - now
-    seconds_until_next = delta.total_seconds()
+    def record(self, seconds):
+        """지연 시간(초) 기록"""
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
     
-    return max(1, int(seconds_until_next))  # 최소 1초
+    def summary(self):
+        """평균/최대 지연 요약 문자열"""
+        if not self.count:
+            return "기록 없음"
+        return f"평균 {self.total / self.count * 1000:.1f}ms, 최대 {self.max * 1000:.1f}ms ({self.count}건)"
 
-def get_next_scheduled_command(rows, next_check_time):
-    """다음 체크 시간에 실행될 명령어 찾기"""
-    next_time_str = next_check_time.strftime("%H:%M")
-    scheduled_jobs = []  # (작업이름, 시간, 명령어) 튜플 리스트
-    
-    for row in rows[1:]:  # 헤더 건너뛰기
-        schedule_time_raw = row[0].strip() if len(row) > 0 else ""
-        schedule_time = normalize_time(schedule_time_raw)
-        job_name = row[1].strip() if len(row) > 1 else ""  # B열 - 작업이름
-        command = row[4].strip() if len(row) > 4 else ""  # E열 - 명령어
-        
-        if schedule_time == next_time_str and command:
-            # 디버깅: 매칭된 경우만 출력
-            print(f"\033[90m[DEBUG] 매칭: 시트 시간 '{schedule_time_raw}' -> 정규화 '{schedule_time}' = 다음 체크 '{next_time_str}'\033[0m")
-            scheduled_jobs.append((job_name, schedule_time, command))
-    
-    return scheduled_jobs
-
-def get_earliest_future_command(rows, after_time):
-    """지정된 시간 이후 가장 빠른 예약된 명령어 찾기"""
-    after_time_str = after_time.strftime("%H:%M")
-    earliest_datetime = None
-    earliest_time_str = None
-    earliest_jobs = []  # (작업이름, 시간, 명령어) 튜플 리스트
-    
-    # 현재 날짜 기준으로 비교
-    today = datetime.datetime.now().date()
-    after_datetime = datetime.datetime.combine(today, after_time.time())
-    
-    # 모든 예약된 명령어 탐색
-    for row in rows[1:]:  # 헤더 건너뛰기
-        schedule_time_raw = row[0].strip() if len(row) > 0 else ""
-        schedule_time = normalize_time(schedule_time_raw)
-        job_name = row[1].strip() if len(row) > 1 else ""  # B열 - 작업이름
-        command = row[4].strip() if len(row) > 4 else ""  # E열 - 명령어
-        
-        if schedule_time and command:
-            # 시간 파싱
-            try:
-                hour, minute = map(int, schedule_time.split(':'))
-                schedule_datetime = datetime.datetime.combine(today, datetime.time(hour, minute))
-                
-                # schedule_datetime이 after_datetime보다 작거나 같으면 다음날로 처리
-                # (미래의 예약만 찾기 때문)
-                if schedule_datetime <= after_datetime:
-                    schedule_datetime += datetime.timedelta(days=1)
-                
-                # 지정된 시간 이후인지 확인
-                if schedule_datetime > after_datetime:
-                    # 가장 빠른 시간 찾기
-                    if earliest_datetime is None or schedule_datetime < earliest_datetime:
-                        earliest_datetime = schedule_datetime
-                        earliest_time_str = schedule_time
-                        earliest_jobs = [(job_name, schedule_time, command)]
-                    elif schedule_datetime == earliest_datetime:
-                        # 같은 시간에 여러 명령어가 있는 경우
-                        earliest_jobs.append((job_name, schedule_time, command))
-            except (ValueError, TypeError):
-                continue
-    
-    return earliest_time_str, earliest_jobs
-
-def countdown_sleep(seconds, next_check_time, scheduled_commands, earliest_next_time=None, earliest_next_commands=None):
-    """실시간 카운트다운과 함께 대기"""
-    # 실행 예정 명령어 출력
-    if scheduled_commands:
-        print(f"\n☑️  다음 실행 예정 명령어 :")
-        for job_idx, (job_name, schedule_time, command) in enumerate(scheduled_commands, 1):
+def print_upcoming(fire_at, jobs, sheet_label=""):
+    """다음 실행 예정 명령어 출력"""
+    if fire_at and jobs:
+        print(f"\n☑️  {sheet_label}다음 실행 예정 명령어 [{fire_at.strftime('%Y-%m-%d %H:%M:%S')}]:")
+        for job_idx, job in enumerate(jobs, 1):
             if job_idx > 1:
                 print()  # 작업이 여러 개일 경우 구분
-            print(f"\n   1. {job_name if job_name else '(작업이름 없음)'}")
-            print(f"   2. {schedule_time}")
-            print(f"   3. {command}")
+            print(f"\n   1. {job.job_name if job.job_name else '(작업이름 없음)'}")
+            print(f"   2. {job.time_str}")
+            print(f"   3. {job.command}")
     else:
-        print(f"\n☑️  [{next_check_time.strftime('%H:%M')}]에 예약된 명령어가 없습니다.")
-        # 가장 빠른 다음 예약 명령어 표시
-        if earliest_next_time and earliest_next_commands:
-            print(f"\n☑️  가장 빠른 다음 예약:")
-            for job_idx, (job_name, schedule_time, command) in enumerate(earliest_next_commands, 1):
-                if job_idx > 1:
-                    print()  # 작업이 여러 개일 경우 구분
-                print(f"\n   1. {job_name if job_name else '(작업이름 없음)'}")
-                print(f"   2. {schedule_time}")
-                print(f"   3. {command}")
+        print(f"\n☑️  {sheet_label}예약된 명령어가 없습니다.")
     
     print()  # 빈 줄 추가
     print("-" * 50)  # 구분선 추가
-    
-    # 카운트다운
-    for remaining in range(seconds, 0, -1):
-        minutes = remaining // 60
-        secs = remaining % 60
-        sys.stdout.write(f"\r👉 다음 체크까지: {minutes:02d}:{secs:02d} 남음...   ")
+
+def countdown_sleep(deadline, label, headless=False, wakeup=None):
+    """모노토닉 마감 시각까지 대기 (남은 시간 표시는 COUNTDOWN_REFRESH초마다 갱신)
+
+    headless=True면 남은 시간 표시 없이 대기만 함 (출력이 파일로 리디렉션된 경우 로그가 불어나지 않도록)
+    wakeup: 설정되면 마감 전이라도 대기를 멈추는 threading.Event (제어 명령용) - 그래서 멈췄으면 True 반환
+    """
+    if headless:
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            if wakeup is not None:
+                return wakeup.wait(remaining)
+            time.sleep(remaining)
+        return False
+    woken = False
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        minutes, secs = divmod(int(remaining + 0.999), 60)
+        sys.stdout.write(f"\r👉 {label}까지: {minutes:02d}:{secs:02d} 남음...   ")
         sys.stdout.flush()
-        time.sleep(1)
+        # 매초 깨어나지 않고 마감 시각 또는 다음 표시 갱신 시각까지 한 번에 대기
+        if wakeup is not None:
+            if wakeup.wait(min(remaining, COUNTDOWN_REFRESH)):
+                woken = True
+                break
+        else:
+            time.sleep(min(remaining, COUNTDOWN_REFRESH))
     
     # 줄바꿈으로 깨끗하게 정리
-    print("\r" + " " * 60)  # 이전 출력 지우기
-    current_time_str = datetime.datetime.now().strftime('%H:%M:%S')
-    print(f"🔄 [{current_time_str}] 시트 확인 중...\n")
+    sys.stdout.write("\r" + " " * 60 + "\r")
+    sys.stdout.flush()
+    return woken
+
+def report_launch_result(status_writer, sheet_name, jitter_stats, metrics, event_log, result, on_finished=None):
+    """실행 결과를 출력하고 H열 로그 기록 요청 (실행기 스레드에서 호출됨)
+
+    on_finished: 프로세스를 시작하지 못했을 때 on_finished(작업, False)로 알림 (후속 작업 건너뛰기용)
+    """
+    if result.skipped is not None:
+        metrics.jobs_skipped.inc(sheet=sheet_name)
+        exec_datetime_end = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{exec_datetime_end}] ⏭️ 실행 건너뜀 ({result.skipped}): {result.job.command}")
+    elif result.error is not None:
+        metrics.jobs_failed.inc(sheet=sheet_name, reason="launch_error")
+        exec_datetime_end = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{exec_datetime_end}] ⚠️ 실행 오류 ({result.job.command}): {result.error}")
+    else:
+        jitter_stats.record(result.jitter)
+        metrics.launch_jitter.observe(result.jitter)
+        metrics.jobs_started.inc(sheet=sheet_name)
+        exec_datetime_end = result.started_at.strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{exec_datetime_end}] ✅ 명령 실행 시작 (PID: {result.pid}): {result.job.command}")
+        print(f"\033[90m[DEBUG] 실행 지연: {result.jitter * 1000:.1f}ms (누적 {jitter_stats.summary()})\033[0m")
+        if result.return_code is None:
+            # 프로세스가 여전히 실행 중이면 정상적으로 시작된 것으로 간주
+            print(f"[{exec_datetime_end}] ✅ 프로세스 정상 실행 중 (백그라운드, PID: {result.pid})")
+        else:
+            # 프로세스가 즉시 종료되었다면 에러 발생 가능성
+            print(f"[{exec_datetime_end}] ⚠️ 프로세스 즉시 종료됨 (PID: {result.pid}, 종료 코드: {result.return_code})")
+    
+    # H열에 로그 기록 (백그라운드에서 모아서 기록)
+    message = result.log_message()
+    status_writer.submit(sheet_name, result.job.row_index, message)
+    event_log.log(message, level="info" if result.ok else "warning", event="launch", sheet=sheet_name,
+                  row=result.job.row_index, command=result.job.command, pid=result.pid,
+                  scheduled_at=result.scheduled_at, jitter_ms=None if result.jitter is None else round(result.jitter * 1000, 1))
+    if on_finished is not None and result.error is not None:
+        on_finished(result.job, False)
+
+def report_job_exit(status_writer, sheet_name, metrics, event_log, record, on_finished=None):
+    """작업 프로세스 종료(회수) 결과를 출력하고 H열 로그를 최종 결과로 갱신 (감독 스레드에서 호출됨)
+
+    on_finished: 기록을 마친 뒤 on_finished(작업, 성공 여부)로 알림 (후속 작업 실행용)
+    """
+    started = record.started_at.strftime("%Y-%m-%d %H:%M:%S")
+    metrics.job_duration.observe(record.duration, sheet=sheet_name)
+    if record.timed_out:
+        metrics.jobs_failed.inc(sheet=sheet_name, reason="timeout")
+        outcome = f"시간 초과로 종료 (종료 코드: {record.return_code}, {record.duration:.1f}초)"
+    elif record.return_code == 0:
+        metrics.jobs_completed.inc(sheet=sheet_name)
+        outcome = f"완료 (종료 코드: 0, {record.duration:.1f}초)"
+    else:
+        metrics.jobs_failed.inc(sheet=sheet_name, reason="exit_code")
+        outcome = f"실패 (종료 코드: {record.return_code}, {record.duration:.1f}초)"
+    message = f"{started} | {outcome}"
+    output_tail = None
+    if record.output is not None:
+        # 파이프에 남은 출력을 마저 읽은 뒤 마지막 몇 줄을 H열 로그에 덧붙임
+        record.output.wait(OUTPUT_DRAIN_WAIT)
+        output_tail = record.output.tail()
+        summary = record.output.summary(OUTPUT_SUMMARY_CHARS)
+        if summary:
+            message += f" | 출력: {summary}"
+    print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 🏁 작업 종료 (PID: {record.pid}): {outcome} - {record.job.command}")
+    if output_tail:
+        print(f"\033[90m[DEBUG] 마지막 출력 ({record.output.path}):\033[0m")
+        for line in output_tail[-5:]:
+            print(f"\033[90m    {line}\033[0m")
+    status_writer.submit(sheet_name, record.job.row_index, message)
+    event_log.log(outcome, level="info" if record.return_code == 0 and not record.timed_out else "warning",
+                  event="exit", sheet=sheet_name, row=record.job.row_index, command=record.job.command,
+                  pid=record.pid, return_code=record.return_code, duration=round(record.duration, 3),
+                  timed_out=record.timed_out, output_path=record.output.path if record.output else None,
+                  output_tail=output_tail)
+    if on_finished is not None:
+        on_finished(record.job, record.return_code == 0 and not record.timed_out)
+
+def format_age(seconds):
+    """경과 시간을 '3분', '2시간 5분' 형태로 변환"""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return f"{int(seconds)}초"
+    if minutes < 60:
+        return f"{minutes}분"
+    return f"{minutes // 60}시간 {minutes % 60}분"
+
+def report_startup(startup, metrics, event_log):
+    """프로세스 시작부터 첫 스케줄 평가까지의 구간별 소요 시간 출력 및 지표 기록"""
+    print(f"\033[90m[DEBUG] 시작 시간: {startup.summary()}\033[0m")
+    event_log.log(f"시작 시간: {startup.summary()}", event="startup",
+                  phases={name: round(seconds, 4) for name, seconds in startup.phases})
+    for name, seconds in startup.phases:
+        metrics.startup_seconds.set(seconds, phase=name)
+    metrics.startup_seconds.set(startup.total(), phase="total")
+
+def submit_jobs(supervisor, tenant, jobs, scheduled_at, status_writer, jitter_stats, metrics, event_log, dependencies=None):
+    """작업들을 감독기에 실행 요청 (겹침 방지/동시 실행 제한은 감독기가 처리)
+
+    dependencies: DependencyRunner - 작업이 끝나면 F열로 이어진 후속 작업 실행
+    """
+    on_finished = functools.partial(dependencies.job_finished, tenant) if dependencies is not None else None
+    on_result = functools.partial(report_launch_result, status_writer, tenant.sheet_name, jitter_stats, metrics, event_log,
+                                  on_finished=on_finished)
+    on_exit = functools.partial(report_job_exit, status_writer, tenant.sheet_name, metrics, event_log,
+                                on_finished=on_finished)
+    for job in jobs:
+        supervisor.submit(tenant.launcher, (tenant.sheet_name, job.row_index), job, scheduled_at, on_result, on_exit)
+
+def schedule_next_fire(timers, tenant, after, inclusive):
+    """시트의 컴파일된 테이블에서 다음 실행 일시를 찾아 타이머에 등록"""
+    fire_at, jobs = tenant.table.next_fire(after, inclusive=inclusive)
+    if fire_at is not None:
+        timers.push_at(fire_at, "fire", (tenant, tenant.fire_generation, fire_at))
+    return fire_at, jobs
+
+def claim_run(journal, coordinator, metrics, event_log, sheet_name, job, scheduled_at):
+    """실행 슬롯 확보 (클러스터 모드면 실행 리스까지 확보해야 실행, 다른 노드가 가져갔으면 저널에만 기록)"""
+    if coordinator is None:
+        return journal.claim(sheet_name, job, scheduled_at)
+    if journal.has_run(sheet_name, job, scheduled_at):
+        return False
+    acquired = coordinator.try_acquire(run_key(sheet_name, job, scheduled_at))
+    # 다른 노드가 실행한 슬롯도 이 노드에서는 다시 시도하지 않도록 저널에 기록
+    journal.claim(sheet_name, job, scheduled_at)
+    metrics.cluster_leases.inc(result="acquired" if acquired else "lost")
+    if not acquired:
+        print(f"\033[90m[DEBUG] 다른 노드가 실행: [{sheet_name}] {slot_time_str(scheduled_at)} {job.command}\033[0m")
+        event_log.log("다른 노드가 실행", event="lease_lost", sheet=sheet_name, row=job.row_index,
+                      scheduled_at=scheduled_at, node=coordinator.node_id)
+    return acquired
+
+def run_missed_jobs(tenant, journal, supervisor, status_writer, jitter_stats, metrics, event_log, policy, grace_seconds,
+                    coordinator=None, dependencies=None):
+    """유예 시간 안에 놓친 실행을 misfire 정책에 따라 바로 실행"""
+    missed = find_missed_runs(tenant.table, journal, tenant.sheet_name, datetime.datetime.now(), grace_seconds, policy)
+    if not missed:
+        return
+    
+    print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏪ 놓친 실행 {len(missed)}건 처리 (정책: {policy})")
+    for scheduled_at, job in missed:
+        if not claim_run(journal, coordinator, metrics, event_log, tenant.sheet_name, job, scheduled_at):
+            continue
+        print(f"   - {scheduled_at.strftime('%Y-%m-%d %H:%M:%S')} {job.command}")
+        submit_jobs(supervisor, tenant, [job], scheduled_at, status_writer, jitter_stats, metrics, event_log, dependencies)
+
+class DependencyRunner:
+    """F열 선행 작업이 끝나면 후속 작업을 바로 실행 (감독/실행기 스레드에서 호출됨)
+
+    선행 작업 하나에 후속 작업이 여러 개면 한꺼번에 감독기에 넘겨서 동시에 실행 (동시 실행 제한은 그대로 적용)
+    """
+    
+    def __init__(self, supervisor, journal, coordinator, status_writer, jitter_stats, metrics, event_log):
+        self.supervisor = supervisor
+        self.journal = journal
+        self.coordinator = coordinator
+        self.status_writer = status_writer
+        self.jitter_stats = jitter_stats
+        self.metrics = metrics
+        self.event_log = event_log
+        self.tracker = ChainTracker()
+    
+    def job_finished(self, tenant, job, ok):
+        """작업 하나가 끝났을 때 실행할 수 있게 된 후속 작업 실행, 실패했으면 후속 작업에 건너뜀 기록"""
+        finished_at = datetime.datetime.now()
+        ready, blocked = self.tracker.finished(tenant.sheet_name, tenant.table, job, ok, finished_at)
+        exec_datetime = finished_at.strftime("%Y-%m-%d %H:%M:%S")
+        for child in blocked:
+            self.metrics.jobs_skipped.inc(sheet=tenant.sheet_name)
+            message = f"{exec_datetime} | 건너뜀 (선행 작업 {job.row_index}행 실패)"
+            print(f"[{exec_datetime}] ⏭️ 선행 작업({job.row_index}행) 실패로 건너뜀: {child.command}")
+            self.status_writer.submit(tenant.sheet_name, child.row_index, message)
+            self.event_log.log(message, level="warning", event="chain_skipped", sheet=tenant.sheet_name,
+                               row=child.row_index, command=child.command, parent=job.row_index)
+        if not ready:
+            return
+        # 후속 작업의 예약 시각은 선행 작업이 끝난 시각 (실행 저널의 슬롯 키)
+        scheduled_at = finished_at.replace(microsecond=0)
+        due_jobs = []
+        for child in ready:
+            if not claim_run(self.journal, self.coordinator, self.metrics, self.event_log, tenant.sheet_name, child,
+                             scheduled_at):
+                continue
+            print(f"[{exec_datetime}] 🔗 선행 작업({', '.join(f'{row}행' for row in child.after)}) 완료 -> 후속 작업 실행: {child.command}")
+            due_jobs.append(child)
+        submit_jobs(self.supervisor, tenant, due_jobs, scheduled_at, self.status_writer, self.jitter_stats, self.metrics,
+                    self.event_log, self)
+
+def control_status(tenants, supervisor, poller, schedule_age, paused, phases=None, profiling=None,
+                   upcoming=CONTROL_UPCOMING, recent=CONTROL_RECENT):
+    """제어 포트 /status 응답 (HTTP 스레드에서 호출됨 - 컴파일된 테이블은 교체만 되고 바뀌지 않으므로 그대로 읽음)"""
+    now = datetime.datetime.now()
+    sheets = []
+    for tenant in tenants:
+        table = tenant.table
+        next_runs = []
+        fire_at, jobs = table.next_fire(now, inclusive=True)
+        while fire_at is not None and jobs and len(next_runs) < upcoming:
+            for job in jobs:
+                next_runs.append({'at': fire_at.isoformat(), 'row': job.row_index, 'name': job.job_name,
+                                  'time': job.time_str, 'command': job.command})
+            fire_at, jobs = table.next_fire(fire_at, inclusive=False)
+        sheets.append({
+            'sheet': tenant.sheet_name,
+            'jobs': len(table),
+            'last_fired_at': tenant.last_fired_at.isoformat() if tenant.last_fired_at else None,
+            'next': next_runs[:upcoming],
+            'chains': {str(parent): [child.row_index for child in children] for parent, children in table.dependents.items()},
+            'dependency_errors': [[row, reason] for row, reason in table.dependency_errors],
+        })
+    running = [{'sheet': record.key[0], 'row': record.job.row_index, 'command': record.job.command, 'pid': record.pid,
+                'started_at': record.started_at.isoformat(timespec='seconds'),
+                'elapsed': round(time.monotonic() - record.started_mono, 1)}
+               for record in supervisor.running()]
+    finished = [{'sheet': record.key[0], 'row': record.job.row_index, 'command': record.job.command,
+                 'started_at': record.started_at.isoformat(timespec='seconds'), 'return_code': record.return_code,
+                 'duration': round(record.duration, 3), 'timed_out': record.timed_out}
+                for record in reversed(supervisor.recent(recent))]
+    return {
+        'pid': os.getpid(),
+        'now': now.isoformat(timespec='seconds'),
+        'paused': paused,
+        'poll_interval': poller.interval,
+        'schedule_age': None if schedule_age is None else round(schedule_age, 1),
+        'queued': supervisor.queue_depth(),
+        'sheets': sheets,
+        'running': running,
+        'recent': finished,
+        'phases': {key[0]: {'count': count, 'avg_ms': round(total / count * 1000, 2) if count else 0.0}
+                   for key, (count, total) in sorted((phases or {}).items())},
+        'profiling': profiling,
+    }
+
+def run_row_now(tenants, args, supervisor, status_writer, jitter_stats, metrics, event_log, dependencies):
+    """제어 명령 run: 지정한 행을 지금 바로 실행하고 (성공 여부, 메시지) 반환
+
+    실행 저널에는 기록하지 않으므로 같은 행의 예약 실행과는 별개 (실행 중이면 겹침 방지로 건너뜀)
+    """
+    sheet_name = args.get('sheet')
+    if sheet_name:
+        tenant = next((tenant for tenant in tenants if tenant.sheet_name == sheet_name), None)
+        if tenant is None:
+            return False, f"시트 '{sheet_name}'을(를) 찾을 수 없음"
+    elif len(tenants) == 1:
+        tenant = tenants[0]
+    else:
+        return False, "시트가 여러 개이므로 sheet를 지정해야 함"
+    row = str(args.get('row', '')).strip()
+    if not row.isdigit():
+        return False, "row(행 번호)를 지정해야 함"
+    job = next((job for job in tenant.table.jobs if job.row_index == int(row)), None)
+    if job is None:
+        return False, f"[{tenant.sheet_name}] {row}행에 실행할 작업이 없음"
+    exec_datetime = datetime.datetime.now()
+    print(f"[{exec_datetime.strftime('%Y-%m-%d %H:%M:%S')}] 🖐️ 수동 실행 ({row}행): {job.command}")
+    event_log.log("수동 실행", event="manual_run", sheet=tenant.sheet_name, row=job.row_index, command=job.command)
+    submit_jobs(supervisor, tenant, [job], exec_datetime.replace(microsecond=0), status_writer, jitter_stats, metrics,
+                event_log, dependencies)
+    return True, f"[{tenant.sheet_name}] {row}행 실행 요청: {job.command}"
+
+def run_scheduler(sheet_ids=None, all_sheets=False, misfire_policy=MISFIRE_SKIP, misfire_grace=MISFIRE_GRACE,
+                  service_factory=None, max_jobs=MAX_CONCURRENT_JOBS, job_timeout=JOB_TIMEOUT,
+                  python_pool_size=PYTHON_POOL_SIZE, worker_max_runs=WORKER_MAX_RUNS,
+                  metrics_file=None, metrics_port=METRICS_PORT, api_budget=API_REQUESTS_PER_MINUTE, headless=None,
+                  capture_output=False, cluster_store=None, node_id=None, control_port=CONTROL_PORT,
+                  profile_ticks=0, trace_memory=0, schedule_file=None):
+    """스케줄러 실행 루프
 
-def run_scheduler():
-    """스케줄러 실행 루프"""
-    # server_log.txt를 스크립트와 같은 폴더에 저장
-    log_file_path = os.path.join(os.path.dirname(__file__), "server_log.txt")
-    with open(log_file_path, "a", encoding="utf-8") as f:
-        f.write(f"[{datetime.datetime.now()}] 스케줄러 실행됨 ✅\n")
+    sheet_ids: 스케줄링할 시트(ID) 리스트 (없으면 ID.txt의 ID 하나)
+    all_sheets: True면 제외 시트를 뺀 모든 시트를 한 프로세스에서 스케줄링
+    misfire_policy/misfire_grace: 시작 시 유예 시간(초) 안에 놓친 실행 처리 방식
+    service_factory: 시트 서비스 객체를 만드는 함수 (없으면 인증 후 실제 Google Sheets API 사용)
+    max_jobs/job_timeout: 동시에 실행할 최대 작업 수 / 작업 최대 실행 시간(초) (둘 다 0이면 제한 없음)
+    python_pool_size/worker_max_runs: 파이썬 워커 수(0이면 항상 일반 실행) / 워커 교체 주기(실행 횟수)
+    metrics_file/metrics_port: 지표를 저장할 Prometheus 텍스트 파일 / 제공할 로컬 HTTP 포트
+    api_budget: 분당 API 요청 한도 (0이면 제한 없음)
+    headless: True면 남은 시간 표시 생략 (None이면 표준 출력이 터미널이 아닐 때 자동으로 생략)
+    capture_output: True면 작업 출력을 job_logs 폴더에 작업별로 기록하고 종료 시 마지막 출력을 H열에 덧붙임
+    cluster_store/node_id: 여러 노드가 시트를 나눠 실행할 때 공유하는 리스 저장소(.db 파일 또는 폴더) / 이 노드 이름
+    control_port: 상태 조회/즉시 재조회/수동 실행/일시 정지용 로컬 HTTP 포트 (0이면 사용 안 함)
+    profile_ticks/trace_memory: 시작 직후 프로파일할 틱 수 / 메모리 스냅샷 비교 주기(초) (0이면 사용 안 함, 실행 중에도 켤 수 있음)
+    schedule_file: 구글 시트 대신 스케줄을 읽을 로컬 CSV/JSON 파일 (저장하면 바로 재조회, 실행 로그는 옆의 .status.json에 기록,
+                   sheet_ids가 없으면 파일의 모든 시트)
+    """
+    # 시작 시간 분석 (모듈 import부터 첫 스케줄 평가까지)
+    startup = PhaseTimer(STARTUP_BEGIN)
+    startup.mark("import")
+    
+    # 실행 기록은 스크립트와 같은 폴더의 server_log.jsonl에 JSON 한 줄씩 (백그라운드에서 모아서 기록)
+    event_log = LogWriter(source="scheduler").start()
+    event_log.log("스케줄러 실행됨 ✅", event="start", sheet_ids=sheet_ids, all_sheets=all_sheets, pid=os.getpid())
+    if headless is None:
+        headless = is_headless()
     
     # 구글 시트 URL
     url = "https://docs.google.com/spreadsheets/d/1mkaF-DPisWkEaIZYjwdQJGfDykmXIERI3gu_H5pNrSQ/edit?gid=1225124787#gid=1225124787"
     
-    # 인증 정보 가져오기
-    print("인증 정보를 가져오는 중...")
-    creds = get_credentials()
+    # 로컬 스케줄 파일: 인증/네트워크/API 할당량 없이 파일에서 읽음 (스냅샷은 시트용과 섞이지 않게 파일 옆에 따로 저장)
+    snapshot_path = SNAPSHOT_PATH
+    metadata_cache_path = METADATA_CACHE_PATH
+    if schedule_file:
+        try:
+            file_service = FileSheetsService(schedule_file)
+        except ScheduleFileError as e:
+            print(f"❌ {e}")
+            return
+        service_factory = lambda: file_service
+        api_budget = 0
+        snapshot_path = schedule_file + SNAPSHOT_SUFFIX
+        metadata_cache_path = None
+        if not sheet_ids:
+            all_sheets = True
+        print(f"📄 스케줄 파일: {schedule_file} (저장하면 바로 반영, 실행 로그: {file_service.status_path})")
+    
+    if service_factory is None:
+        # 인증 정보 가져오기
+        print("인증 정보를 가져오는 중...")
+        creds = load_get_credentials()()
+        service_factory = functools.partial(build_sheets_service, creds)
+        startup.mark("auth")
+    
+    # 지표 수집 (API 호출 지연/오류는 서비스 객체를 감싸서 기록)
+    metrics = SchedulerMetrics()
     
-    # Google Sheets API 서비스 생성
-    service = build('sheets', 'v4', credentials=creds)
+    # API 호출 정책 (재시도 백오프, 분당 요청 한도, 같은 읽기 요청 합치기) - 모든 서비스 객체가 공유
+    api_client = SheetsClient(requests_per_minute=api_budget, max_retries=API_MAX_RETRIES)
+    
+    # Google Sheets API 서비스 생성 (재시도마다 지연/오류가 기록되도록 지표 계측을 안쪽에 둠)
+    service = api_client.wrap(metrics.instrument(service_factory()))
+    startup.mark("build_service")
     
     # 스프레드시트 ID 추출
     spreadsheet_id, _ = extract_spreadsheet_info(url)
+    if schedule_file:
+        spreadsheet_id = "file:" + os.path.abspath(schedule_file)
     
-    # ID와 일치하는 시트 찾기
-    sheet_name = get_sheet_by_id(service, spreadsheet_id, ID)
+    # 시트 이름 목록 캐시 (필드 마스크로 이름/gid만 조회, 파일 캐시로 재시작 시 재사용)
+    metadata = SheetMetadataCache(service, spreadsheet_id, cache_path=metadata_cache_path)
     
-    if not sheet_name:
-        print(f"❌ ID '{ID}'와 일치하는 시트를 찾을 수 없습니다.")
-        return
+    # 마지막으로 조회에 성공한 스케줄 (같은 시트 구성일 때만 사용)
+    if not all_sheets:
+        sheet_ids = sheet_ids or [read_id_file()]
+    sheet_key = "*" if all_sheets else ",".join(sheet_ids)
+    snapshot = ScheduleSnapshot.load(spreadsheet_id, sheet_key, snapshot_path)
+    
+    # 스케줄링할 시트 찾기
+    if all_sheets:
+        sheet_names = get_tenant_sheets(metadata)
+        if not sheet_names and snapshot is not None:
+            # 시트 목록을 조회할 수 없으면 스냅샷의 시트 목록으로 시작
+            sheet_names = list(snapshot.sheets)
+        if not sheet_names:
+            print(f"❌ 스케줄링할 시트를 찾을 수 없습니다.")
+            return
+    elif snapshot is not None:
+        # 같은 ID 목록으로 조회에 성공한 적이 있으면 네트워크 없이 바로 시작 (시트 이름 = ID)
+        sheet_names = list(snapshot.sheets)
+    else:
+        sheet_names = []
+        for sheet_id in sheet_ids:
+            # ID와 일치하는 시트 찾기
+            sheet_name = get_sheet_by_id(metadata, sheet_id)
+            if not sheet_name:
+                print(f"❌ ID '{sheet_id}'와 일치하는 시트를 찾을 수 없습니다.")
+                return
+            sheet_names.append(sheet_name)
     
-    print(f"\n📍 시트 '{sheet_name}'을 찾았습니다.")
-    print(f"📍 체크주기: 매 5분 단위 (정시)\n")
+    startup.mark("sheet_lookup")
+    print(f"\n📍 시트 {', '.join(repr(name) for name in sheet_names)}을 찾았습니다.")
+    print(f"📍 시트 확인 주기: {MIN_CHECK_INTERVAL}~{CHECK_INTERVAL}초 (변경이 없으면 점점 늘어남, 예약 시각에는 정확히 깨어나서 실행)\n")
     print("-" * 50)
     
-    # 실행된 명령 추적 (중복 실행 방지)
-    executed_commands = set()
+    # 'python x.py' 작업용 파이썬 워커 풀 (모든 시트가 같이 사용, 출력 캡처 중에는 사용하지 않음)
+    worker_pool = None
+    if capture_output:
+        print(f"\033[90m[DEBUG] 작업 출력 기록: {OUTPUT_DIR} (작업별 파일, 종료 시 마지막 출력을 H열에 기록)\033[0m")
+    elif python_pool_size > 0:
+        worker_pool = PythonWorkerPool(size=python_pool_size, max_runs=worker_max_runs)
+        print(f"\033[90m[DEBUG] 파이썬 워커 {python_pool_size}개 준비 (워커당 {worker_max_runs}회 실행 후 교체)\033[0m")
+    
+    # 시트마다 상태와 전용 실행기 생성 (시트가 여러 개면 실행 스레드를 나눠 가짐)
+    workers_per_tenant = max(MIN_LAUNCH_WORKERS_PER_TENANT, LAUNCH_WORKERS // len(sheet_names))
+    tenants = [
+        TenantState(name, JobLauncher(max_workers=workers_per_tenant, probe_delay=STARTUP_PROBE_DELAY,
+                                      worker_pool=worker_pool, output_dir=OUTPUT_DIR if capture_output else None,
+                                      output_name=name))
+        for name in sheet_names
+    ]
+    multi_tenant = len(tenants) > 1
+    
+    # 자식 프로세스 감독기 (종료 회수, 겹침 방지, 동시 실행 제한, 시간 초과 종료)
+    supervisor = JobSupervisor(max_concurrency=max_jobs or None, timeout=job_timeout or None)
+    
+    # 실행 기록 저널 (재시작해도 같은 날 같은 슬롯은 다시 실행하지 않음)
+    journal = RunJournal()
+    
+    # 클러스터 모드: 실행 슬롯마다 리스를 확보한 노드 하나만 실행 (담당 노드가 꺼져 있으면 다른 노드가 인계)
+    coordinator = None
+    if cluster_store:
+        coordinator = ClusterCoordinator(open_lease_store(cluster_store), node_id)
+        coordinator.load_function = lambda: len(supervisor.running()) + supervisor.queue_depth()
+        coordinator.start()
+        print(f"\033[90m[DEBUG] 클러스터 모드: 노드 '{coordinator.node_id}', 살아 있는 노드 {coordinator.live_nodes()} (저장소: {cluster_store})\033[0m")
+        metrics.cluster_nodes.set_function(lambda: len(coordinator.live_nodes()))
+    
+    # 타이머 힙: "poll"(시트 재조회)과 "fire"(예약 실행) 두 종류
+    # "poll"은 세대 번호를 데이터로 넣어서 즉시 재조회(reload) 시 이전 재조회 타이머를 무효화
+    timers = TimerQueue()
+    poll_generation = 0
+    timers.push(time.monotonic(), "poll", poll_generation)
+    jitter_stats = JitterStats()
+    poller = SheetPoller(MIN_CHECK_INTERVAL, CHECK_INTERVAL)
+    poll_scheduled = True  # 대기 중인 "poll" 타이머가 있는지 여부
+    
+    # H열 로그는 백그라운드 스레드가 모아서 기록 (스레드 전용 서비스 객체 사용)
+    status_writer = StatusLogWriter(
+        api_client.wrap(metrics.instrument(service_factory())), spreadsheet_id,
+        flush_interval=LOG_FLUSH_INTERVAL, max_pending=LOG_QUEUE_SIZE,
+        on_flush=lambda seconds: metrics.phase_seconds.observe(seconds, phase="log_write")
+    ).start()
+    
+    # F열 후속 작업은 선행 작업이 끝나는 즉시 감독 스레드에서 실행
+    dependencies = DependencyRunner(supervisor, journal, coordinator, status_writer, jitter_stats, metrics, event_log)
+    
+    # 큐 길이 등은 지표를 내보낼 때마다 읽음
+    metrics.log_queue_depth.set_function(status_writer.pending_count)
+    metrics.log_dropped.set_function(lambda: status_writer.dropped)
+    metrics.running_jobs.set_function(lambda: len(supervisor.running()))
+    metrics.job_queue_depth.set_function(supervisor.queue_depth)
+    metrics.poll_interval.set_function(lambda: poller.interval)
+    metrics.api_retries.set_function(lambda: api_client.retries)
+    metrics.api_throttled.set_function(lambda: api_client.budget.throttled_seconds)
+    if metrics_file:
+        metrics.registry.start_textfile_writer(metrics_file, METRICS_FILE_INTERVAL)
+        print(f"\033[90m[DEBUG] 지표 파일: {metrics_file} ({METRICS_FILE_INTERVAL}초마다 갱신)\033[0m")
+    if metrics_port:
+        port = metrics.registry.serve_http(metrics_port)
+        print(f"\033[90m[DEBUG] 지표 제공: http://127.0.0.1:{port}/metrics\033[0m")
+    
+    metrics.schedule_age.set_function(lambda: snapshot.age() if snapshot is not None else -1)
+    
+    # 프로파일링 스위치: 시작 옵션, 신호(SIGUSR1/2), 제어 포트, 요청 파일로 실행 중에 켜고 끔
+    profiler = Profiler()
+    if profile_ticks:
+        profiler.request_profile(profile_ticks)
+    if trace_memory:
+        profiler.request_memory(trace_memory)
+    if install_signal_handlers(profiler):
+        print(f"\033[90m[DEBUG] 프로파일 신호: kill -USR1 {os.getpid()} (다음 {PROFILE_TICKS}틱), kill -USR2 {os.getpid()} (메모리 추적 켜기/끄기)\033[0m")
+    
+    # 제어 포트: 상태 조회와 즉시 재조회/수동 실행/일시 정지 (명령은 이 루프에서 처리)
+    # 백그라운드 시트 조회 결과와 스케줄 파일 감시도 같은 명령 대기열로 루프에 전달 (포트는 지정했을 때만 엶)
+    control = ControlServer(lambda: control_status(
+        tenants, supervisor, poller, snapshot.age() if snapshot is not None else None, control.paused,
+        phases=metrics.phase_seconds.totals(), profiling=profiler.status()))
+    if control_port:
+        port = control.serve_http(control_port)
+        print(f"\033[90m[DEBUG] 제어 포트: http://127.0.0.1:{port}/status (POST /reload, /pause, /resume, /run?row=N)\033[0m")
+    watcher = None
+    if schedule_file:
+        watcher = FileWatcher(schedule_file, lambda: control.post("reload")).start()
+    
+    # 시트 조회는 백그라운드 스레드에서 (API 장애/재시도 중에도 예약 실행은 제시간에), 결과는 "fetched" 명령으로 받음
+    fetcher = BackgroundFetcher(
+        lambda: get_sheet_data(service, spreadsheet_id, sheet_names),
+        lambda rows_by_sheet, seconds: control.post("fetched", {'rows': rows_by_sheet, 'seconds': seconds}))
+    fetch_again = False  # 조회 중에 재조회 요청이 들어왔으면 끝난 뒤 바로 한 번 더 조회
+    startup.mark("setup")
+    
+    if snapshot is not None:
+        # 스냅샷으로 바로 예약을 걸어두고, 시트 조회는 그 다음에 (내용이 같으면 재컴파일하지 않음)
+        print(f"\033[90m[DEBUG] 스케줄 스냅샷 사용 ({format_age(snapshot.age())} 전 확인된 스케줄)\033[0m")
+        now = datetime.datetime.now()
+        for tenant in tenants:
+            if tenant.sheet_name not in snapshot.sheets:
+                continue
+            tenant.fingerprint, tenant.table = snapshot.sheets[tenant.sheet_name]
+            run_missed_jobs(tenant, journal, supervisor, status_writer, jitter_stats, metrics, event_log,
+                            misfire_policy, misfire_grace, coordinator, dependencies)
+            tenant.fire_generation += 1
+            fire_at, jobs = schedule_next_fire(timers, tenant, now, True)
+            print_upcoming(fire_at, jobs, f"[{tenant.sheet_name}] " if multi_tenant else "")
+        startup.mark("snapshot")
     
     while True:
         try:
-            now = datetime.datetime.now().strftime("%H:%M")
-            current_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # 시트 데이터 가져오기
-            rows = get_sheet_data(service, spreadsheet_id, sheet_name)
+            # 직전 틱(타이머 하나 처리) 마감: 프로파일 틱 수 계산, 메모리 스냅샷 비교 주기 확인
+            profiler.tick_end()
+            deadline, kind, payload = timers.pop()
+            if kind == "poll" and payload != poll_generation:
+                continue  # 즉시 재조회로 무효화된 타이머
+            if countdown_sleep(deadline, "다음 시트 확인" if kind == "poll" else "다음 실행", headless, control.wakeup):
+                # 제어 명령으로 일찍 깨어남: 타이머는 되돌려 놓고 명령 처리
+                timers.push(deadline, kind, payload)
+                for command in control.take_commands():
+                    if command.name == "fetched":
+                        # 백그라운드 조회 완료: 결과 처리는 타이머로 넘겨서 아래 "fetched" 분기에서
+                        timers.push(time.monotonic(), "fetched", (command.args['rows'], command.args['seconds']))
+                    elif command.name == "reload":
+                        poll_generation += 1
+                        timers.push(time.monotonic(), "poll", poll_generation)
+                        poll_scheduled = True
+                        command.reply(True, "시트를 바로 다시 확인합니다")
+                    elif command.name in ("pause", "resume"):
+                        control.paused = command.name == "pause"
+                        state = "일시 정지" if control.paused else "다시 시작"
+                        print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {'⏸️' if control.paused else '▶️'} 예약 실행 {state}")
+                        event_log.log(f"예약 실행 {state}", event=command.name)
+                        command.reply(True, f"예약 실행 {state}", paused=control.paused)
+                    elif command.name in ("profile", "memory"):
+                        value = command.args.get('ticks' if command.name == "profile" else 'interval', "")
+                        message = profiler.apply_command(f"{command.name} {value}")
+                        command.reply(message is not None, message or "형식 오류 (profile?ticks=N / memory?interval=초, 0이면 끔)",
+                                      profiling=profiler.status())
+                    else:
+                        command.reply(*run_row_now(tenants, command.args, supervisor, status_writer, jitter_stats,
+                                                   metrics, event_log, dependencies))
+                continue
             
-            if not rows:
-                print(f"[{current_datetime}] 시트 데이터를 읽을 수 없습니다.")
-                next_check_time = get_next_check_time(interval_minutes=5)
-                seconds_to_wait = get_seconds_until_next_check(interval_minutes=5)
-                countdown_sleep(seconds_to_wait, next_check_time, [], None, None)
+            profiler.tick_begin()
+            if kind == "poll":
+                if fetcher.busy:
+                    # 이전 조회가 아직 진행 중 (API 재시도 등): 끝나면 바로 한 번 더 조회, 그 전까지는 이 타이머로 다시 확인
+                    fetch_again = True
+                    timers.push(time.monotonic() + CHECK_INTERVAL, "poll", poll_generation)
+                    continue
+                current_time_str = datetime.datetime.now().strftime('%H:%M:%S')
+                print(f"🔄 [{current_time_str}] 시트 확인 중...\n")
+                # 모든 시트 데이터를 batchGet 한 번으로 가져오기 (백그라운드 스레드, 기다리지 않음)
+                fetcher.start()
+                # 조회가 끝나지 않아도 루프가 다시 확인하도록 예비 타이머 (결과를 처리하면 세대가 바뀌어 무시됨)
+                timers.push(time.monotonic() + CHECK_INTERVAL, "poll", poll_generation)
                 continue
             
-            # 첫 행은 헤더이므로 건너뛰기
-            for row_idx, row in enumerate(rows[1:], start=2):
-                # A열(시간)과 E열(명령어) 확인
-                schedule_time_raw = row[0].strip() if len(row) > 0 else ""
-                schedule_time = normalize_time(schedule_time_raw)
-                command = row[4].strip() if len(row) > 4 else ""
+            if kind == "fetched":
+                rows_by_sheet, fetch_seconds = payload
+                metrics.phase_seconds.observe(fetch_seconds, phase="fetch")
+                poll_started = time.perf_counter() - fetch_seconds
+                # 예비 타이머 무효화 후 다음 재조회 등록 (조회 중에 재조회 요청이 있었으면 바로)
+                poll_generation += 1
+                poll_scheduled = False
+                refetch, fetch_again = fetch_again, False
+                next_poll = time.monotonic() + (0 if refetch else poller.interval)
+                if startup is not None:
+                    startup.mark("first_fetch")
+                
+                if not rows_by_sheet:
+                    metrics.polls.inc(result="error")
+                    if startup is not None:
+                        report_startup(startup, metrics, event_log)
+                        startup = None
+                    # 읽기에 실패하면 직전에 컴파일한 테이블(또는 스냅샷)로 계속 실행
+                    current_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    print(f"[{current_datetime}] 시트 데이터를 읽을 수 없습니다.")
+                    event_log.log("시트 데이터를 읽을 수 없습니다.", level="warning", event="poll_error",
+                                  schedule_age=snapshot.age() if snapshot is not None else None)
+                    if snapshot is not None:
+                        age = snapshot.age()
+                        warning = " ⚠️ 스케줄이 오래됨" if age > SNAPSHOT_STALE_WARNING else ""
+                        print(f"[{current_datetime}] 📴 마지막으로 확인된 스케줄({format_age(age)} 전)로 계속 실행합니다.{warning}")
+                    timers.push(next_poll, "poll", poll_generation)
+                    poll_scheduled = True
+                    continue
+                
+                changed = poller.observe(rows_by_sheet)
+                verified_at = time.time()
+                for sheet_name, rows in rows_by_sheet.items():
+                    metrics.rows_parsed.inc(len(rows), sheet=sheet_name)
+                    metrics.sheet_rows.set(len(rows), sheet=sheet_name)
+                # 변경 여부에 따라 조정된 주기로 다음 재조회 등록
+                timers.push(next_poll if refetch else time.monotonic() + poller.interval, "poll", poll_generation)
+                poll_scheduled = True
+                
+                # 스냅샷이 없으면(직전 컴파일이 실패했거나 아직 없음) 내용이 같아도 아래에서 다시 컴파일
+                if not changed and snapshot is not None:
+                    # 확인 시각은 메모리에서만 갱신 (파일은 내용이 바뀔 때와 종료할 때만 저장)
+                    snapshot.verified_at = verified_at
+                    metrics.polls.inc(result="unchanged")
+                    metrics.poll_seconds.observe(time.perf_counter() - poll_started)
+                    print(f"\033[90m[DEBUG] 시트 변경 없음 (다음 확인: {poller.interval:.0f}초 후)\033[0m")
+                    continue
                 
-                # 시간과 명령어가 모두 있는 경우에만 처리
-                if schedule_time and command:
-                    # 시간 형식 검증 (HH:MM 형식) - 실행 시점의 현재 시간으로 다시 확인
-                    current_time = datetime.datetime.now().strftime("%H:%M")
-                    if schedule_time == current_time:
-                        # 중복 실행 방지: 같은 시간과 명령어 조합은 한 번만 실행
-                        command_key = f"{schedule_time}:{command}"
-                        
-                        if command_key not in executed_commands:
-                            # 실행 시점의 정확한 시간 가져오기
-                            exec_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            print(f"[{exec_datetime}] ⏰ 시간 매칭: {schedule_time}")
-                            print(f"[{exec_datetime}] 📝 명령 실행: {command}")
-                            
-                            try:
-                                # 명령어 실행 (백그라운드에서 실행하여 팝업 알림이 있어도 블로킹되지 않도록)
-                                # Windows에서는 CREATE_NEW_CONSOLE 플래그 사용
-                                # stdin은 None으로 설정하여 새 콘솔의 stdin을 사용 (Node.js readline 등이 작동하도록)
-                                if sys.platform == 'win32':
-                                    process = subprocess.Popen(
-                                        command,
-                                        shell=True,
-                                        stdout=subprocess.DEVNULL,
-                                        stderr=subprocess.DEVNULL,
-                                        stdin=None,  # None으로 설정하여 새 콘솔의 stdin 사용
-                                        creationflags=subprocess.CREATE_NEW_CONSOLE
-                                    )
-                                else:
-                                    # Linux/Mac에서는 nohup과 유사한 방식
-                                    process = subprocess.Popen(
-                                        command,
-                                        shell=True,
-                                        stdout=subprocess.DEVNULL,
-                                        stderr=subprocess.DEVNULL,
-                                        stdin=None,  # None으로 설정하여 새 콘솔의 stdin 사용
-                                        start_new_session=True
-                                    )
-                                
-                                exec_datetime_end = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                print(f"[{exec_datetime_end}] ✅ 명령 실행 시작 (PID: {process.pid})")
-                                
-                                # 프로세스가 정상적으로 시작되었는지 확인 (짧은 대기 후 상태 체크)
-                                time.sleep(0.5)
-                                log_message = ""
-                                if process.poll() is None:
-                                    # 프로세스가 여전히 실행 중이면 정상적으로 시작된 것으로 간주
-                                    print(f"[{exec_datetime_end}] ✅ 프로세스 정상 실행 중 (백그라운드)")
-                                    log_message = f"{exec_datetime_end} | 실행 성공 (PID: {process.pid})"
-                                else:
-                                    # 프로세스가 즉시 종료되었다면 에러 발생 가능성
-                                    return_code = process.returncode
-                                    print(f"[{exec_datetime_end}] ⚠️ 프로세스 즉시 종료됨 (종료 코드: {return_code})")
-                                    log_message = f"{exec_datetime_end} | 실행 실패 (종료 코드: {return_code})"
-                                
-                                # H열에 로그 기록
-                                write_log_to_column_h(service, spreadsheet_id, sheet_name, row_idx, log_message)
-                                
-                            except Exception as e:
-                                exec_datetime_end = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                print(f"[{exec_datetime_end}] ⚠️ 실행 오류: {e}")
-                                # 에러 발생 시에도 H열에 로그 기록
-                                error_log = f"{exec_datetime_end} | 실행 오류: {str(e)}"
-                                write_log_to_column_h(service, spreadsheet_id, sheet_name, row_idx, error_log)
-                            
-                            # 실행된 명령 기록
-                            executed_commands.add(command_key)
-                            
-                            # 하루가 지나면 실행 기록 초기화 (메모리 절약)
-                            if len(executed_commands) > 1000:
-                                executed_commands.clear()
+                for tenant in tenants:
+                    rows = rows_by_sheet.get(tenant.sheet_name, [])
+                    digest = fingerprint_rows(rows)
+                    if digest == tenant.fingerprint:
+                        continue  # 이 시트는 바뀌지 않음
+                    first_compile = tenant.fingerprint is None
+                    
+                    # 시트 행을 한 번만 파싱해서 시간 색인 테이블로 컴파일 (성공한 뒤에만 지문 기록 - 실패하면 다음 조회 때 다시)
+                    with metrics.compile_seconds.time(sheet=tenant.sheet_name), metrics.phase_seconds.time(phase="compile"):
+                        tenant.table = compile_schedule(rows)
+                    tenant.fingerprint = digest
+                    metrics.scheduled_jobs.set(len(tenant.table), sheet=tenant.sheet_name)
+                    print(f"\033[90m[DEBUG] 시트 '{tenant.sheet_name}' 변경 감지: 예약 {len(tenant.table)}건 컴파일 (다음 확인: {poller.interval:.0f}초 후)\033[0m")
+                    for row_index, reason in tenant.table.dependency_errors:
+                        print(f"⚠️ [{tenant.sheet_name}] {row_index}행 선행 작업(F열) 무시: {reason}")
+                    
+                    if first_compile:
+                        # 시작 직후: 꺼져 있던 동안 놓친 실행을 정책에 따라 처리
+                        run_missed_jobs(tenant, journal, supervisor, status_writer, jitter_stats, metrics, event_log,
+                                        misfire_policy, misfire_grace, coordinator, dependencies)
+                    
+                    # 새 테이블 기준으로 다음 실행 타이머 재등록
+                    tenant.fire_generation += 1
+                    now = datetime.datetime.now()
+                    # 지금 이 초에 해당하는 슬롯도 포함하되, 이미 실행한 슬롯이면 제외
+                    inclusive = tenant.table.next_fire(now, inclusive=True)[0] != tenant.last_fired_at
+                    fire_at, jobs = schedule_next_fire(timers, tenant, now, inclusive)
+                    print_upcoming(fire_at, jobs, f"[{tenant.sheet_name}] " if multi_tenant else "")
+                # 조회에 성공한 스케줄을 스냅샷으로 저장 (다음 시작/오프라인 때 사용)
+                snapshot = ScheduleSnapshot(spreadsheet_id, sheet_key, {
+                    tenant.sheet_name: (tenant.fingerprint, tenant.table) for tenant in tenants
+                }, verified_at)
+                with metrics.phase_seconds.time(phase="snapshot"):
+                    snapshot.save(snapshot_path)
+                metrics.polls.inc(result="changed")
+                metrics.poll_seconds.observe(time.perf_counter() - poll_started)
+                if startup is not None:
+                    startup.mark("first_compile")
+                    report_startup(startup, metrics, event_log)
+                    startup = None
+                continue
             
-            # 다음 5분 단위 정시까지 대기
-            next_check_time = get_next_check_time(interval_minutes=5)
-            seconds_to_wait = get_seconds_until_next_check(interval_minutes=5)
+            if kind == "takeover":
+                # 담당 순위가 낮아서 미뤄 둔 슬롯: 그 사이 다른 노드가 리스를 가져가지 않았으면 인계받아 실행
+                tenant, job, fire_at = payload
+                if control.paused:
+                    continue
+                if claim_run(journal, coordinator, metrics, event_log, tenant.sheet_name, job, fire_at):
+                    exec_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    print(f"[{exec_datetime}] 🤝 인계 실행 ({slot_time_str(fire_at)}, {(datetime.datetime.now() - fire_at).total_seconds():.0f}초 지연): {job.command}")
+                    submit_jobs(supervisor, tenant, [job], fire_at, status_writer, jitter_stats, metrics, event_log,
+                                dependencies)
+                continue
             
-            # 디버깅: 다음 체크 시간 출력
-            print(f"\033[90m[DEBUG] 현재 시간: {datetime.datetime.now().strftime('%H:%M:%S')}\033[0m")
-            print(f"\033[90m[DEBUG] 다음 체크 시간: {next_check_time.strftime('%H:%M:%S')} ({next_check_time.strftime('%H:%M')})\033[0m")
+            # kind == "fire"
+            tenant, generation, fire_at = payload
+            if generation != tenant.fire_generation:
+                continue  # 재조회로 무효화된 타이머
             
-            # 다음에 실행될 명령어 찾기
-            scheduled_commands = get_next_scheduled_command(rows, next_check_time)
+            # 벽시계가 모노토닉 시계보다 늦게 가서 일찍 깨어난 경우 다시 대기
+            early = (fire_at - datetime.datetime.now()).total_seconds()
+            if early > 0:
+                timers.push(time.monotonic() + early, "fire", payload)
+                continue
             
-            # 다음 체크 시간에 예약이 없으면 가장 빠른 다음 예약 찾기
-            earliest_next_time = None
-            earliest_next_commands = None
-            if not scheduled_commands:
-                earliest_next_time, earliest_next_commands = get_earliest_future_command(rows, next_check_time)
+            dispatch_started = time.perf_counter()
+            tenant.last_fired_at = fire_at
+            # 다음 실행 타이머를 먼저 등록한 뒤 이번 슬롯의 작업 실행
+            next_fire_at, next_jobs = schedule_next_fire(timers, tenant, fire_at, False)
             
-            # 카운트다운 시작
-            countdown_sleep(seconds_to_wait, next_check_time, scheduled_commands, earliest_next_time, earliest_next_commands)
+            due_jobs = []
+            busy = supervisor.queue_depth() > 0 or bool(max_jobs and len(supervisor.running()) >= max_jobs)
+            slot_jobs = tenant.table.jobs_due(fire_at)
+            if control.paused:
+                print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ⏸️ 일시 정지 중 - {slot_time_str(fire_at)} 예약 {len(slot_jobs)}건 건너뜀")
+                slot_jobs = []
+            for job in slot_jobs:
+                if coordinator is not None and not journal.has_run(tenant.sheet_name, job, fire_at):
+                    # 이 노드가 1순위가 아니면 순위만큼 기다렸다가 아직 아무도 실행하지 않았을 때만 실행
+                    delay = coordinator.takeover_delay_for(run_key(tenant.sheet_name, job, fire_at), busy)
+                    if delay > 0:
+                        timers.push(time.monotonic() + delay, "takeover", (tenant, job, fire_at))
+                        continue
+                # 중복 실행 방지: 같은 날짜/행/시간 슬롯은 저널에 한 번만 기록되고 한 번만 실행
+                if not claim_run(journal, coordinator, metrics, event_log, tenant.sheet_name, job, fire_at):
+                    continue
+                
+                exec_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{exec_datetime}] ⏰ 시간 매칭: {slot_time_str(fire_at)}" + (f" ({job.time_str})" if job.recurrence else ""))
+                print(f"[{exec_datetime}] 📝 명령 실행: {job.command}")
+                due_jobs.append(job)
+            
+            # 같은 시각의 작업을 모두 동시에 실행 (기동 확인과 결과 기록은 실행기 스레드에서 처리)
+            submit_jobs(supervisor, tenant, due_jobs, fire_at, status_writer, jitter_stats, metrics, event_log, dependencies)
+            metrics.phase_seconds.observe(time.perf_counter() - dispatch_started, phase="dispatch")
+            
+            print_upcoming(next_fire_at, next_jobs, f"[{tenant.sheet_name}] " if multi_tenant else "")
             
         except KeyboardInterrupt:
             print("\n\n스케줄러를 종료합니다.")
+            for tenant in tenants:
+                tenant.launcher.shutdown()
+            supervisor.shutdown()
+            metrics.registry.close()
+            if worker_pool is not None:
+                worker_pool.close()
+            status_writer.close()
+            journal.close()
+            if coordinator is not None:
+                coordinator.close()
+            control.close()
+            if watcher is not None:
+                watcher.close()
+            if snapshot is not None:
+                snapshot.save(snapshot_path)  # 마지막 확인 시각 기록 (다음 시작 때 스냅샷 나이 표시용)
+            profiler.close()
+            event_log.log("스케줄러 종료", event="stop")
+            event_log.close()
             break
         except Exception as e:
             print(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ❌ 오류 발생: {e}")
+            event_log.log(f"오류 발생: {e}", level="error", event="loop_error")
             print("다시 시도합니다...")
-            next_check_time = get_next_check_time(interval_minutes=5)
-            seconds_to_wait = get_seconds_until_next_check(interval_minutes=5)
-            countdown_sleep(seconds_to_wait, next_check_time, [], None, None)
+            # 재조회 도중 오류가 나면 다음 재조회를 다시 등록
+            if not poll_scheduled:
+                timers.push(time.monotonic() + CHECK_INTERVAL, "poll", poll_generation)
+                poll_scheduled = True
+
+def run_simulation(sheet_ids=None, fake_sheet=None, hours=24.0, max_jobs=MAX_CONCURRENT_JOBS, job_timeout=JOB_TIMEOUT,
+                   default_duration=DEFAULT_DURATION, api_budget=API_REQUESTS_PER_MINUTE, start=None, schedule_file=None):
+    """스케줄 스냅샷(또는 가짜 시트 파일/로컬 스케줄 파일)의 스케줄을 가상 시간으로 돌려 보고 보고서 출력 (API 호출/작업 실행 없음)
+
+    작업 실행 시간은 server_log.jsonl의 종료 기록(중앙값)을 쓰고, 기록이 없으면 default_duration초로 가정
+    """
+    if fake_sheet or schedule_file:
+        try:
+            fake_service = FileSheetsService(schedule_file) if schedule_file else FakeSheetsService.from_file(fake_sheet)
+        except ScheduleFileError as e:
+            print(f"❌ {e}")
+            return None
+        names = sheet_ids or [name for name in fake_service.sheets if name not in EXCLUDED_SHEETS]
+        rows_by_sheet = fetch_schedule_rows(fake_service, "simulation", names)
+        tables = {name: compile_schedule(rows) for name, rows in rows_by_sheet.items()}
+        source = schedule_file or fake_sheet
+    else:
+        snapshot = ScheduleSnapshot.load(None, None, SNAPSHOT_PATH)
+        if snapshot is None:
+            print("❌ 스케줄 스냅샷이 없습니다. 스케줄러를 한 번 실행해서 시트를 조회하거나 --fake-sheet를 지정하세요.")
+            return None
+        tables = {name: table for name, (_, table) in snapshot.sheets.items() if not sheet_ids or name in sheet_ids}
+        source = f"스케줄 스냅샷 ({format_age(snapshot.age())} 전 확인)"
+    durations = durations_from_log(LOG_PATH)
+    print(f"📂 {source}: 시트 {len(tables)}개, 예약 {sum(len(table) for table in tables.values())}건 "
+          f"(실행 기록이 있는 작업 {len(durations)}건, 나머지는 {default_duration:g}초 실행으로 가정)")
+    if start is None:
+        start = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    report = simulate(tables, start, hours, max_concurrency=max_jobs or None, durations=durations,
+                      default_duration=default_duration, job_timeout=job_timeout or None,
+                      min_interval=MIN_CHECK_INTERVAL, max_interval=CHECK_INTERVAL,
+                      flush_interval=LOG_FLUSH_INTERVAL, probe_delay=STARTUP_PROBE_DELAY, api_budget=api_budget)
+    for line in report.format():
+        print(line)
+    return report
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="구글 시트 예약 명령 스케줄러")
+    parser.add_argument("--ids", help="쉼표로 구분한 시트(ID) 목록 - 한 프로세스에서 여러 시트를 스케줄링 (기본: ID.txt)")
+    parser.add_argument("--all", action="store_true", dest="all_sheets",
+                        help=f"{', '.join(EXCLUDED_SHEETS)} 시트를 제외한 모든 시트를 스케줄링")
+    parser.add_argument("--misfire", choices=MISFIRE_POLICIES, default=MISFIRE_SKIP,
+                        help="시작 시 꺼져 있던 동안 놓친 실행 처리 방식 (기본: skip)")
+    parser.add_argument("--misfire-grace", type=int, default=MISFIRE_GRACE,
+                        help=f"놓친 실행을 처리할 유예 시간 (초, 기본: {MISFIRE_GRACE})")
+    parser.add_argument("--fake-sheet", metavar="PATH",
+                        help="Google Sheets 대신 JSON 파일 기반 가짜 시트 사용 (테스트/벤치마크용)")
+    parser.add_argument("--schedule-file", metavar="PATH",
+                        help="Google Sheets 대신 로컬 CSV/JSON 파일에서 스케줄 읽기 (인증/네트워크 불필요, 저장하면 바로 반영, "
+                             "실행 로그는 PATH.status.json에 기록, --ids가 없으면 파일의 모든 시트)")
+    parser.add_argument("--max-jobs", type=int, default=MAX_CONCURRENT_JOBS,
+                        help="동시에 실행할 최대 작업 수 - 넘으면 대기열에서 기다림 (기본: 0 = 제한 없음, 같은 시각 작업은 모두 바로 실행)")
+    parser.add_argument("--job-timeout", type=int, default=JOB_TIMEOUT,
+                        help="작업 최대 실행 시간 (초, 넘으면 종료, 기본: 0 = 제한 없음)")
+    parser.add_argument("--python-pool", type=int, default=PYTHON_POOL_SIZE,
+                        help="'python x.py' 작업을 미리 띄워 둔 파이썬 워커에서 실행 (워커 수, 기본: 0 = 사용 안 함) - "
+                             "워커는 창 없이(CREATE_NO_WINDOW) 실행되고 입력/출력은 버려지므로 input()이나 콘솔 창이 필요한 "
+                             "스크립트는 'python -u x.py'처럼 적어서 일반 실행으로 돌릴 것")
+    parser.add_argument("--worker-max-runs", type=int, default=WORKER_MAX_RUNS,
+                        help=f"파이썬 워커 하나가 이 횟수만큼 실행하면 새 워커로 교체 (기본: {WORKER_MAX_RUNS})")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help=f"지표를 Prometheus 텍스트 파일로 저장 ({METRICS_FILE_INTERVAL}초마다 갱신, node_exporter textfile용)")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                        help="지표를 http://127.0.0.1:포트/metrics 로 제공 (기본: 0 = 사용 안 함)")
+    parser.add_argument("--headless", action="store_true", default=None,
+                        help="남은 시간 표시 생략 (지정하지 않아도 출력이 파일로 리디렉션되면 자동으로 생략)")
+    parser.add_argument("--api-budget", type=int, default=API_REQUESTS_PER_MINUTE,
+                        help=f"분당 API 요청 한도 - 같은 계정으로 스케줄러 여러 개를 돌리면 나눠서 지정 (기본: {API_REQUESTS_PER_MINUTE}, 0 = 제한 없음)")
+    parser.add_argument("--capture-output", action="store_true",
+                        help="작업 출력(stdout/stderr)을 job_logs 폴더에 작업별로 기록하고 종료 시 마지막 출력을 H열에 덧붙임 (--python-pool과 함께 쓰면 워커 풀은 사용 안 함)")
+    parser.add_argument("--cluster", metavar="STORE",
+                        help="클러스터 모드: 여러 PC가 같은 시트들(--all 또는 같은 --ids)을 나눠서 실행 - 모든 노드가 공유하는 리스 저장소 (.db 파일 또는 폴더)")
+    parser.add_argument("--node-id", help="클러스터 모드에서 이 노드 이름 (기본: PC 이름)")
+    parser.add_argument("--simulate", type=float, nargs="?", const=24.0, metavar="HOURS",
+                        help="실제 실행 없이 오늘 0시부터 HOURS시간(기본 24) 동안의 실행을 가상 시간으로 계산해서 "
+                             "분당 실행 몰림/최대 동시 실행/겹침/예상 API 호출 수 보고 (스냅샷, --fake-sheet 또는 --schedule-file 사용)")
+    parser.add_argument("--sim-duration", type=float, default=DEFAULT_DURATION,
+                        help=f"시뮬레이션에서 실행 기록이 없는 작업의 실행 시간 (초, 기본: {DEFAULT_DURATION:g})")
+    parser.add_argument("--control-port", type=int, default=CONTROL_PORT,
+                        help="상태 조회/즉시 재조회/수동 실행/일시 정지용 로컬 HTTP 포트 (기본: 0 = 사용 안 함)")
+    parser.add_argument("--control", nargs="+", metavar="COMMAND",
+                        help="실행 중인 스케줄러에 명령 보내기 (--control-port로 같은 포트 지정): "
+                             "status, reload, pause, resume, run 행번호 [시트], profile [틱 수], memory [초|0]")
+    parser.add_argument("--profile-ticks", type=int, default=0, metavar="N",
+                        help=f"시작 직후 N틱(타이머 처리 N번)을 cProfile로 기록해서 profiles 폴더에 저장 "
+                             f"(실행 중에는 kill -USR1, --control profile, profile_request.txt로 요청, 기본 {PROFILE_TICKS}틱)")
+    parser.add_argument("--trace-memory", type=float, default=0, metavar="SECONDS",
+                        help=f"tracemalloc으로 SECONDS초마다 메모리 스냅샷을 비교해서 profiles 폴더에 저장 "
+                             f"(실행 중에는 kill -USR2, --control memory, profile_request.txt로 요청, 기본 {TRACEMALLOC_INTERVAL}초)")
+    args = parser.parse_args()
+    
+    if args.control:
+        if not args.control_port:
+            print("❌ --control-port로 스케줄러의 제어 포트를 지정하세요.")
+            sys.exit(1)
+        command, control_args = args.control[0], {}
+        if command == "run":
+            if len(args.control) < 2:
+                print("❌ 사용법: --control run 행번호 [시트]")
+                sys.exit(1)
+            control_args['row'] = args.control[1]
+            if len(args.control) > 2:
+                control_args['sheet'] = args.control[2]
+        elif command in ("profile", "memory") and len(args.control) > 1:
+            control_args['ticks' if command == "profile" else 'interval'] = args.control[1]
+        try:
+            status, reply = send_control(args.control_port, command, control_args)
+        except OSError as e:
+            print(f"❌ 스케줄러에 연결할 수 없습니다 (포트 {args.control_port}): {e}")
+            sys.exit(1)
+        print(json.dumps(reply, ensure_ascii=False, indent=2))
+        sys.exit(0 if status < 400 else 1)
+    
+    if args.schedule_file and args.fake_sheet:
+        print("❌ --schedule-file과 --fake-sheet는 함께 쓸 수 없습니다.")
+        sys.exit(1)
+    sheet_ids = [name.strip() for name in args.ids.split(",") if name.strip()] if args.ids else None
+    if args.simulate is not None:
+        run_simulation(sheet_ids=sheet_ids, fake_sheet=args.fake_sheet, hours=args.simulate, max_jobs=args.max_jobs,
+                       job_timeout=args.job_timeout, default_duration=args.sim_duration, api_budget=args.api_budget,
+                       schedule_file=args.schedule_file)
+        sys.exit(0)
+    if args.all_sheets:
+        title = "전체 시트"
+    elif sheet_ids:
+        title = ", ".join(sheet_ids)
+    elif args.schedule_file:
+        title = os.path.basename(args.schedule_file)
+    else:
+        title = read_id_file()
+        sheet_ids = [title]
+    
     print("=" * 50)
-    print(f"⏱️  {ID} 스케줄러 시작")
+    print(f"⏱️  {title} 스케줄러 시작")
     print("=" * 50)
-    run_scheduler()
+    service_factory = None
+    if args.fake_sheet:
+        # 가짜 백엔드는 스레드 안전하므로 같은 객체를 공유
+        fake_service = FakeSheetsService.from_file(args.fake_sheet)
+        service_factory = lambda: fake_service
+    
+    run_scheduler(sheet_ids=sheet_ids, all_sheets=args.all_sheets,
+                  misfire_policy=args.misfire, misfire_grace=args.misfire_grace,
+                  service_factory=service_factory, max_jobs=args.max_jobs, job_timeout=args.job_timeout,
+                  python_pool_size=args.python_pool, worker_max_runs=args.worker_max_runs,
+                  metrics_file=args.metrics_file, metrics_port=args.metrics_port, api_budget=args.api_budget,
+                  headless=args.headless, capture_output=args.capture_output,
+                  cluster_store=args.cluster, node_id=args.node_id, control_port=args.control_port,
+                  profile_ticks=args.profile_ticks, trace_memory=args.trace_memory, schedule_file=args.schedule_file)
@@ -0,0 +1,266 @@
+import collections
+import json
+import os
+import random
+import re
+import threading
+import time
+
+# A1 표기 범위: 'Sheet Name'!A1:B2, Sheet!A:B, Sheet!H2:H, Sheet!H5 등
+_A1_RE = re.compile(r"^(?:(?P<sheet>'(?:[^']|'')+'|[^!]+)!)?(?P<c0>[A-Z]+)?(?P<r0>\d+)?(?::(?P<c1>[A-Z]+)?(?P<r1>\d+)?)?$")
+
+
+HTTP_TIMEOUT = 60  # API 요청 하나의 최대 대기 시간 (초) - 기본값은 무제한이라 연결이 멈추면 루프가 멈춤
+# googleapiclient 1.x처럼 디스커버리 문서를 내장하지 않은 버전용 로컬 사본 (있을 때만 사용)
+DISCOVERY_DOCUMENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "discovery", "sheets.v4.json")
+
+
+def build_sheets_service(credentials):
+    """실제 Google Sheets API 서비스 객체 생성
+
+    - 디스커버리 문서는 네트워크로 받지 않고 라이브러리에 내장된 사본(static_discovery)을 사용
+    - 서비스 객체마다 httplib2.Http 하나를 만들어 keep-alive 연결을 계속 재사용
+      (httplib2는 스레드 안전하지 않으므로 스레드마다 이 함수로 따로 생성)
+    """
+    # 무거운 import는 실제 API를 쓸 때만 (가짜 백엔드/--help 등은 불러오지 않음)
+    from googleapiclient.discovery import build, build_from_document
+    try:
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        kwargs = {'http': AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))}
+    except ImportError:
+        kwargs = {'credentials': credentials}
+    try:
+        return build('sheets', 'v4', cache_discovery=False, static_discovery=True, **kwargs)
+    except TypeError:
+        # static_discovery 인자가 없는 구버전: 로컬 사본이 있으면 사용, 없으면 기존처럼 네트워크 조회
+        if os.path.exists(DISCOVERY_DOCUMENT_PATH):
+            with open(DISCOVERY_DOCUMENT_PATH, "r", encoding="utf-8") as f:
+                return build_from_document(f.read(), **kwargs)
+        return build('sheets', 'v4', cache_discovery=False, **kwargs)
+
+
+def column_index(letters):
+    """열 문자(A, B, ..., AA)를 0부터 시작하는 인덱스로 변환"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+def parse_a1_range(a1_range):
+    """A1 범위를 (시트이름, 시작열, 시작행, 끝열, 끝행)으로 변환 (행/열은 0부터, 열린 끝은 None)"""
+    match = _A1_RE.match(a1_range.strip())
+    if not match:
+        raise ValueError(f"잘못된 범위: {a1_range}")
+    sheet = match.group('sheet')
+    if sheet and sheet.startswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    c0, r0, c1, r1 = match.group('c0', 'r0', 'c1', 'r1')
+    col_start = column_index(c0) if c0 else 0
+    row_start = int(r0) - 1 if r0 else 0
+    if ':' in a1_range:
+        col_end = column_index(c1) if c1 else None
+        row_end = int(r1) - 1 if r1 else None
+    else:
+        # 단일 셀 또는 단일 열/행
+        col_end = col_start if c0 else None
+        row_end = row_start if r0 else None
+    return sheet, col_start, row_start, col_end, row_end
+
+
+class FakeHttpError(Exception):
+    """googleapiclient.errors.HttpError처럼 resp.status를 가진 가짜 API 오류 (429/5xx 주입용)"""
+
+    class _Resp:
+        def __init__(self, status):
+            self.status = status
+
+    def __init__(self, status, message=""):
+        super().__init__(f"<FakeHttpError {status}: {message}>")
+        self.resp = self._Resp(status)
+        self.status_code = status
+
+
+class _Request:
+    """execute() 시점에 지연/오류를 주입하고 실제 동작을 실행하는 요청 객체"""
+
+    def __init__(self, service, method, func):
+        self._service = service
+        self._method = method
+        self._func = func
+
+    def execute(self, num_retries=0):
+        return self._service._execute(self._method, self._func)
+
+
+class _ValuesResource:
+    def __init__(self, service):
+        self._service = service
+
+    def get(self, spreadsheetId, range, **kwargs):
+        return _Request(self._service, "values.get", lambda: self._service._read(range))
+
+    def batchGet(self, spreadsheetId, ranges, **kwargs):
+        return _Request(self._service, "values.batchGet", lambda: {
+            'spreadsheetId': spreadsheetId,
+            'valueRanges': [self._service._read(r) for r in ranges],
+        })
+
+    def update(self, spreadsheetId, range, body, valueInputOption=None, **kwargs):
+        return _Request(self._service, "values.update",
+                        lambda: self._service._write(range, body.get('values', [])))
+
+    def batchUpdate(self, spreadsheetId, body):
+        def run():
+            responses = [self._service._write(d['range'], d.get('values', [])) for d in body.get('data', [])]
+            return {'spreadsheetId': spreadsheetId, 'responses': responses}
+        return _Request(self._service, "values.batchUpdate", run)
+
+    def clear(self, spreadsheetId, range, body=None):
+        return _Request(self._service, "values.clear", lambda: self._service._clear(range))
+
+    def batchClear(self, spreadsheetId, body):
+        return _Request(self._service, "values.batchClear", lambda: {
+            'spreadsheetId': spreadsheetId,
+            'clearedRanges': [self._service._clear(r)['clearedRange'] for r in body.get('ranges', [])],
+        })
+
+
+class _SpreadsheetsResource:
+    def __init__(self, service):
+        self._service = service
+
+    def get(self, spreadsheetId, fields=None, **kwargs):
+        def run():
+            with self._service._lock:
+                return {'sheets': [
+                    {'properties': {'sheetId': gid, 'title': title}}
+                    for gid, title in enumerate(self._service.sheets)
+                ]}
+        return _Request(self._service, "spreadsheets.get", run)
+
+    def values(self):
+        return _ValuesResource(self._service)
+
+
+class FakeSheetsService:
+    """googleapiclient 서비스 객체를 흉내 내는 프로세스 내 가짜 시트 백엔드
+
+    - spreadsheets().get / values().get/update/batchGet/batchUpdate/clear/batchClear 지원
+    - latency: execute() 한 번마다 추가되는 지연 (초)
+    - error_rate: execute() 가 FakeHttpError(error_status)를 낼 확률 (seed로 재현 가능)
+    - fail_next(n): 다음 n번 호출을 무조건 실패시킴
+    - path를 주면 JSON 파일({"시트이름": [[...], ...]})에서 읽고 쓰기마다 저장
+    - calls: 메서드별 호출 횟수
+    """
+
+    def __init__(self, sheets=None, latency=0.0, error_rate=0.0, error_status=429, seed=None, path=None):
+        self.sheets = collections.OrderedDict((name, [list(row) for row in rows]) for name, rows in (sheets or {}).items())
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.path = path
+        self.calls = collections.Counter()
+        self._forced_failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """JSON 파일 기반 가짜 백엔드 생성 (파일이 없으면 빈 스프레드시트)"""
+        sheets = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                sheets = json.load(f)
+        return cls(sheets, path=path, **kwargs)
+
+    def spreadsheets(self):
+        return _SpreadsheetsResource(self)
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def fail_next(self, count=1, status=None):
+        """다음 count번의 execute()를 실패시킴"""
+        self._forced_failures += count
+        if status is not None:
+            self.error_status = status
+
+    def _execute(self, method, func):
+        with self._lock:
+            self.calls[method] += 1
+            fail = self._forced_failures > 0 or (self.error_rate and self._random.random() < self.error_rate)
+            if self._forced_failures > 0:
+                self._forced_failures -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise FakeHttpError(self.error_status, f"{method} 실패 (주입된 오류)")
+        return func()
+
+    def _grid(self, sheet):
+        if sheet is None:
+            sheet = next(iter(self.sheets), None)
+        if sheet not in self.sheets:
+            raise FakeHttpError(400, f"Unable to parse range: {sheet}")
+        return sheet, self.sheets[sheet]
+
+    def _read(self, a1_range):
+        sheet, col0, row0, col1, row1 = parse_a1_range(a1_range)
+        with self._lock:
+            name, grid = self._grid(sheet)
+            last_row = len(grid) - 1 if row1 is None else min(row1, len(grid) - 1)
+            values = []
+            for row in grid[row0:last_row + 1]:
+                cells = row[col0:] if col1 is None else row[col0:col1 + 1]
+                # 실제 API처럼 행 끝의 빈 셀은 잘라냄
+                while cells and cells[-1] == "":
+                    cells = cells[:-1]
+                values.append(list(cells))
+        # 끝의 빈 행도 잘라냄
+        while values and not values[-1]:
+            values.pop()
+        result = {'range': a1_range, 'majorDimension': 'ROWS'}
+        if values:
+            result['values'] = values
+        return result
+
+    def _write(self, a1_range, values):
+        sheet, col0, row0, _, _ = parse_a1_range(a1_range)
+        with self._lock:
+            name, grid = self._grid(sheet)
+            for r, row_values in enumerate(values):
+                row_index = row0 + r
+                while len(grid) <= row_index:
+                    grid.append([])
+                row = grid[row_index]
+                for c, value in enumerate(row_values):
+                    col_index = col0 + c
+                    while len(row) <= col_index:
+                        row.append("")
+                    row[col_index] = "" if value is None else str(value)
+            self._save()
+        return {'updatedRange': a1_range, 'updatedRows': len(values)}
+
+    def _clear(self, a1_range):
+        sheet, col0, row0, col1, row1 = parse_a1_range(a1_range)
+        with self._lock:
+            name, grid = self._grid(sheet)
+            last_row = len(grid) - 1 if row1 is None else min(row1, len(grid) - 1)
+            for row in grid[row0:last_row + 1]:
+                end = len(row) - 1 if col1 is None else min(col1, len(row) - 1)
+                for c in range(col0, end + 1):
+                    row[c] = ""
+            self._save()
+        return {'clearedRange': a1_range}
+
+    def _save(self):
+        """파일 기반이면 현재 내용을 저장 (호출하는 쪽에서 lock 보유)"""
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.sheets, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,118 @@
+import json
+import os
+import time
+
+# 시트 이름/ID만 받아오도록 제한하는 필드 마스크 (격자 속성, 서식 등은 받지 않음)
+METADATA_FIELDS = "sheets.properties(sheetId,title)"
+
+DEFAULT_TTL = 600  # 메타데이터 캐시 유지 시간 (초)
+METADATA_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheet_metadata_cache.json")
+
+
+class SheetMetadataCache:
+    """스프레드시트의 시트 이름 <-> gid 매핑 캐시
+
+    - spreadsheets().get()은 METADATA_FIELDS 필드 마스크로만 호출
+    - ttl초 동안 메모리(및 cache_path 파일)에 보관해서 재사용
+    - 찾는 이름/gid가 캐시에 없으면 시트가 새로 생겼을 수 있으므로 한 번 다시 조회
+    """
+
+    def __init__(self, service, spreadsheet_id, ttl=DEFAULT_TTL, cache_path=None):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self._sheets = None   # [(gid, 시트이름), ...] 시트 순서대로
+        self._fetched_at = 0.0  # time.time() 기준 조회 시각
+
+    def _expired(self):
+        return self._sheets is None or time.time() - self._fetched_at > self.ttl
+
+    def _load_file(self):
+        """파일 캐시가 유효하면 읽어오기"""
+        if not self.cache_path:
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get('spreadsheet_id') != self.spreadsheet_id:
+                return False
+            if time.time() - cached.get('fetched_at', 0) > self.ttl:
+                return False
+            self._sheets = [(str(gid), title) for gid, title in cached.get('sheets', [])]
+            self._fetched_at = cached['fetched_at']
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+    def _save_file(self):
+        """조회 결과를 파일 캐시에 저장 (실패해도 무시)"""
+        if not self.cache_path:
+            return
+        try:
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    'spreadsheet_id': self.spreadsheet_id,
+                    'fetched_at': self._fetched_at,
+                    'sheets': self._sheets,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def refresh(self):
+        """필드 마스크를 적용해서 시트 목록을 다시 조회"""
+        spreadsheet = self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            fields=METADATA_FIELDS
+        ).execute()
+        self._sheets = [
+            (str(sheet['properties']['sheetId']), sheet['properties']['title'])
+            for sheet in spreadsheet.get('sheets', [])
+        ]
+        self._fetched_at = time.time()
+        self._save_file()
+        return self._sheets
+
+    def invalidate(self):
+        """캐시 무효화 (다음 조회 시 API 재호출)"""
+        self._sheets = None
+        self._fetched_at = 0.0
+        if self.cache_path:
+            try:
+                os.remove(self.cache_path)
+            except OSError:
+                pass
+
+    def sheets(self):
+        """(gid, 시트이름) 리스트 (캐시가 만료됐으면 다시 조회)"""
+        if self._expired() and not self._load_file():
+            self.refresh()
+        return self._sheets
+
+    def titles(self):
+        """시트 이름 리스트 (시트 순서대로)"""
+        return [title for _, title in self.sheets()]
+
+    def has_title(self, title):
+        """시트 이름이 있는지 확인 (캐시에 없으면 한 번 다시 조회)"""
+        if title in self.titles():
+            return True
+        self.refresh()
+        return title in self.titles()
+
+    def _find_gid(self, gid):
+        for sheet_gid, title in self.sheets():
+            if sheet_gid == gid:
+                return title
+        return None
+
+    def title_for_gid(self, gid):
+        """gid로 시트 이름 찾기 (캐시에 없으면 한 번 다시 조회, 그래도 없으면 None)"""
+        gid = str(gid)
+        title = self._find_gid(gid)
+        if title is None:
+            self.refresh()
+            title = self._find_gid(gid)
+        return title
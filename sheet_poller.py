@@ -0,0 +1,139 @@
+import hashlib
+import json
+import threading
+import time
+
+# 스케줄에 필요한 열만 조회 (범위, 시작 열 인덱스)
+# H열(실행 로그)은 스케줄러가 직접 기록하므로 조회하지 않음 -> 로그 기록이 변경으로 감지되지 않음
+SCHEDULE_RANGES = (
+    ("A:B", 0),  # A열 - 시간, B열 - 작업이름
+    ("E:F", 4),  # E열 - 명령어, F열 - 선행 작업
+)
+
+
+def sheet_range(sheet_name, cells):
+    """시트 이름을 작은따옴표로 감싸서 A1 범위 만들기 (공백/특수문자가 있는 탭 이름도 안전, 따옴표는 두 번 씀)
+
+    sheet_range("일정 1", "H2:H") -> "'일정 1'!H2:H"
+    """
+    quoted = sheet_name.replace("'", "''")
+    return f"'{quoted}'!{cells}"
+
+
+def schedule_ranges(sheet_name):
+    """시트 이름에 스케줄 열 범위를 붙여서 batchGet용 범위 리스트 생성"""
+    return [sheet_range(sheet_name, column_range) for column_range, _ in SCHEDULE_RANGES]
+
+
+def merge_column_ranges(value_ranges):
+    """batchGet으로 받은 열 묶음들을 A열부터 시작하는 행 리스트로 합치기
+
+    compile_schedule()이 그대로 쓸 수 있도록 빠진 열(C, D 등)은 빈 문자열로 채움
+    """
+    columns = [vr.get('values', []) for vr in value_ranges]
+    row_count = max((len(values) for values in columns), default=0)
+    rows = []
+    for i in range(row_count):
+        row = []
+        for (_, start_index), values in zip(SCHEDULE_RANGES, columns):
+            cells = values[i] if i < len(values) else []
+            if not cells:
+                continue
+            if len(row) < start_index:
+                row.extend([""] * (start_index - len(row)))
+            row[start_index:start_index + len(cells)] = cells
+        rows.append(row)
+    return rows
+
+
+def fetch_schedule_rows(service, spreadsheet_id, sheet_names):
+    """여러 시트의 스케줄 열을 batchGet 한 번으로 가져와서 {시트이름: 행 리스트}로 반환
+
+    API 오류는 호출한 쪽에서 처리하도록 그대로 전달
+    """
+    ranges = []
+    for sheet_name in sheet_names:
+        ranges.extend(schedule_ranges(sheet_name))  # H열(로그)은 제외
+    result = service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=ranges
+    ).execute()
+
+    # 응답은 요청한 범위 순서대로 오므로 시트마다 SCHEDULE_RANGES 개수씩 나눔
+    value_ranges = result.get('valueRanges', [])
+    step = len(SCHEDULE_RANGES)
+    return {
+        sheet_name: merge_column_ranges(value_ranges[i * step:(i + 1) * step])
+        for i, sheet_name in enumerate(sheet_names)
+    }
+
+
+def fingerprint_rows(rows):
+    """행 리스트의 내용 지문(해시) 계산"""
+    payload = json.dumps(rows, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class SheetPoller:
+    """시트 변경 감지와 적응형 조회 주기 관리
+
+    - 조회한 내용의 지문이 직전과 같으면 재컴파일을 건너뛰도록 알려줌
+    - 변경이 없으면 조회 주기를 backoff배씩 늘리고(최대 max_interval),
+      변경이 감지되면 min_interval로 다시 줄임
+    """
+
+    def __init__(self, min_interval, max_interval, backoff=2.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.last_fingerprint = None
+
+    def observe(self, rows):
+        """새로 조회한 행을 반영하고 변경 여부 반환"""
+        digest = fingerprint_rows(rows)
+        changed = digest != self.last_fingerprint
+        self.last_fingerprint = digest
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return changed
+
+
+class BackgroundFetcher:
+    """시트 조회를 백그라운드 스레드에서 실행하고 끝나면 on_done(결과, 소요 시간(초)) 호출
+
+    - API 재시도 백오프, 분당 요청 한도 대기, HTTP 시간 초과가 스케줄러 루프(예약 실행)를 막지 않도록 조회만 분리
+    - 한 번에 하나만 실행 (서비스 객체는 여러 스레드에서 동시에 쓰면 안전하지 않음)
+    - fetch()가 예외를 내면 빈 결과({})로 알림 (루프는 직전 스케줄로 계속 실행)
+    """
+
+    def __init__(self, fetch, on_done):
+        self.fetch = fetch
+        self.on_done = on_done
+        self._busy = threading.Event()
+
+    @property
+    def busy(self):
+        """조회가 진행 중인지 여부"""
+        return self._busy.is_set()
+
+    def start(self):
+        """조회 시작 (이미 진행 중이면 False)"""
+        if self._busy.is_set():
+            return False
+        self._busy.set()
+        threading.Thread(target=self._run, name="sheet-fetch", daemon=True).start()
+        return True
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            result = self.fetch()
+        except Exception as e:
+            print(f"\033[90m[DEBUG] 시트 조회 중 오류: {e}\033[0m")
+            result = {}
+        finally:
+            self._busy.clear()
+        self.on_done(result, time.perf_counter() - started)
@@ -0,0 +1,209 @@
+import collections
+import json
+import random
+import threading
+import time
+
+# 재시도할 HTTP 상태 코드 (할당량 초과, 서버 오류)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+# Sheets API 기본 할당량은 사용자(서비스 계정)당 분당 60회 -> 여러 프로세스가 같은 계정을 쓰면 나눠서 설정
+DEFAULT_REQUESTS_PER_MINUTE = 60
+# 같은 요청이 동시에 진행 중이면 결과를 함께 받는 읽기 메서드
+COALESCED_METHODS = ("get", "batchGet")
+
+
+def http_status(error):
+    """API 오류의 HTTP 상태 코드 (HttpError.resp.status 또는 status_code, 없으면 None)"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is None:
+        status = getattr(error, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    """다시 시도하면 성공할 수 있는 오류인지 (429/5xx, 연결 끊김/시간 초과)"""
+    status = http_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    if isinstance(error, OSError):
+        return True
+    # httplib2 연결 오류 (ServerNotFoundError 등)는 OSError를 상속하지 않음
+    return any(cls.__name__ == 'HttpLib2Error' for cls in type(error).__mro__)
+
+
+def retry_after(error):
+    """응답의 Retry-After 헤더 값 (초, 없으면 None)"""
+    resp = getattr(error, 'resp', None)
+    try:
+        value = resp.get('retry-after') if hasattr(resp, 'get') else None
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestBudget:
+    """최근 60초 동안의 요청 수를 per_minute 이하로 유지 (넘으면 자리가 날 때까지 대기)"""
+
+    def __init__(self, per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+        self.per_minute = per_minute
+        self.throttled_seconds = 0.0  # 할당량 때문에 기다린 누적 시간
+        self._calls = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """요청 한 번 분량을 예약하고 기다린 시간(초) 반환"""
+        if not self.per_minute:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= 60:
+                    self._calls.popleft()
+                if len(self._calls) < self.per_minute:
+                    self._calls.append(now)
+                    self.throttled_seconds += waited
+                    return waited
+                wait = 60 - (now - self._calls[0])
+            time.sleep(wait)
+            waited += wait
+
+    def used(self):
+        """최근 60초 동안 사용한 요청 수"""
+        with self._lock:
+            now = time.monotonic()
+            return sum(1 for called in self._calls if now - called < 60)
+
+
+class _Flight:
+    """진행 중인 읽기 요청 하나 (같은 요청을 기다리는 스레드들이 결과를 공유)"""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SheetsClient:
+    """Sheets API 호출 공통 정책 (스케줄러와 전일기록삭제.py가 같이 사용)
+
+    - 429/5xx, 연결 오류는 지수 백오프 + 지터(full jitter)로 max_retries회까지 재시도
+      (Retry-After 헤더가 있으면 그 시간 이상 대기)
+    - RequestBudget으로 분당 요청 수를 제한해서 할당량 초과 자체를 피함
+    - 같은 인자의 읽기 요청(get/batchGet)이 동시에 진행 중이면 API를 한 번만 호출하고 결과 공유
+    - wrap(service)로 감싼 서비스 객체는 기존 호출 코드(service.spreadsheets()...execute())를 그대로 사용
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, max_retries=5,
+                 base_delay=1.0, max_delay=64.0, seed=None):
+        self.budget = RequestBudget(requests_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0      # 재시도 누적 횟수
+        self.coalesced = 0    # 다른 요청의 결과를 공유받은 횟수
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def wrap(self, service):
+        """서비스 객체를 감싸서 모든 execute()에 이 정책을 적용"""
+        return _ClientResource(service, self, "")
+
+    def backoff_delay(self, attempt, error=None):
+        """attempt번째 재시도 전 대기 시간 (0 ~ base_delay * 2^attempt 사이 무작위, Retry-After 우선)"""
+        delay = self._random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        hinted = retry_after(error) if error is not None else None
+        if hinted is not None:
+            delay = max(delay, min(hinted, self.max_delay))
+        return delay
+
+    def execute(self, method, request, args, kwargs, coalesce_key=None):
+        """요청 실행 (coalesce_key가 있으면 같은 키의 진행 중인 요청과 결과 공유)"""
+        if coalesce_key is None:
+            return self._execute_with_retry(method, request, args, kwargs)
+        with self._lock:
+            flight = self._flights.get(coalesce_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[coalesce_key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = self._execute_with_retry(method, request, args, kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[coalesce_key]
+            flight.done.set()
+
+    def _execute_with_retry(self, method, request, args, kwargs):
+        attempt = 0
+        while True:
+            self.budget.acquire()
+            try:
+                return request.execute(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                status = http_status(e)
+                print(f"\033[90m[DEBUG] API {method} 실패 ({status or type(e).__name__}), "
+                      f"{delay:.1f}초 후 재시도 ({attempt}/{self.max_retries})\033[0m")
+                time.sleep(delay)
+
+
+class _ClientRequest:
+    """execute()를 SheetsClient 정책으로 실행하는 요청 래퍼"""
+
+    def __init__(self, client, request, method, coalesce_key):
+        self._client = client
+        self._request = request
+        self._method = method
+        self._coalesce_key = coalesce_key
+
+    def execute(self, *args, **kwargs):
+        return self._client.execute(self._method, self._request, args, kwargs, self._coalesce_key)
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+
+class _ClientResource:
+    """service.spreadsheets().values() 등의 호출 경로를 따라가며 요청을 감싸는 프록시"""
+
+    def __init__(self, target, client, path):
+        self._target = target
+        self._client = client
+        self._path = path
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        method = f"{self._path}.{name}" if self._path else name
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                coalesce_key = None
+                if name in COALESCED_METHODS:
+                    coalesce_key = (method, json.dumps([args, kwargs], sort_keys=True, default=str))
+                return _ClientRequest(self._client, result, method, coalesce_key)
+            return _ClientResource(result, self._client, method)
+        return call
@@ -0,0 +1,253 @@
+import collections
+import datetime
+import json
+import statistics
+import time
+
+from job_chain import ChainTracker
+from sheet_poller import SheetPoller
+from timer_queue import TimerQueue
+
+DEFAULT_DURATION = 60.0  # 실행 기록이 없는 작업의 가정 실행 시간 (초)
+REAP_DELAY = 1.0  # 작업이 끝난 뒤 감독기가 회수해서 자리가 나기까지 걸리는 시간 (감독기 확인 주기)
+BURST_TOP = 5  # 보고서에 보여줄 실행이 몰린 분 개수
+
+
+def durations_from_log(path):
+    """server_log.jsonl의 작업 종료 기록에서 (시트, 행)별 실행 시간 중앙값 읽기 (없으면 빈 dict)"""
+    observed = collections.defaultdict(list)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if '"exit"' not in line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('event') == 'exit' and record.get('duration') is not None:
+                    observed[(record.get('sheet'), record.get('row'))].append(float(record['duration']))
+    except OSError:
+        return {}
+    return {key: statistics.median(values) for key, values in observed.items()}
+
+
+class SimulatedRun:
+    """가상 시간에서 실행된 작업 하나"""
+    __slots__ = ("sheet", "job", "scheduled", "started", "finished", "timed_out")
+
+    def __init__(self, sheet, job, scheduled):
+        self.sheet = sheet
+        self.job = job
+        self.scheduled = scheduled  # 예약 시각 (시뮬레이션 시작 기준 초)
+        self.started = None
+        self.finished = None
+        self.timed_out = False
+
+    @property
+    def key(self):
+        return (self.sheet, self.job.row_index)
+
+
+class SimulationReport:
+    """시뮬레이션 결과 (분당 실행 몰림, 최대 동시 실행, 겹침, 예상 API 호출 수)"""
+
+    def __init__(self, start, hours, max_concurrency, api_budget):
+        self.start = start
+        self.hours = hours
+        self.max_concurrency = max_concurrency
+        self.api_budget = api_budget
+        self.launches = 0
+        self.scheduled = 0                 # 예약 시각이 된 실행 수 (건너뛴 것 포함)
+        self.scheduled_by_minute = collections.Counter()  # 예약 분(시작 기준 분 번호) -> 예약된 실행 수
+        self.scheduled_by_second = collections.Counter()
+        self.peak_running = 0
+        self.peak_running_at = None
+        self.peak_queue = 0
+        self.queue_waits = []              # 동시 실행 제한 때문에 기다린 시간 (초)
+        self.collisions = []               # (시각, 시트, 행, 명령어, 이유) - 이전 실행과 겹쳐서 건너뜀
+        self.timeouts = 0
+        self.api_calls = collections.Counter()            # 메서드 -> 호출 수
+        self.api_calls_by_minute = collections.Counter()
+        self.wall_seconds = 0.0            # 시뮬레이션 자체에 걸린 실제 시간
+
+    def at(self, seconds):
+        """시뮬레이션 시작 기준 초를 일시로 변환"""
+        return self.start + datetime.timedelta(seconds=seconds)
+
+    def api_call(self, method, seconds):
+        self.api_calls[method] += 1
+        self.api_calls_by_minute[int(seconds // 60)] += 1
+
+    def format(self):
+        """사람이 읽을 보고서 줄 리스트"""
+        end = self.at(self.hours * 3600)
+        lines = [
+            f"🧪 시뮬레이션: {self.start.strftime('%Y-%m-%d %H:%M:%S')} ~ {end.strftime('%Y-%m-%d %H:%M:%S')} "
+            f"({self.hours:g}시간, 계산 {self.wall_seconds * 1000:.0f}ms)",
+            f"   예약 {self.scheduled}건 중 실행 {self.launches}건, 최대 동시 실행 {self.peak_running}/{self.max_concurrency or '제한 없음'}"
+            + (f" ({self.at(self.peak_running_at).strftime('%m-%d %H:%M:%S')})" if self.peak_running_at is not None else ""),
+        ]
+        if self.queue_waits:
+            lines.append(f"   ⏳ 동시 실행 제한으로 대기: {len(self.queue_waits)}건 "
+                         f"(최대 {max(self.queue_waits):.1f}초, 평균 {statistics.mean(self.queue_waits):.1f}초, "
+                         f"최대 대기열 {self.peak_queue})")
+        if self.timeouts:
+            lines.append(f"   ⏱️ 시간 초과로 종료: {self.timeouts}건")
+        if self.scheduled_by_minute:
+            lines.append(f"   📈 예약이 몰린 분 (같은 초 최대 {max(self.scheduled_by_second.values())}건):")
+            for minute, count in self.scheduled_by_minute.most_common(BURST_TOP):
+                lines.append(f"      {self.at(minute * 60).strftime('%m-%d %H:%M')}  {count}건")
+        if self.collisions:
+            lines.append(f"   ⚠️ 이전 실행과 겹쳐서 건너뜀: {len(self.collisions)}건")
+            for seconds, sheet, row, command, reason in self.collisions[:10]:
+                lines.append(f"      {self.at(seconds).strftime('%m-%d %H:%M:%S')} [{sheet}] {row}행 {command} ({reason})")
+            if len(self.collisions) > 10:
+                lines.append(f"      ... 외 {len(self.collisions) - 10}건")
+        total_calls = sum(self.api_calls.values())
+        peak_calls = max(self.api_calls_by_minute.values(), default=0)
+        methods = ", ".join(f"{method} {count}" for method, count in sorted(self.api_calls.items()))
+        warning = f" ⚠️ 분당 한도 {self.api_budget} 초과" if self.api_budget and peak_calls > self.api_budget else ""
+        lines.append(f"   📡 예상 API 호출: {total_calls}회 ({methods}), 분당 최대 {peak_calls}회{warning}")
+        return lines
+
+    def to_dict(self):
+        """JSON으로 저장할 수 있는 요약"""
+        return {
+            'start': self.start.isoformat(),
+            'hours': self.hours,
+            'scheduled': self.scheduled,
+            'launches': self.launches,
+            'peak_running': self.peak_running,
+            'peak_running_at': None if self.peak_running_at is None else self.at(self.peak_running_at).isoformat(),
+            'peak_queue': self.peak_queue,
+            'queued': len(self.queue_waits),
+            'max_queue_wait': max(self.queue_waits, default=0.0),
+            'timeouts': self.timeouts,
+            'bursts': [[self.at(minute * 60).isoformat(timespec='minutes'), count]
+                       for minute, count in self.scheduled_by_minute.most_common(BURST_TOP)],
+            'collisions': [[self.at(seconds).isoformat(), sheet, row, command, reason]
+                           for seconds, sheet, row, command, reason in self.collisions],
+            'api_calls': dict(self.api_calls),
+            'api_calls_peak_per_minute': max(self.api_calls_by_minute.values(), default=0),
+        }
+
+
+def simulate(tables, start, hours=24.0, max_concurrency=None, max_queue=1000, prevent_overlap=True,
+             durations=None, default_duration=DEFAULT_DURATION, job_timeout=None, min_interval=30,
+             max_interval=300, flush_interval=2.0, probe_delay=0.5, api_budget=None):
+    """컴파일된 스케줄을 가상 시간으로 hours시간 동안 실행해 보고 SimulationReport 반환
+
+    tables: {시트이름: ScheduleTable} - 스케줄러와 같은 next_fire()/jobs_due()로 실행 시각을 찾음
+    durations: {(시트, 행): 실행 시간(초)} - 없는 작업은 default_duration초로 가정
+    F열 후속 작업은 선행 작업이 (시간 초과 없이) 끝나서 회수되는 시각에 예약된 것으로 처리
+    동시 실행 제한/대기열/겹침 건너뛰기는 JobSupervisor와 같은 규칙, 시트 재조회 주기는 SheetPoller를 그대로 사용
+    (시트 내용은 바뀌지 않는다고 가정). 실제 프로세스/API 호출/대기는 없음
+    """
+    wall_started = time.perf_counter()
+    durations = durations or {}
+    report = SimulationReport(start, hours, max_concurrency, api_budget)
+    end = hours * 3600
+    timers = TimerQueue()
+    poller = SheetPoller(min_interval, max_interval)
+
+    def offset(moment):
+        return (moment - start).total_seconds()
+
+    for sheet_name, table in tables.items():
+        fire_at, _ = table.next_fire(start, inclusive=True)
+        if fire_at is not None:
+            timers.push(offset(fire_at), "fire", (sheet_name, fire_at))
+    timers.push(0.0, "poll")
+    report.api_call("get", 0.0)  # 시작 시 시트 목록 조회
+
+    running = set()                    # 실행 중인 SimulatedRun
+    active = collections.Counter()     # (시트, 행) -> 실행 중 수
+    queue = collections.deque()        # 자리를 기다리는 SimulatedRun
+    chains = ChainTracker()
+    log_windows = set()                # H열 로그가 기록될 flush 구간 번호
+
+    def log_write(seconds):
+        window = int(seconds // flush_interval)
+        if window not in log_windows:
+            log_windows.add(window)
+            report.api_call("batchUpdate", window * flush_interval)
+
+    def launch(run, now):
+        active[run.key] += 1
+        run.started = now
+        duration = durations.get(run.key, default_duration)
+        if job_timeout and duration > job_timeout:
+            duration = job_timeout
+            run.timed_out = True
+            report.timeouts += 1
+        run.finished = now + duration
+        running.add(run)
+        report.launches += 1
+        if run.started > run.scheduled:
+            report.queue_waits.append(run.started - run.scheduled)
+        if len(running) > report.peak_running:
+            report.peak_running = len(running)
+            report.peak_running_at = now
+        # 기동 확인 결과 로그 -> 종료 결과 로그 (H열, 모아서 기록)
+        log_write(now + probe_delay)
+        timers.push(run.finished + REAP_DELAY, "exit", run)
+
+    def submit(sheet_name, job, now):
+        run = SimulatedRun(sheet_name, job, now)
+        report.scheduled += 1
+        report.scheduled_by_minute[int(now // 60)] += 1
+        report.scheduled_by_second[int(now)] += 1
+        reason = None
+        if prevent_overlap:
+            if active[run.key]:
+                reason = "이전 실행이 아직 진행 중"
+            elif any(other.key == run.key for other in queue):
+                reason = "이전 실행이 대기 중"
+        if reason is not None:
+            report.collisions.append((now, sheet_name, job.row_index, job.command, reason))
+            log_write(now)
+            return
+        if max_concurrency and len(running) >= max_concurrency:
+            if len(queue) >= max_queue:
+                report.collisions.append((now, sheet_name, job.row_index, job.command, "실행 대기열이 가득 참"))
+                log_write(now)
+                return
+            queue.append(run)
+            report.peak_queue = max(report.peak_queue, len(queue))
+            return
+        launch(run, now)
+
+    while len(timers) and timers.peek_deadline() < end:
+        now, kind, payload = timers.pop()
+
+        if kind == "poll":
+            report.api_call("batchGet", now)
+            poller.observe(())
+            timers.push(now + poller.interval, "poll")
+            continue
+
+        if kind == "exit":
+            run = payload
+            running.discard(run)
+            log_write(now)
+            active[run.key] -= 1
+            while queue and (not max_concurrency or len(running) < max_concurrency):
+                launch(queue.popleft(), now)
+            # 후속 작업은 선행 작업이 회수된 시각에 실행 요청
+            ready, _ = chains.finished(run.sheet, tables[run.sheet], run.job, not run.timed_out, now)
+            for job in ready:
+                submit(run.sheet, job, now)
+            continue
+
+        # kind == "fire"
+        sheet_name, fire_at = payload
+        table = tables[sheet_name]
+        next_fire_at, _ = table.next_fire(fire_at, inclusive=False)
+        if next_fire_at is not None:
+            timers.push(offset(next_fire_at), "fire", (sheet_name, next_fire_at))
+        for job in table.jobs_due(fire_at):
+            submit(sheet_name, job, now)
+
+    report.wall_seconds = time.perf_counter() - wall_started
+    return report
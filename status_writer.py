@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+
+from sheet_poller import sheet_range
+
+LOG_COLUMN = "H"  # 실행 로그를 기록하는 열
+
+
+def write_logs_to_column_h(service, spreadsheet_id, entries):
+    """여러 행의 H열 로그를 values().batchUpdate() 한 번으로 기록
+
+    entries: {(시트이름, 행번호): 로그 메시지}
+    """
+    data = [
+        {'range': sheet_range(sheet_name, f"{LOG_COLUMN}{row_index}"), 'values': [[message]]}
+        for (sheet_name, row_index), message in entries.items()
+    ]
+    service.spreadsheets().values().batchUpdate(
+        spreadsheetId=spreadsheet_id,
+        body={
+            'valueInputOption': 'USER_ENTERED',
+            'data': data,
+        }
+    ).execute()
+
+
+class StatusLogWriter:
+    """H열 실행 로그를 백그라운드에서 모아서 기록하는 작성기 (write-behind)
+
+    - submit()은 큐에 넣기만 하고 바로 반환하므로 작업 실행이 API 호출을 기다리지 않음
+    - flush_interval초 동안 모인 로그를 같은 셀은 마지막 값으로 합쳐 batchUpdate 한 번으로 기록
+    - 429/5xx 재시도와 할당량 대기는 service를 감싼 SheetsClient가 맡으므로, 여기서는 그마저 실패한 일괄 기록만
+      max_retries회(기본 2회)까지 다시 시도 (재시도가 겹쳐 수십 번 호출하지 않도록), 큐는 max_pending개로 제한
+    - googleapiclient 서비스 객체는 스레드 간 공유가 안전하지 않으므로 전용 service를 넘겨받음
+    """
+
+    def __init__(self, service, spreadsheet_id, flush_interval=2.0, max_pending=1000,
+                 max_retries=2, retry_delay=1.0, on_flush=None):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._pending = {}  # (시트이름, 행번호) -> 메시지 (아직 기록되지 않은 로그)
+        self._stop = threading.Event()
+        self._thread = None
+        self.dropped = 0  # 버린 로그 수 (submit()을 부르는 여러 스레드와 기록 스레드가 함께 늘리므로 lock으로 보호)
+        self._dropped_lock = threading.Lock()
+        self.on_flush = on_flush  # 일괄 기록 한 번이 끝날 때마다 on_flush(소요 시간(초))로 알림 (구간별 시간 지표용)
+
+    def start(self):
+        """백그라운드 기록 스레드 시작"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="status-log-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, sheet_name, row_index, message):
+        """로그 기록 요청 (큐가 가득 차면 버리고 False 반환)"""
+        try:
+            self._queue.put_nowait(((sheet_name, row_index), message))
+            return True
+        except queue.Full:
+            self._count_dropped(1)
+            print(f"\033[90m[DEBUG] H열 로그 대기열이 가득 차서 버림 (행 {row_index})\033[0m")
+            return False
+
+    def pending_count(self):
+        """기록 대기 중인 로그 개수"""
+        return self._queue.qsize() + len(self._pending)
+
+    def close(self, timeout=10.0):
+        """남은 로그를 기록하고 스레드 종료"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _drain(self):
+        """큐에 쌓인 로그를 pending에 합치기 (같은 셀은 마지막 값만 유지)"""
+        while True:
+            try:
+                key, message = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._pending[key] = message
+
+    def _flush(self):
+        """pending 로그를 batchUpdate로 기록 (실패 시 백오프 재시도)"""
+        delay = self.retry_delay
+        for attempt in range(1, self.max_retries + 1):
+            self._drain()
+            if not self._pending:
+                return True
+            batch = dict(self._pending)
+            try:
+                write_logs_to_column_h(self.service, self.spreadsheet_id, batch)
+                # 기록하는 동안 같은 셀에 새 값이 들어왔으면 그 값은 남겨둠
+                for key, message in batch.items():
+                    if self._pending.get(key) == message:
+                        del self._pending[key]
+                return True
+            except Exception as e:
+                print(f"\033[90m[DEBUG] H열 로그 일괄 기록 실패 ({attempt}/{self.max_retries}, {len(batch)}건): {e}\033[0m")
+                if attempt == self.max_retries or self._stop.wait(delay):
+                    break
+                delay *= 2
+        if self._stop.is_set():
+            return False
+        # 재시도를 모두 실패하면 버림 (다음 실행 결과가 다시 기록됨)
+        self._count_dropped(len(self._pending))
+        self._pending.clear()
+        return False
+
+    def _count_dropped(self, count):
+        with self._dropped_lock:
+            self.dropped += count
+
+    def _run(self):
+        """백그라운드 루프: 첫 로그가 들어오면 flush_interval만큼 더 모은 뒤 기록"""
+        while not self._stop.is_set():
+            try:
+                key, message = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._pending[key] = message
+            # 같은 시각에 실행된 작업들의 로그를 한 번에 모으기 위해 잠시 대기
+            self._stop.wait(self.flush_interval)
+            flush_started = time.perf_counter()
+            self._flush()
+            if self.on_flush is not None:
+                self.on_flush(time.perf_counter() - flush_started)
+        # 종료 시 남은 로그 기록 (재시도 대기 없이 한 번만 시도)
+        self._drain()
+        if self._pending:
+            try:
+                write_logs_to_column_h(self.service, self.spreadsheet_id, self._pending)
+                self._pending.clear()
+            except Exception as e:
+                print(f"\033[90m[DEBUG] 종료 시 H열 로그 기록 실패 ({len(self._pending)}건): {e}\033[0m")
@@ -0,0 +1,28 @@
+import time
+
+from schedule_table import compile_schedule
+from sheet_backend import FakeSheetsService
+from sheet_poller import fetch_schedule_rows
+
+HEADER = ["시간", "작업이름", "", "", "명령어", "선행 작업"]
+
+
+def sheet_row(time_raw, name, command, after=""):
+    """A/B/E/F열만 채운 시트 한 행"""
+    return [time_raw, name, "", "", command, after]
+
+
+def compile_rows(rows, sheet_name="시트 1"):
+    """행 리스트를 가짜 시트에 넣고 스케줄러와 같은 batchGet 경로로 읽어서 ScheduleTable로 컴파일"""
+    service = FakeSheetsService({sheet_name: [HEADER] + [list(row) for row in rows]})
+    return compile_schedule(fetch_schedule_rows(service, "test", [sheet_name])[sheet_name])
+
+
+def wait_until(predicate, timeout=5.0):
+    """predicate()가 참이 될 때까지 대기 (시간 초과면 False)"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
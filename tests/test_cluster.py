@@ -0,0 +1,114 @@
+import datetime
+import time
+
+import pytest
+
+from cluster import ClusterCoordinator, FileLeaseStore, SQLiteLeaseStore, open_lease_store, run_key
+from helpers import compile_rows, sheet_row
+
+SLOT = datetime.datetime(2026, 10, 2, 9, 0)
+
+
+@pytest.fixture(params=["sqlite", "file"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        lease_store = SQLiteLeaseStore(str(tmp_path / "leases.db"))
+    else:
+        lease_store = FileLeaseStore(str(tmp_path / "leases"))
+    yield lease_store
+    lease_store.close()
+
+
+def make_node(store, node_id, **kwargs):
+    options = dict(heartbeat_interval=60, takeover_delay=5)
+    options.update(kwargs)
+    node = ClusterCoordinator(store, node_id, **options)
+    node.heartbeat()
+    return node
+
+
+def test_open_lease_store_picks_backend_by_extension(tmp_path):
+    sqlite_store = open_lease_store(str(tmp_path / "leases.db"))
+    assert isinstance(sqlite_store, SQLiteLeaseStore)
+    sqlite_store.close()
+    assert isinstance(open_lease_store(str(tmp_path / "shared")), FileLeaseStore)
+
+
+def test_run_key_matches_journal_slot():
+    job = compile_rows([sheet_row("09:00", "수집", "echo x")]).jobs[0]
+    assert run_key("시트 1", job, SLOT) == "2026-10-02|시트 1|2|09:00"
+
+
+def test_only_one_node_acquires_a_run_lease(store):
+    first = make_node(store, "pc-a")
+    second = make_node(store, "pc-b")
+    assert first.try_acquire("slot")
+    assert not second.try_acquire("slot")
+    assert first.try_acquire("slot")  # 이미 내 리스면 다시 확보 가능
+    assert (first.acquired, second.lost) == (2, 1)
+
+
+def test_expired_lease_can_be_taken_over(store):
+    first = make_node(store, "pc-a", lease_ttl=0.05)
+    second = make_node(store, "pc-b")
+    assert first.try_acquire("slot")
+    time.sleep(0.1)
+    assert second.try_acquire("slot")
+
+
+def test_dead_node_drops_out_after_node_ttl(store):
+    make_node(store, "pc-a", node_ttl=0.05)  # 생존 신호를 한 번만 보내고 멈춘 노드
+    second = make_node(store, "pc-b")
+    assert second.live_nodes() == ["pc-a", "pc-b"]
+    time.sleep(0.1)
+    second.heartbeat()
+    assert second.live_nodes() == ["pc-b"]
+    # 남은 노드가 모든 슬롯의 1순위가 되어 바로 인계받음
+    assert second.takeover_delay_for("slot") == 0
+
+
+def test_rendezvous_ranking_is_shared_and_spreads_slots(store):
+    nodes = [make_node(store, name) for name in ("pc-a", "pc-b", "pc-c")]
+    for node in nodes:
+        node.heartbeat()
+    keys = [f"2026-10-02|시트 1|{row}|09:00" for row in range(2, 62)]
+    # 모든 노드가 같은 순서를 계산하고, 1순위 노드만 기다리지 않음
+    for key in keys:
+        rankings = {tuple(node.ranking(key)) for node in nodes}
+        assert len(rankings) == 1
+        delays = sorted(node.takeover_delay_for(key) for node in nodes)
+        assert delays == [0, 5, 10]
+    owners = [nodes[0].ranking(key)[0] for key in keys]
+    assert all(owners.count(name) >= 10 for name in ("pc-a", "pc-b", "pc-c"))
+
+
+def test_rendezvous_ranking_keeps_order_when_a_node_leaves(store):
+    nodes = [make_node(store, name) for name in ("pc-a", "pc-b", "pc-c")]
+    nodes[0].heartbeat()
+    keys = [f"slot-{index}" for index in range(30)]
+    before = {key: nodes[0].ranking(key) for key in keys}
+    store.release("node:pc-c", "pc-c")  # pc-c 종료 (close()가 생존 신호를 반납)
+    nodes[0].heartbeat()
+    for key in keys:
+        # 빠진 노드를 뺀 나머지의 상대 순서는 그대로 (다른 슬롯 담당이 뒤섞이지 않음)
+        assert nodes[0].ranking(key) == [node for node in before[key] if node != "pc-c"]
+
+
+def test_busy_node_steps_back(store):
+    nodes = [make_node(store, name) for name in ("pc-a", "pc-b")]
+    nodes[0].heartbeat()
+    key = next(f"slot-{index}" for index in range(100) if nodes[0].ranking(f"slot-{index}")[0] == "pc-a")
+    assert nodes[0].takeover_delay_for(key) == 0
+    assert nodes[0].takeover_delay_for(key, busy=True) == 10
+
+
+def test_store_error_falls_back_to_preferred_node(store):
+    node = make_node(store, "pc-a")
+
+    class BrokenStore:
+        def acquire(self, *args, **kwargs):
+            raise OSError("공유 폴더 연결 끊김")
+
+    node.store = BrokenStore()
+    assert node.try_acquire("slot")  # 혼자 남은 노드는 1순위이므로 실행
+    assert node.errors == 1
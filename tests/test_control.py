@@ -0,0 +1,102 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import control as control_module
+from control import ControlServer, send_control
+
+
+@pytest.fixture
+def server():
+    """스케줄러 루프 대신 명령을 처리하는 스레드를 붙인 제어 서버"""
+    handled = []
+    server = ControlServer(lambda: {'paused': server.paused, 'handled': len(handled)})
+    stop = threading.Event()
+
+    def loop():
+        while not stop.is_set():
+            if not server.wakeup.wait(0.05):
+                continue
+            for command in server.take_commands():
+                handled.append((command.name, command.args))
+                if command.name in ("pause", "resume"):
+                    server.paused = command.name == "pause"
+                    command.reply(True, "ok", paused=server.paused)
+                elif command.name == "run":
+                    if command.args.get('row') == "2":
+                        command.reply(True, "2행 실행")
+                    else:
+                        command.reply(False, "없는 행")
+                else:
+                    command.reply(True, command.name)
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    port = server.serve_http(0)
+    yield server, port, handled
+    stop.set()
+    thread.join(1)
+    server.close()
+
+
+def test_status_is_served_without_the_loop(server):
+    _, port, _ = server
+    status, reply = send_control(port, "status")
+    assert status == 200 and reply == {'paused': False, 'handled': 0}
+
+
+def test_pause_and_resume_go_through_the_loop(server):
+    control, port, handled = server
+    assert send_control(port, "pause") == (200, {'ok': True, 'message': "ok", 'paused': True})
+    assert control.paused
+    status, reply = send_control(port, "resume")
+    assert status == 200 and reply['paused'] is False
+    assert [name for name, _ in handled] == ["pause", "resume"]
+
+
+def test_run_passes_query_arguments(server):
+    _, port, handled = server
+    assert send_control(port, "run", {'row': 2, 'sheet': "시트 1"})[0] == 200
+    assert handled[-1] == ("run", {'row': "2", 'sheet': "시트 1"})
+    status, reply = send_control(port, "run", {'row': 99})
+    assert status == 400 and reply['message'] == "없는 행"
+
+
+def test_browser_requests_are_rejected(server):
+    _, port, handled = server
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/pause", method="POST",
+                                     headers={'Origin': "https://example.com"})
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request, timeout=5)
+    assert error.value.code == 403
+    assert handled == []
+
+
+def test_unknown_command_and_path(server):
+    _, port, handled = server
+    assert send_control(port, "shutdown")[0] == 404
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+    assert error.value.code == 404
+    assert json.loads(error.value.read().decode("utf-8"))['ok'] is False
+    assert handled == []
+
+
+def test_slow_loop_returns_accepted(monkeypatch):
+    monkeypatch.setattr(control_module, "CONTROL_REPLY_TIMEOUT", 0.05)
+    server = ControlServer(lambda: {})
+    status, reply = server.submit("reload", {})
+    assert status == 202 and reply['ok']
+    assert [command.name for command in server.take_commands()] == ["reload"]
+    assert not server.wakeup.is_set()
+
+
+def test_post_queues_without_waiting():
+    server = ControlServer(lambda: {})
+    server.post("fetched", {'rows': {}, 'seconds': 0.1})
+    assert server.wakeup.is_set()
+    [command] = server.take_commands()
+    assert command.name == "fetched" and command.args['seconds'] == 0.1
@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+
+import pytest
+
+from file_source import FileSheetsService, FileWatcher, ScheduleFileError, load_schedule_file
+from helpers import HEADER, sheet_row
+from schedule_table import compile_schedule
+from sheet_poller import fetch_schedule_rows
+
+
+def write_json(path, sheets):
+    path.write_text(json.dumps(sheets, ensure_ascii=False), encoding="utf-8")
+    # 같은 크기로 빠르게 다시 저장해도 변경으로 보이도록 수정 시각을 직접 올림
+    stamp = os.stat(path).st_mtime_ns + 10 ** 9
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_csv_sheet_name_and_cp949_fallback(tmp_path):
+    path = tmp_path / "일일작업.csv"
+    path.write_bytes("시간,작업이름,,,명령어\n09:00,수집,,,echo 수집\n".encode("cp949"))
+    sheets = load_schedule_file(str(path))
+    assert list(sheets) == ["일일작업"]
+    assert sheets["일일작업"][1] == ["09:00", "수집", "", "", "echo 수집"]
+
+
+def test_reads_schedule_and_writes_status_beside_it(tmp_path):
+    path = tmp_path / "schedule.json"
+    write_json(path, {"시트 1": [HEADER, sheet_row("09:00", "수집", "echo x")]})
+    service = FileSheetsService(str(path))
+    rows = fetch_schedule_rows(service, "file", ["시트 1"])["시트 1"]
+    assert [job.command for job in compile_schedule(rows).jobs] == ["echo x"]
+    service.spreadsheets().values().update(
+        spreadsheetId="file", range="'시트 1'!H2", body={'values': [["✅ 완료"]]}).execute()
+    assert json.loads((tmp_path / "schedule.json.status.json").read_text(encoding="utf-8")) == {"시트 1": {"H2": "✅ 완료"}}
+    assert json.loads(path.read_text(encoding="utf-8"))["시트 1"][1][4] == "echo x"  # 스케줄 파일은 그대로
+
+
+def test_partial_save_keeps_previous_schedule_until_fixed(tmp_path):
+    path = tmp_path / "schedule.json"
+    write_json(path, {"시트 1": [HEADER, sheet_row("09:00", "수집", "echo x")]})
+    service = FileSheetsService(str(path))
+    # 저장 도중(잘린 JSON)이면 읽기 실패 - 이전 내용은 버리지 않음
+    path.write_text('{"시트 1": [["시간"', encoding="utf-8")
+    with pytest.raises(ScheduleFileError):
+        fetch_schedule_rows(service, "file", ["시트 1"])
+    assert service.sheets["시트 1"][1][1] == "수집"
+    # 저장이 끝나면 다음 조회에서 새 내용
+    write_json(path, {"시트 1": [HEADER, sheet_row("10:00", "정리", "echo y")]})
+    rows = fetch_schedule_rows(service, "file", ["시트 1"])["시트 1"]
+    assert rows[1][1] == "정리"
+
+
+def test_missing_file_is_reported(tmp_path):
+    with pytest.raises(ScheduleFileError):
+        FileSheetsService(str(tmp_path / "missing.csv"))
+
+
+def test_watcher_notifies_once_the_file_is_stable(tmp_path):
+    path = tmp_path / "schedule.csv"
+    path.write_text("시간,작업이름\n", encoding="utf-8")
+    changed = threading.Event()
+    watcher = FileWatcher(str(path), changed.set, interval=0.02).start()
+    try:
+        assert not changed.wait(0.1)
+        path.write_text("시간,작업이름\n09:00,수집\n", encoding="utf-8")
+        assert changed.wait(2)
+    finally:
+        watcher.close()
@@ -0,0 +1,63 @@
+import datetime
+
+from helpers import compile_rows, sheet_row
+from job_chain import ChainTracker
+from simulator import simulate
+
+SHEET = "시트 1"
+
+
+def chain_table():
+    return compile_rows([
+        sheet_row("09:00", "수집A", "echo a"),
+        sheet_row("09:00", "수집B", "echo b"),
+        sheet_row("", "집계", "echo report", after="2, 3"),
+    ], SHEET)
+
+
+def test_child_waits_for_all_parents():
+    table = chain_table()
+    a, b, child = table.jobs
+    chains = ChainTracker()
+    assert chains.finished(SHEET, table, a, True, 1) == ([], [])
+    assert chains.finished(SHEET, table, b, True, 2) == ([child], [])
+    # 다음 회차는 두 선행 작업이 다시 성공해야 실행
+    assert chains.finished(SHEET, table, a, True, 3) == ([], [])
+    assert chains.finished(SHEET, table, b, True, 4) == ([child], [])
+
+
+def test_failed_parent_blocks_child():
+    table = chain_table()
+    a, b, child = table.jobs
+    chains = ChainTracker()
+    assert chains.finished(SHEET, table, a, True, 1) == ([], [])
+    assert chains.finished(SHEET, table, b, False, 2) == ([], [child])
+    # 실패로 회차가 끝났으므로 실패 전에 성공한 선행 작업도 다시 성공해야 실행
+    assert chains.finished(SHEET, table, b, True, 3) == ([], [])
+    assert chains.finished(SHEET, table, a, True, 4) == ([child], [])
+
+
+def test_failures_on_alternate_days_do_not_combine():
+    table = chain_table()
+    a, b, child = table.jobs
+    chains = ChainTracker()
+    # 1일차: A 성공, B 실패
+    assert chains.finished(SHEET, table, a, True, 1) == ([], [])
+    assert chains.finished(SHEET, table, b, False, 2) == ([], [child])
+    # 2일차: A 실패, B 성공 - 두 선행 작업이 같은 회차에 모두 성공한 적이 없으므로 실행하지 않음
+    assert chains.finished(SHEET, table, a, False, 3) == ([], [child])
+    assert chains.finished(SHEET, table, b, True, 4) == ([], [])
+
+
+def test_simulated_chain_with_timed_out_parent():
+    table = compile_rows([
+        sheet_row("09:00", "수집", "echo collect"),
+        sheet_row("", "집계", "echo report", after="2"),
+        sheet_row("10:00", "느린 수집", "sleep"),
+        sheet_row("", "느린 집계", "echo report", after="4"),
+    ], SHEET)
+    report = simulate({SHEET: table}, datetime.datetime(2026, 10, 1), hours=12,
+                      durations={(SHEET, 2): 5, (SHEET, 4): 600}, job_timeout=60)
+    # 수집 -> 집계는 실행되고, 시간 초과된 느린 수집의 후속 작업은 실행되지 않음
+    assert report.timeouts == 1
+    assert report.launches == 3
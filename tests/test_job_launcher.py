@@ -0,0 +1,52 @@
+import datetime
+import sys
+import threading
+import time
+
+from helpers import compile_rows, sheet_row
+import job_launcher
+from job_launcher import JobLauncher
+
+PYTHON = f'"{sys.executable}"'
+
+
+def test_same_slot_jobs_are_probed_in_parallel():
+    table = compile_rows([
+        sheet_row("09:00", "오래 걸림", f'{PYTHON} -c "import time; time.sleep(3)"'),
+        sheet_row("09:00", "바로 실패", f'{PYTHON} -c "raise SystemExit(3)"'),
+    ])
+    results = []
+    lock = threading.Lock()
+
+    def on_result(result):
+        with lock:
+            results.append(result)
+
+    launcher = JobLauncher(probe_delay=0.5)
+    started = time.monotonic()
+    futures = launcher.launch(table.jobs, datetime.datetime.now(), on_result)
+    for future in futures:
+        future.result(timeout=10)
+    elapsed = time.monotonic() - started
+    launcher.shutdown()
+
+    # 기동 확인 대기(probe_delay)가 작업 수만큼 쌓이지 않음
+    assert elapsed < 0.5 * len(table.jobs)
+    by_row = {result.job.row_index: result for result in results}
+    assert by_row[2].ok and "실행 성공" in by_row[2].log_message()
+    assert by_row[3].return_code == 3 and "종료 코드: 3" in by_row[3].log_message()
+    assert by_row[2].jitter >= 0
+
+
+def test_launch_error_is_reported(monkeypatch):
+    def broken_start(command, capture=None):
+        raise OSError("실행 파일 없음")
+
+    monkeypatch.setattr(job_launcher, "start_process", broken_start)
+    table = compile_rows([sheet_row("09:00", "없는 명령", "echo x")])
+    results = []
+    launcher = JobLauncher(probe_delay=0)
+    launcher.launch(table.jobs, datetime.datetime.now(), results.append)[0].result(timeout=5)
+    launcher.shutdown()
+    assert not results[0].ok and results[0].jitter is None
+    assert "실행 오류: 실행 파일 없음" in results[0].log_message()
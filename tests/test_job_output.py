@@ -0,0 +1,74 @@
+import io
+import os
+import sys
+
+from job_launcher import start_process
+from job_output import OutputCapture, output_path
+
+
+class ChunkStream(io.BytesIO):
+    """정해진 크기로 나눠서 읽히는 파이프 흉내"""
+
+    def __init__(self, data, chunk_size):
+        super().__init__(data)
+        self.chunk_size = chunk_size
+
+    def read1(self, size=-1):
+        return super().read1(min(size, self.chunk_size))
+
+
+def test_output_path_replaces_unsafe_characters(tmp_path):
+    path = output_path(str(tmp_path), "일일 작업/A:B", 7)
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.basename(path) == "일일_작업_A_B_7.log"
+    assert os.path.basename(output_path(str(tmp_path), "", 3)) == "job_3.log"
+
+
+def test_keeps_only_the_last_lines_split_across_chunks(tmp_path):
+    data = "".join(f"줄 {index}\n" for index in range(100)).encode("utf-8") + b"no newline"
+    capture = OutputCapture(str(tmp_path / "job.log"), tail_lines=3)
+    capture.attach(ChunkStream(data, chunk_size=7), command="echo")
+    assert capture.wait(5)
+    assert capture.tail() == ["줄 98", "줄 99", "no newline"]
+    assert capture.lines_read == 101
+    assert capture.bytes_read == len(data)
+    assert capture.summary(lines=2) == "줄 99 / no newline"
+    with open(tmp_path / "job.log", "rb") as f:
+        content = f.read()
+    assert content.startswith("===== ".encode("utf-8"))
+    assert content.endswith(data)
+
+
+def test_summary_truncates_from_the_front(tmp_path):
+    capture = OutputCapture(str(tmp_path / "job.log"))
+    capture.attach(ChunkStream(b"x" * 500 + b"\n", chunk_size=4096))
+    capture.wait(5)
+    summary = capture.summary(max_chars=50)
+    assert len(summary) == 50 and summary.startswith("…")
+
+
+def test_file_rotates_at_max_bytes(tmp_path):
+    path = str(tmp_path / "job.log")
+    data = b"".join(b"%04d\n" % index for index in range(400))  # 2000바이트
+    capture = OutputCapture(path, max_bytes=500, backup_count=2)
+    capture.attach(ChunkStream(data, chunk_size=100))
+    capture.wait(5)
+    assert os.path.getsize(path) <= 500
+    assert os.path.exists(path + ".1") and os.path.exists(path + ".2")
+    assert not os.path.exists(path + ".3")
+    with open(path, "rb") as f:
+        assert f.read().endswith(b"0399\n")
+    assert capture.tail()[-1] == "0399"
+
+
+def test_start_process_drains_large_output(tmp_path):
+    # 파이프 버퍼(수십 KB)보다 훨씬 많이 출력해도 멈추지 않고 끝까지 읽음
+    script = tmp_path / "chatty.py"
+    script.write_text("import sys\nfor i in range(20000): print('line', i)\nprint('끝', file=sys.stderr)\n",
+                      encoding="utf-8")
+    capture = OutputCapture(str(tmp_path / "job.log"))
+    process = start_process(f'"{sys.executable}" "{script}"', capture)
+    assert process.wait(30) == 0
+    assert capture.wait(10)
+    assert capture.tail()[-1] == "끝"
+    assert capture.lines_read == 20001
@@ -0,0 +1,106 @@
+import datetime
+import sys
+import threading
+
+import pytest
+
+from helpers import compile_rows, sheet_row, wait_until
+from job_launcher import JobLauncher
+from job_supervisor import JobSupervisor
+
+PYTHON = f'"{sys.executable}"'
+SHEET = "시트 1"
+
+
+def sleeper(seconds):
+    return f'{PYTHON} -c "import time; time.sleep({seconds})"'
+
+
+class Recorder:
+    """on_result/on_exit 콜백 결과를 모으는 객체"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results = []
+        self.exits = []
+
+    def on_result(self, result):
+        with self.lock:
+            self.results.append(result)
+
+    def on_exit(self, record):
+        with self.lock:
+            self.exits.append(record)
+
+
+@pytest.fixture
+def launcher():
+    launcher = JobLauncher(probe_delay=0.05)
+    yield launcher
+    launcher.shutdown()
+
+
+def submit_all(supervisor, launcher, table, recorder):
+    for job in table.jobs:
+        supervisor.submit(launcher, (SHEET, job.row_index), job, datetime.datetime.now(),
+                          recorder.on_result, recorder.on_exit)
+
+
+def test_overlapping_run_of_same_row_is_skipped(launcher):
+    table = compile_rows([sheet_row("09:00", "느림", sleeper(1))])
+    supervisor = JobSupervisor(poll_interval=0.05)
+    recorder = Recorder()
+    submit_all(supervisor, launcher, table, recorder)
+    submit_all(supervisor, launcher, table, recorder)
+    assert wait_until(lambda: len(recorder.exits) == 1)
+    supervisor.shutdown()
+    skipped = [result for result in recorder.results if result.skipped]
+    assert [result.skipped for result in skipped] == ["이전 실행이 아직 진행 중"]
+
+
+def test_no_cap_by_default(launcher):
+    table = compile_rows([sheet_row("09:00", f"작업{i}", sleeper(0.5)) for i in range(10)])
+    supervisor = JobSupervisor(poll_interval=0.05)
+    recorder = Recorder()
+    submit_all(supervisor, launcher, table, recorder)
+    assert supervisor.queue_depth() == 0
+    assert wait_until(lambda: len(recorder.exits) == 10)
+    supervisor.shutdown()
+
+
+def test_cap_queues_extra_runs_until_a_slot_frees(launcher):
+    table = compile_rows([sheet_row("09:00", f"작업{i}", sleeper(0.3)) for i in range(3)])
+    supervisor = JobSupervisor(max_concurrency=2, poll_interval=0.05)
+    recorder = Recorder()
+    submit_all(supervisor, launcher, table, recorder)
+    assert supervisor.queue_depth() == 1
+    assert wait_until(lambda: len(recorder.exits) == 3)
+    supervisor.shutdown()
+    assert all(result.skipped is None for result in recorder.results)
+    # 대기열에서 기다린 작업은 앞의 작업이 끝난 뒤에 시작됨
+    last = max(recorder.results, key=lambda result: result.started_at)
+    assert last.jitter >= 0.25
+
+
+def test_timed_out_job_is_terminated(launcher):
+    table = compile_rows([sheet_row("09:00", "멈춤", sleeper(30))])
+    supervisor = JobSupervisor(timeout=0.3, kill_grace=1.0, poll_interval=0.05)
+    recorder = Recorder()
+    submit_all(supervisor, launcher, table, recorder)
+    assert wait_until(lambda: recorder.exits, timeout=10)
+    supervisor.shutdown()
+    record = recorder.exits[0]
+    assert record.timed_out and record.return_code != 0
+    assert record.duration < 5
+
+
+def test_duration_is_measured_at_exit_not_reap(launcher):
+    table = compile_rows([sheet_row("09:00", "빠름", f'{PYTHON} -c "pass"')])
+    # 회수 주기가 길어도 종료 즉시 회수되고 실행 시간은 실제 종료 시각 기준
+    supervisor = JobSupervisor(poll_interval=30)
+    recorder = Recorder()
+    submit_all(supervisor, launcher, table, recorder)
+    assert wait_until(lambda: recorder.exits, timeout=5)
+    supervisor.shutdown()
+    assert recorder.exits[0].return_code == 0
+    assert recorder.exits[0].duration < 2
@@ -0,0 +1,68 @@
+import json
+import os
+import time
+
+from log_writer import LogWriter
+
+
+def read_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_log_is_buffered_until_flush(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = LogWriter(path, source="test")
+    writer.log("시작", event="start", pid=1)
+    assert not os.path.exists(path)
+    writer.flush()
+    [record] = read_records(path)
+    assert record["msg"] == "시작"
+    assert record["source"] == "test"
+    assert record["level"] == "info"
+    assert record["event"] == "start" and record["pid"] == 1
+
+
+def test_rotates_when_file_exceeds_max_bytes(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = LogWriter(path, source="test", max_bytes=200, backup_count=2)
+    for batch in range(4):
+        for index in range(5):
+            writer.log(f"batch {batch} line {index}")
+        writer.flush()
+    # 가장 최근 배치는 새 파일에, 이전 배치는 .1, .2로 밀려나고 그보다 오래된 것은 삭제
+    assert [r["msg"] for r in read_records(path)][0] == "batch 3 line 0"
+    assert read_records(path + ".1")[0]["msg"] == "batch 2 line 0"
+    assert read_records(path + ".2")[0]["msg"] == "batch 1 line 0"
+    assert not os.path.exists(path + ".3")
+
+
+def test_rotates_when_day_changes(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = LogWriter(path, source="test")
+    writer.log("어제")
+    writer.flush()
+    yesterday = time.time() - 86400
+    os.utime(path, (yesterday, yesterday))
+    writer.log("오늘")
+    writer.flush()
+    assert [r["msg"] for r in read_records(path)] == ["오늘"]
+    assert [r["msg"] for r in read_records(path + ".1")] == ["어제"]
+
+
+def test_full_buffer_drops_oldest_lines(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = LogWriter(path, source="test", max_buffer=3)
+    for index in range(5):
+        writer.log(f"line {index}")
+    writer.flush()
+    assert writer.dropped == 2
+    assert [r["msg"] for r in read_records(path)] == ["line 2", "line 3", "line 4"]
+
+
+def test_close_flushes_remaining_lines(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = LogWriter(path, source="test", flush_interval=60).start()
+    writer.log("종료 직전")
+    writer.close()
+    assert [r["msg"] for r in read_records(path)] == ["종료 직전"]
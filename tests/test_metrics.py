@@ -0,0 +1,71 @@
+import urllib.request
+
+import pytest
+
+from metrics import MetricsRegistry, SchedulerMetrics
+from sheet_backend import FakeHttpError, FakeSheetsService
+
+
+def test_counter_gauge_and_histogram_text_format():
+    registry = MetricsRegistry()
+    polls = registry.counter("polls_total", "재조회 횟수", ("result",))
+    rows = registry.gauge("sheet_rows", "행 수", ("sheet",))
+    seconds = registry.histogram("poll_seconds", "소요 시간", buckets=(0.1, 1.0))
+    polls.inc(result="changed")
+    polls.inc(2, result="changed")
+    rows.set(5, sheet='일정 "1"')
+    seconds.observe(0.05)
+    seconds.observe(0.5)
+    lines = registry.render().splitlines()
+    assert "# TYPE polls_total counter" in lines
+    assert 'polls_total{result="changed"} 3' in lines
+    assert 'sheet_rows{sheet="일정 \\"1\\""} 5' in lines
+    assert 'poll_seconds_bucket{le="0.1"} 1' in lines
+    assert 'poll_seconds_bucket{le="1.0"} 2' in lines
+    assert 'poll_seconds_bucket{le="+Inf"} 2' in lines
+    assert "poll_seconds_count 2" in lines
+
+
+def test_function_metrics_read_value_at_render():
+    registry = MetricsRegistry()
+    state = {"dropped": 0, "depth": 0}
+    registry.counter("dropped_total", "버린 수").set_function(lambda: state["dropped"])
+    registry.gauge("depth", "대기 수").set_function(lambda: state["depth"])
+    state.update(dropped=4, depth=2)
+    lines = registry.render().splitlines()
+    assert "# TYPE dropped_total counter" in lines and "dropped_total 4" in lines
+    assert "depth 2" in lines
+
+
+def test_cumulative_values_are_counters():
+    text = SchedulerMetrics().registry.render()
+    assert "# TYPE scheduler_log_dropped_total counter" in text
+    assert "# TYPE scheduler_running_jobs gauge" in text
+
+
+def test_instrumented_service_records_latency_and_errors():
+    metrics = SchedulerMetrics()
+    service = FakeSheetsService({"시트1": [["a"]]})
+    wrapped = metrics.instrument(service)
+    wrapped.spreadsheets().values().get(spreadsheetId="test", range="A1").execute()
+    service.fail_next(1, status=429)
+    with pytest.raises(FakeHttpError):
+        wrapped.spreadsheets().values().get(spreadsheetId="test", range="A1").execute()
+    text = metrics.registry.render()
+    assert 'scheduler_sheets_api_request_seconds_count{method="spreadsheets.values.get"} 2' in text
+    assert 'scheduler_sheets_api_errors_total{method="spreadsheets.values.get",status="429"} 1' in text
+
+
+def test_textfile_and_http_endpoint(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("polls_total", "재조회 횟수").inc()
+    path = str(tmp_path / "scheduler.prom")
+    registry.write_textfile(path)
+    with open(path, encoding="utf-8") as f:
+        assert "polls_total 1" in f.read()
+    port = registry.serve_http(0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert "polls_total 1" in response.read().decode("utf-8")
+    finally:
+        registry.close()
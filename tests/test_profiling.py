@@ -0,0 +1,79 @@
+import os
+import tracemalloc
+
+import pytest
+
+from metrics import MetricsRegistry
+from profiling import Profiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path / "profiles"), request_file=str(tmp_path / "profile_request.txt"))
+    yield profiler
+    profiler.close()
+
+
+def busy_tick(profiler):
+    profiler.tick_begin()
+    sum(index * index for index in range(1000))
+    profiler.tick_end()
+
+
+def test_profile_covers_requested_ticks_then_saves(profiler):
+    profiler.request_profile(2)
+    busy_tick(profiler)
+    assert profiler.profiling
+    assert profiler.status()['profile_ticks_left'] == 1
+    busy_tick(profiler)
+    assert not profiler.profiling
+    [path] = profiler.last_outputs
+    assert path.endswith(".prof") and os.path.exists(path)
+    with open(path[:-len(".prof")] + ".txt", "r", encoding="utf-8") as f:
+        assert "<genexpr>" in f.read()  # 틱 안에서 실행한 코드만 기록됨
+
+
+def test_tick_end_without_begin_is_ignored(profiler):
+    profiler.request_profile(1)
+    profiler.tick_end()
+    assert not profiler.profiling and profiler.last_outputs == []
+
+
+def test_apply_command_parses_profile_and_memory(profiler):
+    assert profiler.apply_command("profile 5") == "다음 5틱 프로파일 예약"
+    assert profiler.apply_command("memory 30") == "메모리 추적 예약 (30초마다)"
+    assert profiler.apply_command("memory off") == "메모리 추적 끔 예약"
+    assert profiler.apply_command("profile many") is None
+    assert profiler.apply_command("unknown") is None
+    assert profiler.apply_command("") is None
+
+
+def test_request_file_is_applied_and_removed(profiler):
+    with open(profiler.request_file, "w", encoding="utf-8") as f:
+        f.write("profile 1\n")
+    busy_tick(profiler)
+    assert not os.path.exists(profiler.request_file)
+    assert len(profiler.last_outputs) == 1
+
+
+def test_memory_tracking_writes_snapshot_and_stops(profiler):
+    was_tracing = tracemalloc.is_tracing()
+    profiler.request_memory(3600)
+    busy_tick(profiler)
+    assert profiler.memory_interval == 3600
+    assert 'traced_memory' in profiler.status()
+    [path] = profiler.last_outputs
+    with open(path, "r", encoding="utf-8") as f:
+        assert "첫 스냅샷" in f.read()
+    profiler.request_memory(0)
+    busy_tick(profiler)
+    assert profiler.memory_interval == 0
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def test_histogram_totals_by_phase():
+    histogram = MetricsRegistry().histogram("phase_seconds", "구간별 시간", ("phase",))
+    histogram.observe(0.5, phase="fetch")
+    histogram.observe(1.5, phase="fetch")
+    histogram.observe(0.25, phase="compile")
+    assert histogram.totals() == {("fetch",): (2, 2.0), ("compile",): (1, 0.25)}
@@ -0,0 +1,90 @@
+import datetime
+
+import pytest
+
+from recurrence import parse_recurrence
+
+
+def fires(text, start, count):
+    """start 이후 count번의 실행 일시"""
+    rule = parse_recurrence(text)
+    assert rule is not None, text
+    result = []
+    moment = start
+    for _ in range(count):
+        moment = rule.next_fire(moment)
+        result.append(moment)
+    return result
+
+
+START = datetime.datetime(2026, 10, 1)  # 목요일
+
+
+def test_interval_minutes():
+    assert fires("매 5분", START, 3) == [
+        datetime.datetime(2026, 10, 1, 0, 5), datetime.datetime(2026, 10, 1, 0, 10), datetime.datetime(2026, 10, 1, 0, 15),
+    ]
+
+
+def test_interval_with_window_starts_at_window():
+    result = fires("매 30분 09:00-10:00", START, 4)
+    assert result == [
+        datetime.datetime(2026, 10, 1, 9, 0), datetime.datetime(2026, 10, 1, 9, 30),
+        datetime.datetime(2026, 10, 1, 10, 0), datetime.datetime(2026, 10, 2, 9, 0),
+    ]
+
+
+def test_multiple_times_and_weekdays():
+    result = fires("09:00, 18:00 평일", datetime.datetime(2026, 10, 2, 12, 0), 3)  # 금요일 정오부터
+    assert result == [
+        datetime.datetime(2026, 10, 2, 18, 0), datetime.datetime(2026, 10, 5, 9, 0), datetime.datetime(2026, 10, 5, 18, 0),
+    ]
+
+
+def test_date_range_limits_fires():
+    assert fires("09:00 2026-10-02~2026-10-03", START, 2) == [
+        datetime.datetime(2026, 10, 2, 9, 0), datetime.datetime(2026, 10, 3, 9, 0),
+    ]
+    rule = parse_recurrence("09:00 2026-10-02~2026-10-03")
+    assert rule.next_fire(datetime.datetime(2026, 10, 3, 9, 0)) is None
+
+
+def test_cron_every_15_minutes_on_weekdays():
+    result = fires("*/15 9-10 * * 1-5", datetime.datetime(2026, 10, 3), 2)  # 토요일부터
+    assert result == [datetime.datetime(2026, 10, 5, 9, 0), datetime.datetime(2026, 10, 5, 9, 15)]
+
+
+def test_cron_stepped_day_of_month():
+    days = [moment.day for moment in fires("0 9 */2 * *", START, 4)]
+    assert days == [1, 3, 5, 7]
+
+
+def test_cron_stepped_day_of_week():
+    # */2 -> 일(0), 화(2), 목(4), 토(6)
+    weekdays = [moment.strftime("%a") for moment in fires("0 9 * * */2", START, 4)]
+    assert weekdays == ["Thu", "Sat", "Sun", "Tue"]
+
+
+def test_cron_day_of_month_or_day_of_week():
+    # 일과 요일을 둘 다 지정하면 둘 중 하나만 맞아도 실행 (1일, 15일, 월요일)
+    days = [moment.day for moment in fires("0 9 1,15 * 1", START, 4)]
+    assert days == [1, 5, 12, 15]
+
+
+def test_cron_stepped_field_is_and_with_day_of_week():
+    # '*/10'은 '*'로 시작하므로 요일과 AND (10일 간격 날짜 중 월요일만)
+    for moment in fires("0 9 */10 * 1", START, 3):
+        assert moment.weekday() == 0 and moment.day in (1, 11, 21, 31)
+
+
+@pytest.mark.parametrize("text", ["매 0분", "매 5년", "61 * * * *", "0 9 */0 * *", "0 9 31 2 *", "0 9 30,31 feb *",
+                                  "0 9 31 4,6,9,11 *", "아무거나", ""])
+def test_invalid_rules(text):
+    assert parse_recurrence(text) is None
+
+
+def test_cron_rare_but_possible_days_are_kept():
+    # 2월 29일은 윤년에만 있지만 가능한 날짜, 31일 + 요일은 요일로도 실행됨
+    assert fires("0 9 29 2 *", START, 1)[0].date() == datetime.date(2028, 2, 29)
+    assert parse_recurrence("0 9 31 2 1") is not None
+    assert parse_recurrence("0 9 31 1-2 *") is not None
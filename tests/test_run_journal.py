@@ -0,0 +1,101 @@
+import datetime
+import os
+
+import pytest
+
+from helpers import compile_rows, sheet_row
+from run_journal import MISFIRE_RUN_ALL, MISFIRE_RUN_ONCE, MISFIRE_SKIP, RunJournal, find_missed_runs
+
+SHEET = "시트 1"
+NOW = datetime.datetime(2026, 10, 2, 10, 5)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = RunJournal(str(tmp_path / "run_journal.db"))
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def table():
+    return compile_rows([
+        sheet_row("09:30", "수집", "echo collect"),
+        sheet_row("09:50", "집계", "echo report"),
+        sheet_row("10:30", "전송", "echo send"),
+    ])
+
+
+def test_claim_is_once_per_day_and_survives_restart(tmp_path, table):
+    path = str(tmp_path / "run_journal.db")
+    job = table.jobs[0]
+    # 보관 기간이 지난 기록은 다시 열 때 정리되므로 오늘 날짜로 기록
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time(9, 30))
+    journal = RunJournal(path)
+    assert journal.claim(SHEET, job, today)
+    assert not journal.claim(SHEET, job, today)
+    journal.close()
+
+    journal = RunJournal(path)
+    assert journal.has_run(SHEET, job, today)
+    assert not journal.has_run(SHEET, job, today + datetime.timedelta(days=1))
+    assert not journal.has_run("다른 시트", job, today)
+    assert journal.claim(SHEET, job, today + datetime.timedelta(days=1))
+    journal.close()
+
+
+def test_compact_drops_records_past_retention(tmp_path, table):
+    journal = RunJournal(str(tmp_path / "run_journal.db"), retention_days=7)
+    old = datetime.datetime(2026, 9, 1, 9, 30)
+    journal.claim(SHEET, table.jobs[0], old)
+    assert journal.compact(datetime.date(2026, 10, 1)) == 1
+    assert not journal.has_run(SHEET, table.jobs[0], old)
+    # 같은 날 두 번째 정리는 건너뜀
+    assert journal.compact(datetime.date(2026, 10, 1)) == 0
+    journal.close()
+
+
+def test_compact_returns_freed_space_to_the_file(tmp_path):
+    path = tmp_path / "run_journal.db"
+    journal = RunJournal(str(path), retention_days=7)
+    # 기록 한 줄이 페이지 하나를 거의 차지하도록 긴 명령어
+    job = compile_rows([sheet_row("09:30", "수집", "echo " + "x" * 2000)]).jobs[0]
+    old = datetime.datetime(2026, 8, 1, 9, 30)
+    for day in range(300):
+        journal.claim(SHEET, job, old + datetime.timedelta(days=day // 100, seconds=day))
+    journal._compacted_on = None
+    pages_before = journal._conn.execute("PRAGMA page_count").fetchone()[0]
+    assert journal.compact(datetime.date(2026, 10, 1)) == 300
+    pages_after = journal._conn.execute("PRAGMA page_count").fetchone()[0]
+    assert pages_after < pages_before // 10
+    assert os.path.getsize(str(path) + "-wal") == 0
+    journal.close()
+
+
+def missed(table, journal, policy, grace_seconds):
+    return [(fire_at.strftime("%m-%d %H:%M"), job.row_index)
+            for fire_at, job in find_missed_runs(table, journal, SHEET, NOW, grace_seconds, policy)]
+
+
+def test_misfire_skip(table, journal):
+    assert missed(table, journal, MISFIRE_SKIP, 3600) == []
+
+
+def test_misfire_run_all(table, journal):
+    assert missed(table, journal, MISFIRE_RUN_ALL, 3600) == [("10-02 09:30", 2), ("10-02 09:50", 3)]
+    # 유예 시간이 하루를 넘으면 전날 놓친 실행도 모두
+    assert missed(table, journal, MISFIRE_RUN_ALL, 86400) == [
+        ("10-01 10:30", 4), ("10-02 09:30", 2), ("10-02 09:50", 3),
+    ]
+
+
+def test_misfire_run_once_keeps_latest_per_row(table, journal):
+    assert missed(table, journal, MISFIRE_RUN_ONCE, 2 * 86400) == [
+        ("10-01 10:30", 4), ("10-02 09:30", 2), ("10-02 09:50", 3),
+    ]
+
+
+def test_misfire_ignores_claimed_runs_and_zero_grace(table, journal):
+    journal.claim(SHEET, table.jobs[1], NOW.replace(hour=9, minute=50))
+    assert missed(table, journal, MISFIRE_RUN_ALL, 3600) == [("10-02 09:30", 2)]
+    assert missed(table, journal, MISFIRE_RUN_ALL, 0) == []
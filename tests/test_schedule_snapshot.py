@@ -0,0 +1,73 @@
+import datetime
+import json
+
+from helpers import compile_rows, sheet_row
+from schedule_snapshot import ScheduleSnapshot, table_from_records, table_to_records
+
+
+def make_table():
+    return compile_rows([
+        sheet_row("09:00", "수집", "python collect.py"),
+        sheet_row("9:30:15", "정리", "cleanup.bat"),
+    ])
+
+
+def test_records_round_trip_without_reparsing():
+    table = make_table()
+    restored = table_from_records(table_to_records(table))
+    assert [job.as_tuple() for job in restored.jobs] == [job.as_tuple() for job in table.jobs]
+    assert [job.time_raw for job in restored.jobs] == ["09:00", "9:30:15"]
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    snapshot = ScheduleSnapshot("sheet-id", "시트 1", {"시트 1": ("abc", make_table())}, verified_at=1000.0)
+    assert snapshot.save(path)
+    loaded = ScheduleSnapshot.load("sheet-id", "시트 1", path)
+    assert loaded.verified_at == 1000.0
+    fingerprint, table = loaded.sheets["시트 1"]
+    assert fingerprint == "abc"
+    assert len(table) == 2
+    assert not (tmp_path / "snapshot.json.tmp").exists()
+
+
+def test_load_rejects_other_spreadsheet_or_sheets(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    ScheduleSnapshot("sheet-id", "시트 1", {"시트 1": ("abc", make_table())}).save(path)
+    assert ScheduleSnapshot.load("other-id", "시트 1", path) is None
+    assert ScheduleSnapshot.load("sheet-id", "시트 2", path) is None
+
+
+def test_load_ignores_missing_or_corrupt_file(tmp_path):
+    path = tmp_path / "snapshot.json"
+    assert ScheduleSnapshot.load("sheet-id", "시트 1", str(path)) is None
+    path.write_text("{not json", encoding="utf-8")
+    assert ScheduleSnapshot.load("sheet-id", "시트 1", str(path)) is None
+    path.write_text(json.dumps({"version": 0}), encoding="utf-8")
+    assert ScheduleSnapshot.load("sheet-id", "시트 1", str(path)) is None
+
+
+def test_age_counts_from_verified_at():
+    snapshot = ScheduleSnapshot("sheet-id", "시트 1", {}, verified_at=0.0)
+    assert snapshot.age() > 0
+    snapshot.verified_at = snapshot.verified_at + 10 ** 12  # 미래 시각이어도 음수가 되지 않음
+    assert snapshot.age() == 0.0
+
+
+def test_load_without_keys_reads_any_snapshot(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    ScheduleSnapshot("sheet-id", "시트 1", {"시트 1": ("abc", make_table())}).save(path)
+    loaded = ScheduleSnapshot.load(None, None, path)
+    assert list(loaded.sheets) == ["시트 1"]
+
+
+def test_rule_rows_are_recompiled_on_load(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    table = compile_rows([sheet_row("매 30분 09:00-10:00", "반복", "echo every")])
+    ScheduleSnapshot("sheet-id", "시트 1", {"시트 1": ("abc", table)}).save(path)
+    _, loaded = ScheduleSnapshot.load("sheet-id", "시트 1", path).sheets["시트 1"]
+    day = datetime.datetime(2026, 10, 1)
+    fire_at, jobs = loaded.next_fire(day)
+    assert fire_at == day.replace(hour=9)
+    assert [job.as_tuple() for job in jobs] == [job.as_tuple() for job in table.next_fire(day)[1]]
+    assert loaded.next_fire(fire_at)[0] == day.replace(hour=9, minute=30)
@@ -0,0 +1,103 @@
+import datetime
+
+import pytest
+
+from helpers import compile_rows, sheet_row
+from schedule_table import normalize_time, parse_time_of_day
+
+DAY = datetime.datetime(2026, 10, 1)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("9:5", "09:05"), ("09:05:00", "09:05"), ("09:05:30", "09:05:30"), (" 23:59 ", "23:59"),
+    ("24:00", ""), ("9", ""), ("9:00:00:00", ""), ("아침", ""), ("", ""),
+])
+def test_normalize_time(raw, expected):
+    assert normalize_time(raw) == expected
+
+
+def test_parse_time_of_day():
+    assert parse_time_of_day("09:05:30") == 9 * 3600 + 5 * 60 + 30
+    assert parse_time_of_day("12:60") is None
+
+
+def test_rows_are_indexed_by_second():
+    table = compile_rows([
+        sheet_row("09:00", "아침", "echo a"),
+        sheet_row("23:30", "밤", "echo b"),
+        sheet_row("9:00:00", "아침2", "echo c"),
+        sheet_row("", "시간 없음", "echo d"),
+        sheet_row("25:00", "잘못된 시간", "echo e"),
+        sheet_row("10:00", "명령 없음", ""),
+    ])
+    assert len(table) == 3
+    assert table.seconds == [9 * 3600, 23 * 3600 + 30 * 60]
+    assert [job.row_index for job in table.jobs_at(9 * 3600)] == [2, 4]
+    assert table.jobs_at(10 * 3600) == []
+
+
+def test_next_fire_and_midnight_wrap():
+    table = compile_rows([
+        sheet_row("09:00", "아침", "echo a"),
+        sheet_row("23:30:15", "밤", "echo b"),
+    ])
+    fire_at, jobs = table.next_fire(DAY)
+    assert fire_at == DAY.replace(hour=9) and [job.row_index for job in jobs] == [2]
+    assert table.next_fire(DAY.replace(hour=9))[0] == DAY.replace(hour=23, minute=30, second=15)
+    assert table.next_fire(DAY.replace(hour=9), inclusive=True)[0] == DAY.replace(hour=9)
+    # 오늘 남은 예약이 없으면 다음날 첫 예약
+    assert table.next_fire(DAY.replace(hour=23, minute=30, second=15))[0] == DAY.replace(day=2, hour=9)
+
+
+def test_empty_table():
+    table = compile_rows([])
+    assert table.next_after(0) == (None, [])
+    assert table.next_fire(DAY) == (None, [])
+
+
+def test_jobs_due_merges_rules_in_row_order():
+    table = compile_rows([
+        sheet_row("0 9 */2 * *", "격일", "echo cron"),
+        sheet_row("09:00", "매일", "echo daily"),
+        sheet_row("매 30분", "반복", "echo every"),
+    ])
+    assert [job.row_index for job in table.jobs_due(DAY.replace(hour=9))] == [2, 3, 4]
+    # 10월 2일은 격일 규칙에 맞지 않음
+    assert [job.row_index for job in table.jobs_due(DAY.replace(day=2, hour=9))] == [3, 4]
+    assert [job.row_index for job in table.jobs_due(DAY.replace(hour=9, minute=30))] == [4]
+
+
+def test_next_fire_with_stepped_weekday_rule():
+    table = compile_rows([sheet_row("0 9 * * */2", "격요일", "echo cron")])
+    fire_at = DAY
+    weekdays = []
+    for _ in range(4):
+        fire_at, jobs = table.next_fire(fire_at)
+        assert [job.row_index for job in jobs] == [2]
+        weekdays.append(fire_at.strftime("%a"))
+    assert weekdays == ["Thu", "Sat", "Sun", "Tue"]
+
+
+def test_chained_jobs_are_not_time_indexed():
+    table = compile_rows([
+        sheet_row("09:00", "수집", "echo collect"),
+        sheet_row("", "집계", "echo report", after="수집"),
+        sheet_row("", "전송", "echo send", after="2행, 3"),
+    ])
+    assert [job.row_index for job in table.jobs_due(DAY.replace(hour=9))] == [2]
+    assert [job.row_index for job in table.dependents[2]] == [3, 4]
+    assert table.jobs[2].after == (2, 3)
+    assert table.dependency_errors == []
+
+
+def test_dependency_errors():
+    table = compile_rows([
+        sheet_row("09:00", "수집", "echo collect"),
+        sheet_row("", "자기참조", "echo a", after="3"),
+        sheet_row("", "없는 행", "echo b", after="99"),
+        sheet_row("", "순환1", "echo c", after="6"),
+        sheet_row("", "순환2", "echo d", after="5"),
+        sheet_row("", "없는 이름", "echo e", after="없음"),
+    ])
+    assert [row for row, _ in table.dependency_errors] == [3, 4, 5, 6, 7]
+    assert table.dependents == {}
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from sheet_backend import FakeHttpError, FakeSheetsService, parse_a1_range
+
+SHEET = "일정 1"
+
+
+@pytest.mark.parametrize("a1_range, expected", [
+    ("A1", (None, 0, 0, 0, 0)),
+    ("Sheet1!A:B", ("Sheet1", 0, 0, 1, None)),
+    ("'일정 1'!H2:H", ("일정 1", 7, 1, 7, None)),
+    ("'Bob''s'!AA10:AB20", ("Bob's", 26, 9, 27, 19)),
+    ("'시트'!E:E", ("시트", 4, 0, 4, None)),
+])
+def test_parse_a1_range(a1_range, expected):
+    assert parse_a1_range(a1_range) == expected
+
+
+def make_service(**kwargs):
+    return FakeSheetsService({SHEET: [["시간", "작업이름"], ["09:00", "수집", "", ""], [], []]}, **kwargs)
+
+
+def test_reads_trim_trailing_blank_cells_and_rows():
+    service = make_service()
+    result = service.spreadsheets().values().get(spreadsheetId="test", range=f"'{SHEET}'!A:D").execute()
+    assert result["values"] == [["시간", "작업이름"], ["09:00", "수집"]]
+    empty = service.spreadsheets().values().get(spreadsheetId="test", range=f"'{SHEET}'!H:H").execute()
+    assert "values" not in empty
+
+
+def test_batch_update_and_clear():
+    service = make_service()
+    values = service.spreadsheets().values()
+    values.batchUpdate(spreadsheetId="test", body={"data": [
+        {"range": f"'{SHEET}'!H2", "values": [["성공"]]},
+        {"range": f"'{SHEET}'!H3", "values": [["실패"]]},
+    ]}).execute()
+    assert service.sheets[SHEET][1][7] == "성공" and service.sheets[SHEET][2][7] == "실패"
+    values.batchClear(spreadsheetId="test", body={"ranges": [f"'{SHEET}'!H2:H"]}).execute()
+    assert service.sheets[SHEET][1][7] == "" and service.sheets[SHEET][2][7] == ""
+    assert service.calls["values.batchUpdate"] == 1 and service.calls["values.batchClear"] == 1
+
+
+def test_spreadsheet_get_lists_tabs():
+    service = FakeSheetsService({"a": [], "b": []})
+    sheets = service.spreadsheets().get(spreadsheetId="test").execute()["sheets"]
+    assert [sheet["properties"]["title"] for sheet in sheets] == ["a", "b"]
+
+
+def test_injected_failures():
+    service = make_service()
+    service.fail_next(2, status=503)
+    request = service.spreadsheets().values().get(spreadsheetId="test", range="A1")
+    for _ in range(2):
+        with pytest.raises(FakeHttpError) as error:
+            request.execute()
+        assert error.value.resp.status == 503
+    assert request.execute()["values"] == [["시간"]]
+    with pytest.raises(FakeHttpError) as error:
+        service.spreadsheets().values().get(spreadsheetId="test", range="'없는 시트'!A1").execute()
+    assert error.value.resp.status == 400
+
+
+def test_file_backed_service_saves_writes(tmp_path):
+    path = str(tmp_path / "fake_sheet.json")
+    service = FakeSheetsService.from_file(path)
+    assert service.sheets == {}
+    service.sheets[SHEET] = [["시간"]]
+    service.spreadsheets().values().update(
+        spreadsheetId="test", range=f"'{SHEET}'!H2", body={"values": [["완료"]]}).execute()
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)[SHEET][1] == ["", "", "", "", "", "", "", "완료"]
+    assert FakeSheetsService.from_file(path).sheets[SHEET][1][7] == "완료"
@@ -0,0 +1,61 @@
+from sheet_metadata import METADATA_FIELDS, SheetMetadataCache
+
+
+class MetadataService:
+    """spreadsheets().get()만 흉내 내는 서비스 객체 (호출 횟수와 필드 마스크 기록)"""
+
+    def __init__(self, sheets):
+        self.sheets = sheets  # [(gid, 시트이름), ...]
+        self.calls = []
+
+    def spreadsheets(self):
+        return self
+
+    def get(self, spreadsheetId, fields=None):
+        self.calls.append(fields)
+        return self
+
+    def execute(self):
+        return {'sheets': [{'properties': {'sheetId': gid, 'title': title}} for gid, title in self.sheets]}
+
+
+def test_metadata_is_fetched_once_with_field_mask():
+    service = MetadataService([(0, "시트1"), (123, "일정 2")])
+    cache = SheetMetadataCache(service, "test")
+    assert cache.titles() == ["시트1", "일정 2"]
+    assert cache.title_for_gid(123) == "일정 2"
+    assert cache.has_title("시트1")
+    assert service.calls == [METADATA_FIELDS]
+
+
+def test_unknown_title_or_gid_refreshes_once():
+    service = MetadataService([(0, "시트1")])
+    cache = SheetMetadataCache(service, "test")
+    cache.titles()
+    service.sheets.append((7, "새 시트"))
+    assert cache.title_for_gid("7") == "새 시트"
+    assert len(service.calls) == 2
+    assert not cache.has_title("없는 시트")
+    assert len(service.calls) == 3
+
+
+def test_expired_cache_is_refetched():
+    service = MetadataService([(0, "시트1")])
+    cache = SheetMetadataCache(service, "test", ttl=0)
+    cache.titles()
+    cache.titles()
+    assert len(service.calls) == 2
+
+
+def test_file_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sheet_metadata_cache.json")
+    service = MetadataService([(0, "시트1")])
+    SheetMetadataCache(service, "test", cache_path=path).titles()
+    # 다른 프로세스(새 인스턴스)는 파일 캐시를 재사용
+    assert SheetMetadataCache(service, "test", cache_path=path).titles() == ["시트1"]
+    # 다른 스프레드시트의 캐시는 쓰지 않음
+    SheetMetadataCache(service, "other", cache_path=path).titles()
+    assert len(service.calls) == 2
+    cache = SheetMetadataCache(service, "other", cache_path=path)
+    cache.invalidate()
+    assert not (tmp_path / "sheet_metadata_cache.json").exists()
@@ -0,0 +1,102 @@
+import threading
+
+from sheet_backend import FakeSheetsService
+from sheet_poller import (
+    BackgroundFetcher, SheetPoller, fetch_schedule_rows, fingerprint_rows, merge_column_ranges, schedule_ranges, sheet_range,
+)
+
+
+def test_sheet_names_are_quoted():
+    assert sheet_range("시트1", "A:B") == "'시트1'!A:B"
+    assert sheet_range("Daily Jobs", "H2:H") == "'Daily Jobs'!H2:H"
+    assert sheet_range("Bob's", "H5") == "'Bob''s'!H5"
+    assert schedule_ranges("일정 1") == ["'일정 1'!A:B", "'일정 1'!E:F"]
+
+
+def test_merge_column_ranges_rebuilds_rows_from_a():
+    value_ranges = [
+        {'values': [["시간", "작업이름"], ["09:00", "수집"], ["10:00"]]},
+        {'values': [["명령어"], ["echo a"], [], ["echo c"]]},
+    ]
+    assert merge_column_ranges(value_ranges) == [
+        ["시간", "작업이름", "", "", "명령어"],
+        ["09:00", "수집", "", "", "echo a"],
+        ["10:00"],
+        ["", "", "", "", "echo c"],
+    ]
+    assert merge_column_ranges([{}, {}]) == []
+
+
+def test_fingerprint_depends_only_on_content():
+    assert fingerprint_rows([["09:00", "a"]]) == fingerprint_rows([["09:00", "a"]])
+    assert fingerprint_rows([["09:00", "a"]]) != fingerprint_rows([["09:01", "a"]])
+
+
+def test_poll_interval_backs_off_until_change():
+    poller = SheetPoller(min_interval=30, max_interval=100)
+    assert poller.observe([["a"]]) is True
+    assert poller.interval == 30
+    assert poller.observe([["a"]]) is False
+    assert poller.interval == 60
+    poller.observe([["a"]])
+    assert poller.interval == 100
+    assert poller.observe([["b"]]) is True
+    assert poller.interval == 30
+
+
+def test_fetch_schedule_rows_reads_every_tab_in_one_batch_get():
+    service = FakeSheetsService({
+        "시트 1": [["시간", "작업이름", "", "", "명령어", "", "", "로그"], ["09:00", "수집", "x", "y", "echo a", "", "", "성공"]],
+        "Bob's": [["시간"], ["10:00", "", "", "", "echo b"]],
+        "빈 시트": [],
+    })
+    rows_by_sheet = fetch_schedule_rows(service, "test", ["시트 1", "Bob's", "빈 시트"])
+    assert rows_by_sheet == {
+        # C/D열과 H열(로그)은 읽지 않음
+        "시트 1": [["시간", "작업이름", "", "", "명령어"], ["09:00", "수집", "", "", "echo a"]],
+        "Bob's": [["시간"], ["10:00", "", "", "", "echo b"]],
+        "빈 시트": [],
+    }
+    assert service.total_calls == 1
+
+
+def test_background_fetcher_runs_one_fetch_at_a_time():
+    release = threading.Event()
+    done = threading.Event()
+    results = []
+
+    def fetch():
+        release.wait(5)
+        return {"시트 1": [["09:00"]]}
+
+    def on_done(result, seconds):
+        results.append((result, seconds))
+        done.set()
+
+    fetcher = BackgroundFetcher(fetch, on_done)
+    assert fetcher.start()
+    assert fetcher.busy
+    assert not fetcher.start()  # 진행 중이면 새 조회를 시작하지 않음
+    release.set()
+    assert done.wait(5)
+    assert not fetcher.busy
+    assert results[0][0] == {"시트 1": [["09:00"]]}
+    assert results[0][1] >= 0
+
+
+def test_background_fetcher_reports_errors_as_empty_result():
+    done = threading.Event()
+    results = []
+
+    def fetch():
+        raise RuntimeError("503")
+
+    def on_done(result, seconds):
+        results.append(result)
+        done.set()
+
+    fetcher = BackgroundFetcher(fetch, on_done)
+    fetcher.start()
+    assert done.wait(5)
+    assert results == [{}]
+    assert fetcher.start()  # 실패한 뒤에도 다시 조회 가능
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from sheet_backend import FakeHttpError, FakeSheetsService
+from sheets_client import SheetsClient
+
+SHEET = "Daily Jobs"
+
+
+def make_client(**kwargs):
+    options = dict(requests_per_minute=0, max_retries=3, base_delay=0.001, max_delay=0.01, seed=1)
+    options.update(kwargs)
+    return SheetsClient(**options)
+
+
+def make_service(**kwargs):
+    return FakeSheetsService({SHEET: [["시간", "작업이름"], ["09:00", "수집"]]}, **kwargs)
+
+
+def test_retryable_errors_are_retried():
+    service = make_service()
+    service.fail_next(2, status=503)
+    client = make_client()
+    result = client.wrap(service).spreadsheets().values().get(spreadsheetId="test", range=f"'{SHEET}'!A1:B").execute()
+    assert result["values"][1] == ["09:00", "수집"]
+    assert client.retries == 2
+    assert service.calls["values.get"] == 3
+
+
+def test_retries_give_up_after_max_retries():
+    service = make_service()
+    service.fail_next(10, status=429)
+    client = make_client(max_retries=2)
+    with pytest.raises(FakeHttpError):
+        client.wrap(service).spreadsheets().values().get(spreadsheetId="test", range="A1").execute()
+    assert service.calls["values.get"] == 3
+
+
+def test_client_errors_are_not_retried():
+    service = make_service()
+    service.fail_next(1, status=400)
+    client = make_client()
+    with pytest.raises(FakeHttpError):
+        client.wrap(service).spreadsheets().values().get(spreadsheetId="test", range="A1").execute()
+    assert client.retries == 0
+    assert service.calls["values.get"] == 1
+
+
+def test_concurrent_identical_reads_are_coalesced():
+    service = make_service(latency=0.2)
+    client = make_client()
+    wrapped = client.wrap(service)
+    results = []
+
+    def read():
+        request = wrapped.spreadsheets().values().batchGet(spreadsheetId="test", ranges=[f"'{SHEET}'!A1:B"])
+        results.append(request.execute())
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4
+    assert all(result == results[0] for result in results)
+    assert service.calls["values.batchGet"] == 1
+    assert client.coalesced == 3
+
+
+def test_writes_are_not_coalesced():
+    service = make_service()
+    wrapped = make_client().wrap(service)
+    body = {"valueInputOption": "RAW", "data": [{"range": f"'{SHEET}'!H2", "values": [["성공"]]}]}
+    wrapped.spreadsheets().values().batchUpdate(spreadsheetId="test", body=body).execute()
+    wrapped.spreadsheets().values().batchUpdate(spreadsheetId="test", body=body).execute()
+    assert service.calls["values.batchUpdate"] == 2
@@ -0,0 +1,77 @@
+import datetime
+import json
+
+from helpers import compile_rows, sheet_row
+from simulator import durations_from_log, simulate
+
+START = datetime.datetime(2026, 10, 2, 0, 0)
+
+
+def burst_table(count, time_raw="09:00"):
+    return compile_rows([sheet_row(time_raw, f"작업 {index}", f"job{index}.bat") for index in range(count)])
+
+
+def test_unlimited_by_default_runs_a_burst_at_once():
+    report = simulate({"시트 1": burst_table(10)}, START, hours=24)
+    assert report.scheduled == report.launches == 10
+    assert report.peak_running == 10
+    assert report.at(report.peak_running_at) == START.replace(hour=9)
+    assert not report.queue_waits
+    assert "최대 동시 실행 10/제한 없음" in report.format()[1]
+    assert report.scheduled_by_minute.most_common(1)[0][1] == 10
+
+
+def test_concurrency_cap_queues_until_slots_free():
+    report = simulate({"시트 1": burst_table(5)}, START, hours=24, max_concurrency=2, default_duration=10)
+    assert report.peak_running == 2
+    assert report.peak_queue == 3
+    assert report.launches == 5
+    # 10초 실행 + 회수 지연 1초마다 두 개씩 자리가 남
+    assert sorted(report.queue_waits) == [11.0, 11.0, 22.0]
+
+
+def test_overlap_with_previous_run_is_reported():
+    table = compile_rows([sheet_row("09:00", "긴 작업", "long.bat")])
+    # 하루 넘게 걸리는 작업: 다음 날 같은 시각에 이전 실행이 아직 진행 중
+    report = simulate({"시트 1": table}, START, hours=48, durations={("시트 1", 2): 86400 + 120})
+    reasons = [collision[4] for collision in report.collisions]
+    assert reasons == ["이전 실행이 아직 진행 중"]
+    assert report.collisions[0][2] == 2
+
+
+def test_timeout_caps_duration():
+    report = simulate({"시트 1": burst_table(1)}, START, hours=24, default_duration=600, job_timeout=60)
+    assert report.timeouts == 1
+
+
+def test_api_calls_follow_poll_backoff_and_flush_windows():
+    report = simulate({"시트 1": burst_table(3)}, START, hours=1, min_interval=30, max_interval=300)
+    assert report.api_calls["get"] == 1
+    # 내용이 바뀌지 않으므로 30초부터 300초까지 늘어난 뒤 300초마다 조회
+    assert 12 <= report.api_calls["batchGet"] <= 20
+    assert report.api_calls["batchUpdate"] == 0  # 1시간 안에는 9시 작업이 없음
+
+
+def test_api_budget_warning():
+    report = simulate({"시트 1": burst_table(1)}, START, hours=1, min_interval=1, max_interval=1, api_budget=30)
+    assert "분당 한도 30 초과" in report.format()[-1]
+
+
+def test_report_is_json_serializable():
+    report = simulate({"시트 1": burst_table(3)}, START, hours=24, max_concurrency=1)
+    summary = json.loads(json.dumps(report.to_dict(), ensure_ascii=False))
+    assert summary["launches"] == 3 and summary["queued"] == 2
+    assert summary["bursts"][0] == ["2026-10-02T09:00", 3]
+
+
+def test_durations_from_log_uses_median_of_exit_events(tmp_path):
+    path = tmp_path / "server_log.jsonl"
+    lines = [
+        {"event": "exit", "sheet": "시트 1", "row": 2, "duration": 10},
+        {"event": "exit", "sheet": "시트 1", "row": 2, "duration": 30},
+        {"event": "exit", "sheet": "시트 1", "row": 2, "duration": 1000},
+        {"event": "launch", "sheet": "시트 1", "row": 3, "duration": 5},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n{broken\n", encoding="utf-8")
+    assert durations_from_log(str(path)) == {("시트 1", 2): 30}
+    assert durations_from_log(str(tmp_path / "missing.jsonl")) == {}
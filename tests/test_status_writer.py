@@ -0,0 +1,79 @@
+import threading
+
+from helpers import wait_until
+from sheet_backend import FakeSheetsService
+from status_writer import StatusLogWriter
+
+SHEET = "Daily Jobs"
+
+
+def make_service(rows=8):
+    return FakeSheetsService({SHEET: [["시간"] for _ in range(rows)]})
+
+
+def log_cell(service, row_index):
+    row = service.sheets[SHEET][row_index - 1]
+    return row[7] if len(row) > 7 else ""
+
+
+def test_logs_are_merged_into_one_batch_update():
+    service = make_service()
+    writer = StatusLogWriter(service, "test", flush_interval=0.2).start()
+    writer.submit(SHEET, 2, "실행 중")
+    writer.submit(SHEET, 3, "성공")
+    writer.submit(SHEET, 2, "성공")  # 같은 셀은 마지막 값만 기록
+    assert wait_until(lambda: log_cell(service, 3))
+    writer.close()
+    assert service.calls["values.batchUpdate"] == 1
+    assert log_cell(service, 2) == "성공"
+    assert writer.dropped == 0
+
+
+def test_failed_flush_is_retried():
+    service = make_service()
+    service.fail_next(1, status=503)
+    writer = StatusLogWriter(service, "test", flush_interval=0.05, retry_delay=0.01).start()
+    writer.submit(SHEET, 4, "실패: 종료 코드 1")
+    assert wait_until(lambda: log_cell(service, 4))
+    writer.close()
+    assert service.calls["values.batchUpdate"] == 2
+    assert log_cell(service, 4) == "실패: 종료 코드 1"
+
+
+def test_logs_dropped_after_retries_run_out():
+    service = make_service()
+    service.fail_next(2, status=503)
+    writer = StatusLogWriter(service, "test", flush_interval=0.05, retry_delay=0.01).start()
+    writer.submit(SHEET, 5, "성공")
+    writer.submit(SHEET, 6, "성공")
+    assert wait_until(lambda: writer.dropped == 2)
+    writer.close()
+    assert service.calls["values.batchUpdate"] == 2
+    assert log_cell(service, 5) == ""
+
+
+def test_full_queue_drops_new_logs():
+    writer = StatusLogWriter(make_service(), "test", max_pending=1)  # 시작하지 않아서 큐가 비워지지 않음
+    assert writer.submit(SHEET, 2, "a")
+    assert not writer.submit(SHEET, 3, "b")
+    assert writer.dropped == 1
+    assert writer.pending_count() == 1
+
+
+def test_dropped_count_is_exact_across_threads():
+    writer = StatusLogWriter(make_service(), "test", max_pending=1)
+    writer.submit(SHEET, 2, "a")
+    threads = [threading.Thread(target=lambda: [writer.submit(SHEET, 3, "b") for _ in range(500)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.dropped == 4000
+
+
+def test_close_writes_remaining_logs():
+    service = make_service()
+    writer = StatusLogWriter(service, "test", flush_interval=60).start()
+    writer.submit(SHEET, 7, "완료")
+    writer.close()
+    assert log_cell(service, 7) == "완료"
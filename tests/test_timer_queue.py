@@ -0,0 +1,32 @@
+import datetime
+import time
+
+from timer_queue import TimerQueue, monotonic_deadline
+
+
+def test_pops_earliest_first_and_keeps_push_order_for_ties():
+    timers = TimerQueue()
+    timers.push(3.0, "fire", "c")
+    timers.push(1.0, "poll")
+    timers.push(3.0, "fire", "d")
+    timers.push(2.0, "fire", "b")
+    assert len(timers) == 4
+    assert timers.peek_deadline() == 1.0
+    assert [timers.pop() for _ in range(4)] == [
+        (1.0, "poll", None), (2.0, "fire", "b"), (3.0, "fire", "c"), (3.0, "fire", "d"),
+    ]
+    assert timers.peek_deadline() is None
+
+
+def test_payloads_need_not_be_comparable():
+    timers = TimerQueue()
+    timers.push(1.0, "fire", {"a": 1})
+    timers.push(1.0, "fire", {"b": 2})
+    assert timers.pop()[2] == {"a": 1}
+
+
+def test_push_at_converts_wall_clock_to_monotonic():
+    timers = TimerQueue()
+    timers.push_at(datetime.datetime.now() + datetime.timedelta(seconds=10), "fire")
+    assert abs(timers.peek_deadline() - (time.monotonic() + 10)) < 0.5
+    assert abs(monotonic_deadline(datetime.datetime.now()) - time.monotonic()) < 0.5
@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+
+from helpers import wait_until
+from worker_pool import PythonWorkerPool, _run_script, parse_python_command
+
+
+@pytest.mark.parametrize("command, expected", [
+    ("python job.py", ("job.py", [])),
+    ("python3 'my job.py' --day 1", ("my job.py", ["--day", "1"])),
+    ("/usr/bin/python job.py", ("job.py", [])),
+    ("python -m http.server", None),
+    ("python job.py > out.txt", None),
+    ("node job.js", None),
+    ("python", None),
+    ("", None),
+])
+def test_parse_python_command(command, expected):
+    if sys.platform == 'win32':
+        pytest.skip("POSIX 따옴표 규칙 기준")
+    assert parse_python_command(command) == expected
+
+
+@pytest.fixture
+def pool():
+    pool = PythonWorkerPool(size=1, max_runs=2, preimport=())
+    yield pool
+    pool.close()
+
+
+def write_script(tmp_path, body):
+    script = tmp_path / "job.py"
+    script.write_text(body, encoding="utf-8")
+    return f"python {script}"
+
+
+def test_script_runs_as_main_with_args_and_exit_code(tmp_path, pool):
+    out = tmp_path / "out.txt"
+    command = write_script(tmp_path, (
+        "import sys\n"
+        "if __name__ == '__main__':\n"
+        f"    open({str(out)!r}, 'w').write(' '.join(sys.argv[1:]))\n"
+        "    sys.exit(3)\n"
+    ))
+    handle = pool.start(command + " a b")
+    assert handle is not None
+    assert handle.wait(10) == 3
+    assert out.read_text() == "a b"
+
+
+def test_exceptions_become_exit_code_one(tmp_path, pool):
+    handle = pool.start(write_script(tmp_path, "raise RuntimeError('실패')\n"))
+    assert handle.wait(10) == 1
+
+
+def test_falls_back_when_not_python_or_no_idle_worker(tmp_path, pool):
+    assert pool.start("echo hi") is None
+    command = write_script(tmp_path, "import time\ntime.sleep(0.5)\n")
+    first = pool.start(command)
+    assert first is not None
+    assert pool.start(command) is None  # 워커 하나가 실행 중
+    assert first.wait(10) == 0
+
+
+def test_worker_is_replaced_after_max_runs(tmp_path, pool):
+    command = write_script(tmp_path, "pass\n")
+    pids = []
+    for _ in range(3):
+        assert wait_until(lambda: pool.idle_count() == 1, timeout=10)
+        handle = pool.start(command)
+        assert handle.wait(10) == 0
+        pids.append(handle.pid)
+    assert pids[0] == pids[1] != pids[2]
+
+
+def test_run_script_restores_working_directory(tmp_path):
+    work = tmp_path / "work"
+    (work / "sub").mkdir(parents=True)
+    script = work / "job.py"
+    script.write_text("import os\nos.chdir('sub')\n", encoding="utf-8")
+    before = os.getcwd()
+    # 요청한 폴더에서 실행하고, 스크립트가 폴더를 바꿔도 워커는 원래 폴더로 돌아옴
+    assert _run_script(str(script), [], str(work)) == 0
+    assert os.getcwd() == before
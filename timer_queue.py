@@ -0,0 +1,42 @@
+import datetime
+import heapq
+import itertools
+import time
+
+
+def monotonic_deadline(wall_datetime):
+    """벽시계 일시를 모노토닉 시계 기준 마감 시각으로 변환"""
+    delta = (wall_datetime - datetime.datetime.now()).total_seconds()
+    return time.monotonic() + delta
+
+
+class TimerQueue:
+    """모노토닉 시계 기준 타이머 힙
+
+    (마감 시각, 순번, 종류, 데이터) 항목을 보관하고 가장 빠른 타이머부터 꺼냄.
+    취소는 데이터에 세대 번호를 넣어 꺼낼 때 무시하는 방식(lazy deletion)으로 처리
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, deadline, kind, payload=None):
+        """모노토닉 마감 시각에 타이머 등록"""
+        heapq.heappush(self._heap, (deadline, next(self._seq), kind, payload))
+
+    def push_at(self, wall_datetime, kind, payload=None):
+        """벽시계 일시에 타이머 등록"""
+        self.push(monotonic_deadline(wall_datetime), kind, payload)
+
+    def peek_deadline(self):
+        """가장 빠른 타이머의 마감 시각 (없으면 None)"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop(self):
+        """가장 빠른 타이머를 (마감 시각, 종류, 데이터)로 꺼냄"""
+        deadline, _, kind, payload = heapq.heappop(self._heap)
+        return deadline, kind, payload
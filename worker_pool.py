@@ -0,0 +1,253 @@
+import json
+import os
+import runpy
+import shlex
+import subprocess
+import sys
+import threading
+import traceback
+
+# 'python 스크립트.py' 형태로 인식할 실행 파일 이름
+PYTHON_EXECUTABLES = ("python", "python3", "pythonw", "py")
+# 이 문자가 들어간 명령어는 셸이 필요하므로 일반 subprocess로 실행
+SHELL_METACHARS = set("&|<>;^`$%")
+# 워커가 미리 import 해 둘 무거운 라이브러리 (설치되어 있지 않으면 건너뜀)
+PREIMPORT_MODULES = ("googleapiclient.discovery", "google.oauth2.service_account")
+
+
+def parse_python_command(command):
+    """'python 스크립트.py 인자...' 형태면 (스크립트 경로, 인자 리스트) 반환, 아니면 None"""
+    if not command or any(char in SHELL_METACHARS for char in command):
+        return None
+    try:
+        tokens = shlex.split(command, posix=(sys.platform != 'win32'))
+    except ValueError:
+        return None
+    if sys.platform == 'win32':
+        # posix=False는 따옴표를 남겨두므로 직접 제거 (경로의 역슬래시는 그대로 유지)
+        tokens = [token[1:-1] if len(token) >= 2 and token[0] == token[-1] == '"' else token for token in tokens]
+    if len(tokens) < 2:
+        return None
+    executable = os.path.basename(tokens[0]).lower()
+    if executable.endswith(".exe"):
+        executable = executable[:-4]
+    if executable not in PYTHON_EXECUTABLES:
+        return None
+    # 'python -m 모듈', 'py -3 x.py' 등 옵션이 붙은 경우는 일반 실행
+    if not tokens[1].lower().endswith(".py"):
+        return None
+    return tokens[1], tokens[2:]
+
+
+class PooledProcess:
+    """워커에서 실행 중인 작업 하나 (subprocess.Popen처럼 pid/poll() 제공)
+
+    pid는 워커 프로세스의 PID이므로 시간 초과 시 감독기가 워커째로 종료함
+    """
+    __slots__ = ("pid", "returncode", "_done")
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+        self._done = threading.Event()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.returncode
+
+    def _finish(self, returncode):
+        self.returncode = returncode
+        self._done.set()
+
+
+class _Worker:
+    """미리 띄워 둔 파이썬 워커 프로세스 하나"""
+    __slots__ = ("process", "runs", "current")
+
+    def __init__(self, process):
+        self.process = process
+        self.runs = 0          # 지금까지 실행한 작업 수 (max_runs에 도달하면 교체)
+        self.current = None    # 실행 중인 PooledProcess
+
+
+class PythonWorkerPool:
+    """파이썬 스크립트 작업을 미리 띄워 둔 워커 프로세스에서 실행하는 풀
+
+    - 워커는 시작할 때 PREIMPORT_MODULES를 미리 import 해 두고, 요청이 오면 runpy로 스크립트를
+      __main__으로 실행 (실행마다 새 전역 변수 공간, sys.argv/sys.path/작업 폴더는 실행 후 복원)
+    - max_runs번 실행한 워커는 종료하고 새 워커로 교체 (스크립트가 남긴 상태 누적 방지)
+    - 'python x.py' 형태가 아니거나 쉬는 워커가 없으면 None을 반환 -> 호출한 쪽에서 일반 실행
+    - 스크립트는 스케줄러와 같은 파이썬 인터프리터(sys.executable)로 실행됨
+    """
+
+    def __init__(self, size=4, max_runs=50, preimport=PREIMPORT_MODULES):
+        self.size = size
+        self.max_runs = max_runs
+        self.preimport = tuple(preimport)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._closed = False
+        for _ in range(size):
+            self._spawn()
+
+    def idle_count(self):
+        """쉬고 있는 워커 수"""
+        with self._lock:
+            return len(self._idle)
+
+    def start(self, command):
+        """명령어를 워커에서 실행하고 PooledProcess 반환 (워커에서 실행할 수 없으면 None)"""
+        parsed = parse_python_command(command)
+        if parsed is None:
+            return None
+        script, args = parsed
+        with self._lock:
+            if self._closed or not self._idle:
+                return None
+            worker = self._idle.pop()
+            worker.runs += 1
+            handle = PooledProcess(worker.process.pid)
+            worker.current = handle
+        request = json.dumps({'script': script, 'args': args, 'cwd': os.getcwd()}, ensure_ascii=False)
+        try:
+            worker.process.stdin.write(request + "\n")
+            worker.process.stdin.flush()
+        except OSError:
+            # 워커가 이미 죽어 있으면 읽기 스레드가 정리하도록 두고 일반 실행으로 넘김
+            with self._lock:
+                worker.current = None
+            return None
+        return handle
+
+    def close(self):
+        """풀 종료 (쉬는 워커는 바로 종료, 실행 중인 워커는 작업이 끝나면 종료)"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._stop_worker(worker)
+
+    def _spawn(self):
+        """새 워커 프로세스를 띄우고 쉬는 워커 목록에 추가"""
+        args = [sys.executable, os.path.abspath(__file__), "--worker", ",".join(self.preimport)]
+        kwargs = {}
+        if sys.platform == 'win32':
+            kwargs['creationflags'] = subprocess.CREATE_NO_WINDOW
+        else:
+            # 시간 초과 시 프로세스 그룹째로 종료할 수 있도록 새 세션에서 실행
+            kwargs['start_new_session'] = True
+        try:
+            process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL, text=True, encoding="utf-8", **kwargs)
+        except OSError as e:
+            print(f"\033[90m[DEBUG] 파이썬 워커 시작 실패: {e}\033[0m")
+            return
+        worker = _Worker(process)
+        threading.Thread(target=self._read_results, args=(worker,), name="python-worker-reader", daemon=True).start()
+        with self._lock:
+            self._idle.append(worker)
+
+    def _read_results(self, worker):
+        """워커가 보내는 실행 결과를 받아서 PooledProcess에 전달 (워커마다 하나씩 도는 스레드)"""
+        for line in worker.process.stdout:
+            try:
+                code = json.loads(line)['code']
+            except (ValueError, KeyError, TypeError):
+                continue
+            with self._lock:
+                handle, worker.current = worker.current, None
+                recycle = self._closed or worker.runs >= self.max_runs
+                if not recycle:
+                    self._idle.append(worker)
+            if handle is not None:
+                handle._finish(code)
+            if recycle:
+                self._stop_worker(worker)
+                break
+        # 워커 종료 (교체, 시간 초과로 강제 종료, 오류 등)
+        return_code = worker.process.wait()
+        with self._lock:
+            handle, worker.current = worker.current, None
+            if worker in self._idle:
+                self._idle.remove(worker)
+            respawn = not self._closed
+        if handle is not None:
+            handle._finish(return_code)
+        if respawn:
+            self._spawn()
+
+    def _stop_worker(self, worker):
+        try:
+            worker.process.stdin.close()
+        except OSError:
+            pass
+
+
+def _run_script(script, args, cwd):
+    """스크립트 하나를 __main__으로 실행하고 종료 코드 반환"""
+    saved_argv, saved_path, saved_modules = sys.argv, sys.path[:], set(sys.modules)
+    saved_cwd = os.getcwd()  # 스크립트가 작업 폴더를 바꿔도 다음 실행에 영향 없도록 원래 폴더로 복원
+    try:
+        os.chdir(cwd)
+        script_path = os.path.abspath(script)
+        sys.argv = [script] + list(args)
+        sys.path.insert(0, os.path.dirname(script_path))
+        runpy.run_path(script_path, run_name="__main__")
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        os.chdir(saved_cwd)
+        # 스크립트 옆의 사용자 모듈은 다음 실행 때 다시 읽도록 제거 (설치된 라이브러리는 유지)
+        prefixes = tuple({os.path.normcase(sys.prefix), os.path.normcase(sys.base_prefix)})
+        for name in set(sys.modules) - saved_modules:
+            path = getattr(sys.modules[name], '__file__', None)
+            if path and not os.path.normcase(os.path.abspath(path)).startswith(prefixes):
+                del sys.modules[name]
+
+
+def _worker_main(preimport):
+    """워커 프로세스 본체: 표준 입력으로 실행 요청을 받아 실행하고 결과를 한 줄씩 응답"""
+    import importlib
+    for name in preimport:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    # 요청/응답 전용 채널을 따로 빼 두고, 스크립트의 입출력은 버림 (일반 실행의 DEVNULL과 동일)
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    results = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    sys.stdin = open(os.devnull, "r", encoding="utf-8")
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    sys.stderr = open(os.devnull, "w", encoding="utf-8")
+
+    for line in requests:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            continue
+        code = _run_script(request['script'], request.get('args', []), request.get('cwd') or os.getcwd())
+        results.write(json.dumps({'code': code}) + "\n")
+        results.flush()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--worker":
+        _worker_main([name for name in (sys.argv[2] if len(sys.argv) > 2 else "").split(",") if name])
@@ -1,8 +1,14 @@
+import time
+STARTUP_BEGIN = time.perf_counter()  # 준비 시간 분석 기준 (모듈 import 시간 포함)
+
 import sys
 import os
-import time
-import datetime
-from googleapiclient.discovery import build
+import argparse
+
+parser = argparse.ArgumentParser(description="모든 시트의 H열(실행 로그) 2행 이하 삭제")
+parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 삭제할 범위만 출력")
+parser.add_argument("-y", "--yes", action="store_true", help="5초 카운트다운 없이 바로 삭제 (작업 스케줄러 등 무인 실행용)")
+args = parser.parse_args()
 
 # auth.py 경로 추가 (auth경로.txt에서 읽기)
 auth_path_file = os.path.join(os.path.dirname(__file__), "auth경로.txt")
@@ -21,6 +27,16 @@ except Exception as e:
     sys.exit(1)
 
 from auth import get_credentials
+from sheet_backend import build_sheets_service
+from sheet_metadata import METADATA_CACHE_PATH, SheetMetadataCache
+from sheet_poller import sheet_range
+from sheets_client import SheetsClient
+from log_writer import LogWriter, is_headless
+from metrics import PhaseTimer
+from status_writer import LOG_COLUMN
+
+startup = PhaseTimer(STARTUP_BEGIN)
+startup.mark("import")
 
 # 구글 시트 URL
 url = "https://docs.google.com/spreadsheets/d/1mkaF-DPisWkEaIZYjwdQJGfDykmXIERI3gu_H5pNrSQ/edit?gid=1933253521#gid=1933253521"
@@ -28,17 +44,16 @@ url = "https://docs.google.com/spreadsheets/d/1mkaF-DPisWkEaIZYjwdQJGfDykmXIERI3
 # 스프레드시트 ID 추출
 spreadsheet_id = url.split('/d/')[1].split('/')[0]
 
-# 로그 파일 경로 설정
-log_file_path = os.path.join(os.path.dirname(__file__), "server_log.txt")
+# 로그는 스케줄러와 같은 server_log.jsonl에 모아서 기록 (종료 시 남은 로그 자동 기록)
+event_log = LogWriter(source="전일기록삭제").start()
 
-def log_message(message):
-    """로그 파일에 메시지 기록"""
-    try:
-        with open(log_file_path, "a", encoding="utf-8") as f:
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{timestamp}] {message}\n")
-    except Exception as e:
-        pass  # 로그 기록 실패해도 계속 진행
+def log_message(message, **fields):
+    """로그 기록 요청 (줄마다 파일을 열지 않고 백그라운드에서 모아서 기록)"""
+    event_log.log(message, **fields)
+
+def log_clear_range(sheet_name):
+    """시트의 로그 열 2행부터 끝까지의 범위 (헤더 유지, 시트 이름은 따옴표로 감쌈)"""
+    return sheet_range(sheet_name, f"{LOG_COLUMN}2:{LOG_COLUMN}")
 
 def safe_print(*args, **kwargs):
     """인코딩 에러가 발생해도 계속 진행하는 안전한 print 함수"""
@@ -68,25 +83,26 @@ log_message("인증 정보를 가져오는 중...")
 try:
     creds = get_credentials()
     log_message("인증 정보 가져오기 성공")
+    startup.mark("auth")
 except Exception as e:
     log_message(f"인증 정보 가져오기 실패: {e}")
     safe_print(f"[오류] 인증 정보를 가져오는 중 오류 발생: {e}")
     sys.exit(1)
 
-# Google Sheets API 서비스 생성
-service = build('sheets', 'v4', credentials=creds)
+# Google Sheets API 서비스 생성 (429/5xx 재시도, 분당 요청 한도는 스케줄러와 같은 정책)
+service = SheetsClient().wrap(build_sheets_service(creds))
 log_message("Google Sheets API 서비스 생성 완료")
+startup.mark("build_service")
 
 # 모든 시트 목록 가져오기
 try:
-    spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    sheets = spreadsheet.get('sheets', [])
+    # 시트 이름만 필드 마스크로 조회 (스케줄러와 같은 캐시 파일 공유)
+    metadata = SheetMetadataCache(service, spreadsheet_id, cache_path=METADATA_CACHE_PATH)
     
     # '매뉴얼'과 '로그' 시트를 제외한 모든 시트 이름 가져오기
     sheet_names = []
     excluded_sheets = ['매뉴얼', '로그']
-    for sheet in sheets:
-        sheet_name = sheet['properties']['title']
+    for sheet_name in metadata.titles():
         if sheet_name not in excluded_sheets:
             sheet_names.append(sheet_name)
     
@@ -95,68 +111,78 @@ try:
         safe_print("처리할 시트가 없습니다.")
         sys.exit(0)
     
+    startup.mark("sheet_lookup")
+    log_message(f"준비 시간: {startup.summary()}")
     log_message(f"처리할 시트 목록: {', '.join(sheet_names)}")
     log_message(f"총 {len(sheet_names)}개 시트의 H열 삭제 작업 시작")
     safe_print(f"\n[처리할 시트 목록] {', '.join(sheet_names)}")
     safe_print(f"[총 {len(sheet_names)}개 시트의 H열 삭제 작업]")
     safe_print("=" * 50)
     safe_print("첫 행(헤더)은 유지하고, 2행부터 마지막 행까지 H열 값을 삭제합니다.")
-    safe_print("\n[5초 후 삭제를 시작합니다...]")
-    log_message("5초 대기 시작")
     
-    # 5초 카운트다운
-    for remaining in range(5, 0, -1):
-        sys.stdout.write(f"\r   {remaining}초 남음...   ")
-        sys.stdout.flush()
-        time.sleep(1)
+    # 미리 읽어서 행 수를 셀 필요 없이 열린 범위(H2:H)로 지정
+    clear_ranges = [log_clear_range(sheet_name) for sheet_name in sheet_names]
     
-    safe_print("\r" + " " * 20)  # 이전 출력 지우기
+    if args.dry_run:
+        safe_print("\n[dry-run] 다음 범위를 삭제합니다 (실제로는 삭제하지 않음):")
+        for clear_range in clear_ranges:
+            safe_print(f"  - {clear_range}")
+        log_message(f"dry-run: {len(clear_ranges)}개 범위 확인, 삭제하지 않음")
+        sys.exit(0)
+    
+    if not args.yes:
+        safe_print("\n[5초 후 삭제를 시작합니다...]")
+        log_message("5초 대기 시작")
+        
+        if is_headless():
+            # 출력이 파일로 리디렉션된 경우 카운트다운 표시 없이 대기만
+            time.sleep(5)
+        else:
+            # 5초 카운트다운
+            for remaining in range(5, 0, -1):
+                sys.stdout.write(f"\r   {remaining}초 남음...   ")
+                sys.stdout.flush()
+                time.sleep(1)
+            
+            safe_print("\r" + " " * 20)  # 이전 출력 지우기
     safe_print("\n[삭제 중...]\n")
     log_message("삭제 작업 시작")
     
-    # 각 시트에 대해 H열 삭제 작업 수행
     success_count = 0
-    skip_count = 0
+    error_count = 0
     
-    for sheet_name in sheet_names:
-        try:
-            # H열 전체 데이터 확인
-            result = service.spreadsheets().values().get(
-                spreadsheetId=spreadsheet_id,
-                range=f"{sheet_name}!H:H"  # H열 전체
-            ).execute()
-            
-            values = result.get('values', [])
-            
-            if not values or len(values) <= 1:
-                log_message(f"'{sheet_name}': 삭제할 데이터 없음 (헤더만 있거나 데이터가 없음)")
-                safe_print(f"  [건너뜀] '{sheet_name}': 삭제할 데이터 없음 (헤더만 있거나 데이터가 없음)")
-                skip_count += 1
-            else:
-                # 총 행 수 확인
-                total_rows = len(values)
-                log_message(f"'{sheet_name}': H열 {total_rows}행 확인, 삭제 시작")
-                
-                # 2행부터 마지막 행까지 H열 값 지우기
-                clear_range = f"{sheet_name}!H2:H{total_rows}"
-                
+    try:
+        # 모든 시트의 H열을 요청 한 번으로 삭제
+        service.spreadsheets().values().batchClear(
+            spreadsheetId=spreadsheet_id,
+            body={'ranges': clear_ranges}
+        ).execute()
+        for sheet_name in sheet_names:
+            log_message(f"'{sheet_name}': H열 2행부터 마지막 행까지 삭제 완료")
+            safe_print(f"  [완료] '{sheet_name}': H열 2행부터 마지막 행까지 삭제 완료")
+        success_count = len(sheet_names)
+    except Exception as e:
+        # 일괄 삭제가 실패하면 (범위 하나가 잘못된 경우 등) 시트별로 다시 시도
+        log_message(f"일괄 삭제 실패, 시트별로 다시 시도: {e}")
+        safe_print(f"  [경고] 일괄 삭제 실패, 시트별로 다시 시도합니다: {e}")
+        for sheet_name, clear_range in zip(sheet_names, clear_ranges):
+            try:
                 service.spreadsheets().values().clear(
                     spreadsheetId=spreadsheet_id,
                     range=clear_range
                 ).execute()
-                
-                log_message(f"'{sheet_name}': H열 2행부터 {total_rows}행까지 삭제 완료")
-                safe_print(f"  [완료] '{sheet_name}': H열 2행부터 {total_rows}행까지 삭제 완료")
+                log_message(f"'{sheet_name}': H열 2행부터 마지막 행까지 삭제 완료")
+                safe_print(f"  [완료] '{sheet_name}': H열 2행부터 마지막 행까지 삭제 완료")
                 success_count += 1
-                
-        except Exception as e:
-            log_message(f"'{sheet_name}': 오류 발생 - {e}")
-            safe_print(f"  [오류] '{sheet_name}': 오류 발생 - {e}")
+            except Exception as e:
+                log_message(f"'{sheet_name}': 오류 발생 - {e}")
+                safe_print(f"  [오류] '{sheet_name}': 오류 발생 - {e}")
+                error_count += 1
     
     safe_print("\n" + "=" * 50)
-    safe_print(f"[완료] {success_count}개 시트 삭제 완료, {skip_count}개 시트 건너뜀")
+    safe_print(f"[완료] {success_count}개 시트 삭제 완료, {error_count}개 시트 오류")
     safe_print("=" * 50)
-    log_message(f"작업 완료: {success_count}개 시트 삭제 완료, {skip_count}개 시트 건너뜀")
+    log_message(f"작업 완료: {success_count}개 시트 삭제 완료, {error_count}개 시트 오류")
     
 except Exception as e:
     error_msg = f"오류 발생: {e}"